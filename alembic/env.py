@@ -14,6 +14,8 @@ from app.db.base import Base
 from app.modules.system.models.user import User
 from app.modules.system.models.role import Role
 from app.modules.system.models.menu import Menu
+from app.modules.system.models.dict import DictData, DictType
+from app.modules.system.models.oper_log import OperLog
 
 load_dotenv()
 config = context.config
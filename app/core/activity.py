@@ -0,0 +1,140 @@
+import asyncio
+import contextlib
+import logging
+import time
+from datetime import datetime
+
+from redis.exceptions import RedisError
+from sqlalchemy import BigInteger, DateTime, column, func, update, values
+
+from app.core.config import settings
+from app.core.redis import get_redis_client
+from app.db.session import get_engine
+from app.modules.system.models.user import User
+
+logger = logging.getLogger(__name__)
+
+# 有序集合：成员为 user_id，分值为最近活跃的 Unix 时间戳 (秒)
+LAST_ACTIVE_KEY = "user:last_active"
+# 单条 UPDATE 的行数上限 (每行 2 个参数，远低于 asyncpg 的 32767 个参数限制)
+FLUSH_CHUNK_SIZE = 5000
+# 刷盘时只读取该秒数之前的记录，避免与正在写入的记录竞争
+FLUSH_LAG_SECONDS = 1
+
+
+def last_active_update_stmt(rows: list[tuple[str, float]]):
+    """一条 UPDATE ... FROM (VALUES ...) 更新整批用户，GREATEST 保证时间不会回退"""
+    data = values(column("user_id", BigInteger), column("ts", DateTime), name="v").data(
+        [(int(member), datetime.fromtimestamp(score)) for member, score in rows]
+    )
+    return (
+        update(User)
+        .where(User.user_id == data.c.user_id)
+        .values(
+            last_active_time=func.greatest(User.last_active_time, data.c.ts),
+            # 活跃时间不属于资料修改，显式保留 update_time，避免触发 onupdate
+            update_time=User.update_time,
+        )
+    )
+
+
+class ActivityTracker:
+    """
+    用户最近活跃时间的写后回写 (write-behind)
+
+    - touch() 在鉴权通过后调用，同一用户每分钟在本进程内最多写一次 Redis (ZADD GT)
+    - 后台任务每 flush_interval 秒把水位线之后的变化批量回写 sys_user.last_active_time，
+      多个 worker 通过 Redis 锁保证同一时刻只有一个在刷盘
+    - 在线用户列表直接按分值从有序集合分页
+    """
+
+    def __init__(
+        self, flush_interval: float, retention: int, *, key: str = LAST_ACTIVE_KEY
+    ):
+        self.flush_interval = flush_interval
+        self.retention = retention
+        self.key = key
+        self.lock_key = f"{key}:flush_lock"
+        self.watermark_key = f"{key}:flushed_until"
+        self._recorded: dict[int, int] = {}  # user_id -> 最近一次写入 Redis 的分钟
+        self._task: asyncio.Task | None = None
+
+    async def touch(self, user_id: int, now: float | None = None) -> None:
+        now = time.time() if now is None else now
+        minute = int(now // 60)
+        if self._recorded.get(user_id) == minute:
+            return
+        self._recorded[user_id] = minute
+        try:
+            await get_redis_client().zadd(self.key, {user_id: now}, gt=True)
+        except RedisError:
+            # 活跃时间只用于展示，丢失一次记录不应影响请求，本分钟内也不再重试
+            logger.warning("记录用户 %s 活跃时间失败", user_id)
+
+    async def online(self, window: int, offset: int, limit: int):
+        """最近 window 秒内活跃的用户，按活跃时间倒序，返回 (总数, [(user_id, 时间戳)])"""
+        redis = get_redis_client()
+        since = time.time() - window
+        async with redis.pipeline(transaction=False) as pipe:
+            pipe.zcount(self.key, since, "+inf")
+            pipe.zrevrangebyscore(
+                self.key,
+                "+inf",
+                since,
+                start=offset,
+                num=limit,
+                withscores=True,
+            )
+            total, rows = await pipe.execute()
+        return total, [(int(member), score) for member, score in rows]
+
+    async def flush(self) -> int:
+        """把水位线之后新增的活跃记录回写数据库，返回更新的记录数"""
+        redis = get_redis_client()
+        lock_ttl = max(int(self.flush_interval), 1)
+        if not await redis.set(self.lock_key, 1, nx=True, ex=lock_ttl):
+            return 0  # 其他 worker 正在 (或刚刚完成) 刷盘
+
+        now = time.time()
+        until = now - FLUSH_LAG_SECONDS
+        since = float(await redis.get(self.watermark_key) or 0)
+        rows = await redis.zrangebyscore(self.key, f"({since}", until, withscores=True)
+        for start in range(0, len(rows), FLUSH_CHUNK_SIZE):
+            await self._write(rows[start : start + FLUSH_CHUNK_SIZE])
+
+        async with redis.pipeline(transaction=False) as pipe:
+            pipe.set(self.watermark_key, until)
+            # 有序集合只保留 retention 内的记录，更早的已全部回写
+            pipe.zremrangebyscore(self.key, "-inf", now - self.retention)
+            await pipe.execute()
+        return len(rows)
+
+    async def _write(self, rows: list[tuple[str, float]]) -> None:
+        async with get_engine().begin() as conn:
+            await conn.execute(last_active_update_stmt(rows))
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            # 本进程的合并记录只需保留当前分钟
+            minute = int(time.time() // 60)
+            self._recorded = {k: v for k, v in self._recorded.items() if v >= minute}
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("回写用户活跃时间失败，下个周期重试")
+
+
+activity_tracker = ActivityTracker(
+    settings.ACTIVITY_FLUSH_SECONDS, settings.ACTIVITY_RETENTION_SECONDS
+)
@@ -0,0 +1,341 @@
+import asyncio
+import contextlib
+import logging
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import date, datetime
+
+from sqlalchemy import event, insert, inspect
+from sqlalchemy.sql import visitors
+from sqlalchemy.sql.elements import BinaryExpression, BindParameter
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.id_generator import next_ids
+from app.core.metrics import AUDIT_RECORDS
+from app.core.route_path import route_template
+from app.db.session import TrackedSession, get_engine
+from app.modules.system.models.oper_log import OperLog
+
+logger = logging.getLogger(__name__)
+
+# 不记录原值的敏感字段
+MASKED_FIELDS = frozenset({"hashed_password", "password"})
+MASK = "******"
+# 只读请求不会产生变更，中间件直接放行
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+BUSINESS_TYPES = ("create", "update", "delete")
+
+
+@dataclass
+class AuditContext:
+    """单个请求内的审计上下文：变更在事务提交后才从 pending 转入 committed"""
+
+    start: float = field(default_factory=time.perf_counter)
+    actor_id: int | None = None
+    actor_name: str | None = None
+    pending: list[dict] = field(default_factory=list)
+    committed: list[dict] = field(default_factory=list)
+
+
+_audit_context: ContextVar[AuditContext | None] = ContextVar(
+    "audit_context", default=None
+)
+
+
+def set_actor(user_id: int, user_name: str) -> None:
+    """记录当前请求的操作人，由 get_current_user 在鉴权通过后调用"""
+    ctx = _audit_context.get()
+    if ctx is not None:
+        ctx.actor_id = user_id
+        ctx.actor_name = user_name
+
+
+def _json_value(key: str, value):
+    if value is None:
+        return None
+    if key in MASKED_FIELDS:
+        return MASK
+    if isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    # Decimal、UUID 等类型统一转为字符串
+    return str(value)
+
+
+def _identity(obj):
+    pk = inspect(obj).mapper.primary_key_from_instance(obj)
+    return pk[0] if len(pk) == 1 else pk
+
+
+def _object_changes(op: str, obj) -> dict:
+    """
+    单个 ORM 对象的变更：{字段: [旧值, 新值]}，集合关系记录增减的主键。
+    读取的都是 flush 前已在内存中的属性历史，不会触发额外查询。
+    """
+    state = inspect(obj)
+    changes = {}
+    for attr in state.mapper.column_attrs:
+        key = attr.key
+        if op == "update":
+            history = state.attrs[key].history
+            if not history.has_changes():
+                continue
+            old = history.deleted[0] if history.deleted else None
+            new = history.added[0] if history.added else None
+        elif op == "create":
+            old, new = None, state.dict.get(key)
+        else:
+            old, new = state.dict.get(key), None
+        if old is None and new is None:
+            continue
+        changes[key] = [_json_value(key, old), _json_value(key, new)]
+
+    if op != "delete":
+        for rel in state.mapper.relationships:
+            if not rel.uselist:
+                continue
+            history = state.attrs[rel.key].history
+            if history.added or history.deleted:
+                changes[rel.key] = {
+                    "added": [_identity(o) for o in history.added],
+                    "removed": [_identity(o) for o in history.deleted],
+                }
+
+    return {
+        "table": state.mapper.local_table.name,
+        "op": op,
+        "ids": [_identity(obj)],
+        "changes": changes,
+    }
+
+
+@event.listens_for(TrackedSession, "after_flush")
+def _collect_flush_changes(session, _flush_context):
+    ctx = _audit_context.get()
+    if ctx is None:
+        return
+    # after_flush 中 new/dirty/deleted 仍是 flush 前的状态
+    ctx.pending.extend(_object_changes("create", obj) for obj in session.new)
+    for obj in session.dirty:
+        entry = _object_changes("update", obj)
+        if entry["changes"]:
+            ctx.pending.append(entry)
+    ctx.pending.extend(_object_changes("delete", obj) for obj in session.deleted)
+
+
+def _statement_target_ids(statement) -> list:
+    """
+    从 update()/delete() 的 WHERE 中提取主键条件绑定的值：
+    pk = :id、pk IN (:ids) 与 pk = ANY(:ids)
+    """
+    if statement.whereclause is None:
+        return []
+    ids = []
+    for node in visitors.iterate(statement.whereclause):
+        if not (
+            isinstance(node, BinaryExpression)
+            and getattr(node.left, "primary_key", False)
+        ):
+            continue
+        for bind in visitors.iterate(node.right):
+            if not isinstance(bind, BindParameter):
+                continue
+            value = bind.effective_value
+            if isinstance(value, (list, tuple, set)):
+                ids.extend(value)
+            elif value is not None:
+                ids.append(value)
+    return ids
+
+
+def _parameter_target_ids(orm_execute_state) -> list:
+    """ORM 批量 insert()/update() (参数为字典列表) 中每行携带的主键值"""
+    params = orm_execute_state.parameters
+    mapper = orm_execute_state.bind_mapper
+    if not isinstance(params, list) or mapper is None:
+        return []
+    pk_key = mapper.get_property_by_column(mapper.primary_key[0]).key
+    return [row[pk_key] for row in params if pk_key in row]
+
+
+@event.listens_for(TrackedSession, "do_orm_execute")
+def _collect_bulk_changes(orm_execute_state):
+    # insert()/update()/delete() 语句不经过 flush，只能记录目标表与主键
+    if orm_execute_state.is_select:
+        return
+    ctx = _audit_context.get()
+    if ctx is None:
+        return
+    statement = orm_execute_state.statement
+    if orm_execute_state.is_insert:
+        op, ids = "create", []
+    else:
+        op = "delete" if orm_execute_state.is_delete else "update"
+        ids = _statement_target_ids(statement)
+    ctx.pending.append(
+        {
+            "table": statement.table.name,
+            "op": op,
+            "ids": ids + _parameter_target_ids(orm_execute_state),
+            "changes": {},
+        }
+    )
+
+
+@event.listens_for(TrackedSession, "after_commit")
+def _promote_committed(_session):
+    ctx = _audit_context.get()
+    if ctx is not None and ctx.pending:
+        ctx.committed.extend(ctx.pending)
+        ctx.pending.clear()
+
+
+@event.listens_for(TrackedSession, "after_soft_rollback")
+def _discard_rolled_back(_session, _previous_transaction):
+    ctx = _audit_context.get()
+    if ctx is not None:
+        ctx.pending.clear()
+
+
+def build_record(scope: Scope, ctx: AuditContext, status_code: int) -> dict:
+    """把请求信息与已提交的变更组装为一行 sys_oper_log (oper_id 在写入时批量分配)"""
+    route = scope.get("route")
+    ops = {entry["op"] for entry in ctx.committed}
+    target_ids = list(dict.fromkeys(i for entry in ctx.committed for i in entry["ids"]))
+    client = scope.get("client")
+    return {
+        "title": getattr(route, "summary", None) or getattr(route, "name", None),
+        "business_type": ",".join(t for t in BUSINESS_TYPES if t in ops),
+        "request_method": scope["method"],
+        "oper_url": route_template(scope) or scope["path"],
+        "status_code": status_code,
+        "oper_user_id": ctx.actor_id,
+        "oper_user_name": ctx.actor_name,
+        "oper_ip": client[0] if client else None,
+        "target_ids": [i for i in target_ids if isinstance(i, int)] or None,
+        "changes": ctx.committed,
+        "cost_time": round((time.perf_counter() - ctx.start) * 1000, 3),
+        "oper_time": datetime.now(),
+    }
+
+
+class AuditWriter:
+    """
+    审计日志后台写入器
+
+    - 请求线程只做 put_nowait，队列满时丢弃并计数，不阻塞业务请求
+    - 后台任务攒批 flush_interval 秒 (或攒满 batch_size 条) 后一次多行 INSERT
+    - 写入失败只记录日志，不影响业务
+    """
+
+    def __init__(self, maxsize: int, batch_size: int, flush_interval: float):
+        self.queue: asyncio.Queue[dict] = asyncio.Queue(maxsize)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._task: asyncio.Task | None = None
+        # 已从队列取出、正在攒批的日志，停止时由 stop() 写入
+        self._batch: list[dict] = []
+        # 正在执行的写入，不随后台任务一起取消
+        self._flush: asyncio.Future | None = None
+
+    def submit(self, record: dict) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except asyncio.QueueFull:
+            AUDIT_RECORDS.labels("dropped").inc()
+            logger.warning("审计队列已满，丢弃日志: %s", record["oper_url"])
+            return
+        AUDIT_RECORDS.labels("queued").inc()
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """停止后台任务，等待进行中的写入，再写入攒批中与队列中剩余的日志"""
+        if self._task:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        if self._flush:
+            await self._flush
+            self._flush = None
+        batch, self._batch = self._batch, []
+        while batch or not self.queue.empty():
+            await self._write(self._drain(batch))
+            batch = []
+
+    async def _run(self) -> None:
+        while True:
+            self._batch = [await self.queue.get()]
+            # 队列中不足一批时等待攒批，积压时立即写入
+            if self.queue.qsize() < self.batch_size - 1:
+                await asyncio.sleep(self.flush_interval)
+            batch, self._batch = self._drain(self._batch), []
+            # shield: 取消只中断等待，写入本身继续完成，避免同一批日志丢失或重复写入
+            self._flush = asyncio.ensure_future(self._write(batch))
+            await asyncio.shield(self._flush)
+            self._flush = None
+
+    def _drain(self, batch: list[dict]) -> list[dict]:
+        while len(batch) < self.batch_size and not self.queue.empty():
+            batch.append(self.queue.get_nowait())
+        return batch
+
+    async def _write(self, batch: list[dict]) -> None:
+        rows = [
+            {"oper_id": oper_id, **record}
+            for oper_id, record in zip(next_ids(len(batch)), batch, strict=True)
+        ]
+        try:
+            async with get_engine().begin() as conn:
+                await conn.execute(insert(OperLog).values(rows))
+        except Exception:
+            AUDIT_RECORDS.labels("failed").inc(len(rows))
+            logger.exception("写入 %d 条审计日志失败", len(rows))
+            return
+        AUDIT_RECORDS.labels("written").inc(len(rows))
+
+
+audit_writer = AuditWriter(
+    settings.AUDIT_QUEUE_SIZE, settings.AUDIT_BATCH_SIZE, settings.AUDIT_FLUSH_SECONDS
+)
+
+
+class AuditMiddleware:
+    """
+    为写请求建立审计上下文；请求结束后若有已提交的变更，
+    结合路由信息、操作人与耗时生成一条审计日志放入后台队列
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] in SAFE_METHODS
+            or not settings.AUDIT_ENABLED
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        ctx = AuditContext()
+        token = _audit_context.set(ctx)
+        status_code = 500
+
+        async def send_wrapper(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _audit_context.reset(token)
+            if ctx.committed:
+                audit_writer.submit(build_record(scope, ctx, status_code))
@@ -1,5 +1,8 @@
 from fastapi import Depends, HTTPException, status
+from sqlalchemy import ColumnElement
 
+from app.core.data_scope import ScopeTarget, bind_scope
+from app.core.rbac import rbac_cache
 from app.modules.auth.service import get_current_user
 from app.modules.system.models.user import User
 
@@ -13,10 +16,9 @@ def check_permissions(required_perm: str):
     """
 
     async def permission_dependency(current_user: User = Depends(get_current_user)):
-        # 汇总当前用户所有权限
-        user_perms = {
-            m.permission for r in current_user.roles for m in r.menus if m.permission
-        }
+        # 汇总当前用户所有权限 (来自内存权限索引)
+        snapshot = await rbac_cache.get()
+        user_perms = snapshot.permissions(r.role_id for r in current_user.roles)
 
         # 如果不是超级管理员且没有所需权限
         if (
@@ -47,14 +49,14 @@ def require_permissions(perm_code: str = None, super_admin_only: bool = False):
                 detail="权限不足，仅限超级管理员访问",
             )
 
-        # 2. 判断是否拥有具体的权限标识 (需要查询关联的 roles -> menus)
-        # 这里假设 User 模型已经预加载了 roles.menus
-        user_perms = set()
-        for role in current_user.roles:
-            if role.status == "1":  # 只有启用的角色才计算权限
-                for menu in role.menus:
-                    if menu.permission:
-                        user_perms.add(menu.permission)
+        # 2. 判断是否拥有具体的权限标识 (roles -> menus 来自内存权限索引)
+        snapshot = await rbac_cache.get()
+        user_perms = snapshot.permissions(
+            # 只有启用的角色才计算权限
+            role.role_id
+            for role in current_user.roles
+            if role.status == "1"
+        )
 
         if perm_code and perm_code not in user_perms:
             raise HTTPException(
@@ -65,3 +67,25 @@ def require_permissions(perm_code: str = None, super_admin_only: bool = False):
         return current_user
 
     return permission_dependency
+
+
+def data_scope_filter(target: ScopeTarget):
+    """
+    数据权限依赖工厂，返回当前用户在 target 上的行过滤条件 (None 表示不限制)
+
+    用法:
+        scope: ColumnElement[bool] | None = Depends(data_scope_filter(USER_SCOPE))
+    """
+
+    async def scope_dependency(
+        current_user: User = Depends(get_current_user),
+    ) -> ColumnElement[bool] | None:
+        snapshot = await rbac_cache.get()
+        clause = snapshot.scope_filter(
+            # 只有启用的角色才计算数据范围
+            (role.role_id for role in current_user.roles if role.status == "1"),
+            target,
+        )
+        return bind_scope(clause, current_user.user_id, current_user.dept_id)
+
+    return scope_dependency
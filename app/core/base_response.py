@@ -1,10 +1,21 @@
-from typing import Any, TypeVar
+from typing import Annotated, Any, TypeVar
 
-from pydantic import BaseModel
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, PlainSerializer
 
 T = TypeVar("T")
 
 
+def _snowflake_to_json(value: int):
+    return str(value)
+
+
+# 雪花 ID 超出 JavaScript Number 的安全整数范围，输出 JSON 时统一转为字符串。
+# 所有出参模型的 ID 字段都使用该类型，取代各模型各自的 field_serializer；
+# 序列化函数不标注返回类型，OpenAPI 文档中的字段类型保持 integer 不变
+SnowflakeId = Annotated[int, PlainSerializer(_snowflake_to_json, when_used="json")]
+
+
 class ResponseModel[T](BaseModel):
     """统一响应格式"""
 
@@ -28,3 +39,18 @@ class PageResult[T](BaseModel):
     total: int
     current: int
     size: int
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    已校验模型的快速响应 (按需启用)
+
+    处理函数直接返回 FastJSONResponse(ResponseModel.success(...)) 时，FastAPI 不再按
+    response_model 重新校验，模型由 pydantic-core 一次性编码为 JSON；
+    路由上的 response_model 仍用于生成文档。
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            return content.__pydantic_serializer__.to_json(content, by_alias=True)
+        return super().render(content)
@@ -0,0 +1,272 @@
+import asyncio
+import functools
+import inspect
+import json
+import logging
+import random
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from typing import Any, get_type_hints
+
+from pydantic import TypeAdapter
+from redis.exceptions import RedisError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.metrics import CACHE_L1_EVICTIONS, CACHE_REQUESTS
+from app.core.redis import get_redis_client
+from app.db.session import AsyncSessionLocal, get_engines
+
+logger = logging.getLogger(__name__)
+
+CACHE_KEY_PREFIX = "cache:"
+MISSING = object()
+
+
+class LocalCache:
+    """
+    进程内 LRU + TTL 缓存 (L1)，超过 maxsize 时淘汰最久未使用的条目
+
+    只在事件循环线程内使用，不加锁
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: str) -> Any:
+        """命中返回值，未命中或已过期返回 MISSING"""
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return MISSING
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            self.expirations += 1
+            self.misses += 1
+            return MISSING
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: str, value: Any, ttl: float | None = None) -> int:
+        """写入条目，返回因容量淘汰的条目数"""
+        self._data[key] = (time.monotonic() + (ttl or self.ttl), value)
+        self._data.move_to_end(key)
+        evicted = 0
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            evicted += 1
+        self.evictions += evicted
+        return evicted
+
+    def delete(self, key: str) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "size": len(self._data),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+class TwoLevelCache[T]:
+    """
+    两级缓存：进程内 L1 (LocalCache) + Redis L2
+
+    - 读取顺序 L1 -> L2 -> loader，回源结果同时写入 L1 与 L2
+    - 同一 key 的并发未命中只由一个协程回源 (single-flight)，其余等待同一结果
+    - L2 按 TypeAdapter 编码为 JSON (不使用 pickle)，读取时还原为原类型
+    - L2 的 TTL 在 (1 - jitter) ~ 1 倍之间随机，避免同时写入的条目同时过期
+    - 失效只能立即清除本进程 L1，其他进程的 L1 最多在 l1_ttl 秒后过期，
+      因此 l1_ttl 应远小于 ttl
+    - Redis 不可用时只使用 L1 与 loader
+    - invalidate / clear 递增代数 (generation)，在此之前开始的回源结果只返回给
+      已在等待的调用方，不写入 L1 与 L2，避免旧值在失效后被重新缓存
+    """
+
+    def __init__(
+        self,
+        name: str,
+        adapter: TypeAdapter[T],
+        *,
+        ttl: int,
+        l1_ttl: float,
+        maxsize: int,
+        jitter: float = 0.1,
+    ):
+        self.name = name
+        self.adapter = adapter
+        self.ttl = ttl
+        self.jitter = jitter
+        self.prefix = f"{CACHE_KEY_PREFIX}{name}:"
+        self.local = LocalCache(maxsize, l1_ttl)
+        self._inflight: dict[str, asyncio.Task[T]] = {}
+        self._generation = 0
+
+    def jittered_ttl(self) -> int:
+        return max(1, round(self.ttl * random.uniform(1 - self.jitter, 1)))
+
+    async def get_or_load(self, key: str, loader: Callable[[], Awaitable[T]]) -> T:
+        value = self.local.get(key)
+        if value is not MISSING:
+            CACHE_REQUESTS.labels(self.name, "l1_hit").inc()
+            return value
+
+        task = self._inflight.get(key)
+        if task is not None:
+            CACHE_REQUESTS.labels(self.name, "coalesced").inc()
+        else:
+            task = asyncio.ensure_future(self._load(key, loader))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._forget(key, t))
+        # shield：某个等待者被取消时不影响其他等待同一结果的协程
+        return await asyncio.shield(task)
+
+    def _forget(self, key: str, task: asyncio.Task[T]) -> None:
+        # 失效后同一 key 可能已有新的回源任务，只移除自己
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+
+    async def _load(self, key: str, loader: Callable[[], Awaitable[T]]) -> T:
+        generation = self._generation
+        redis = get_redis_client()
+        redis_ok = True
+        try:
+            raw = await redis.get(self.prefix + key)
+        except RedisError:
+            logger.warning("读取二级缓存失败: %s%s", self.prefix, key)
+            redis_ok, raw = False, None
+
+        if raw is not None:
+            value = self.adapter.validate_json(raw)
+            CACHE_REQUESTS.labels(self.name, "l2_hit").inc()
+        else:
+            value = await loader()
+            CACHE_REQUESTS.labels(self.name, "miss").inc()
+            if redis_ok and generation == self._generation:
+                try:
+                    await redis.set(
+                        self.prefix + key,
+                        self.adapter.dump_json(value),
+                        ex=self.jittered_ttl(),
+                    )
+                except RedisError:
+                    logger.warning("写入二级缓存失败: %s%s", self.prefix, key)
+
+        if generation == self._generation:
+            CACHE_L1_EVICTIONS.labels(self.name).inc(self.local.set(key, value))
+        return value
+
+    async def invalidate(self, key: str) -> None:
+        self._generation += 1
+        self._inflight.pop(key, None)
+        self.local.delete(key)
+        try:
+            await get_redis_client().unlink(self.prefix + key)
+        except RedisError:
+            logger.warning("删除二级缓存失败: %s%s", self.prefix, key)
+
+    async def clear(self) -> None:
+        """清空本缓存的全部条目 (SCAN 前缀后批量删除，仅用于低频的写操作)"""
+        self._generation += 1
+        self._inflight.clear()
+        self.local.clear()
+        redis = get_redis_client()
+        try:
+            batch = []
+            async for redis_key in redis.scan_iter(match=self.prefix + "*", count=500):
+                batch.append(redis_key)
+                if len(batch) >= 500:
+                    await redis.unlink(*batch)
+                    batch.clear()
+            if batch:
+                await redis.unlink(*batch)
+        except RedisError:
+            logger.warning("清空二级缓存失败: %s", self.name)
+
+
+def cached(
+    name: str,
+    *,
+    ttl: int,
+    l1_ttl: float = 5,
+    maxsize: int = 1024,
+    jitter: float = 0.1,
+) -> Callable:
+    """
+    把异步服务函数包装为两级缓存，缓存键由除 AsyncSession 外的参数组成，
+    值类型取自返回值注解 (须可被 pydantic 序列化)
+
+    回源时 AsyncSession 参数替换为新开的只读会话：合并等待的请求不依赖第一个调用方的会话，
+    该请求结束、会话关闭后回源仍可继续
+
+    用法:
+        @cached("route_exists", ttl=300)
+        async def route_name_exists(db: AsyncSession, route_name: str) -> bool: ...
+
+        await route_name_exists.cache.clear()  # 数据变更后
+    """
+
+    def decorator(fn: Callable[..., Awaitable[Any]]) -> Callable:
+        signature = inspect.signature(fn)
+        hints = get_type_hints(fn)
+        key_params = [
+            p for p in signature.parameters if hints.get(p) is not AsyncSession
+        ]
+        session_params = [
+            p for p in signature.parameters if hints.get(p) is AsyncSession
+        ]
+        cache = TwoLevelCache(
+            name,
+            TypeAdapter(hints["return"]),
+            ttl=ttl,
+            l1_ttl=l1_ttl,
+            maxsize=maxsize,
+            jitter=jitter,
+        )
+
+        def make_key(*args, **kwargs) -> str:
+            bound = signature.bind_partial(*args, **kwargs)
+            bound.apply_defaults()
+            return json.dumps(
+                [bound.arguments.get(p) for p in key_params],
+                separators=(",", ":"),
+                ensure_ascii=False,
+                default=str,
+            )
+
+        async def load(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            async with AsyncSessionLocal(bind=get_engines().read) as db:
+                for p in session_params:
+                    bound.arguments[p] = db
+                return await fn(*bound.args, **bound.kwargs)
+
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            return await cache.get_or_load(
+                make_key(*args, **kwargs), lambda: load(*args, **kwargs)
+            )
+
+        async def invalidate(*args, **kwargs) -> None:
+            """按同样的参数 (可省略 AsyncSession) 删除对应条目"""
+            await cache.invalidate(make_key(*args, **kwargs))
+
+        wrapper.cache = cache
+        wrapper.invalidate = invalidate
+        return wrapper
+
+    return decorator
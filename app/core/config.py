@@ -8,16 +8,115 @@ class Settings(BaseSettings):
     ENV: Literal["dev", "test", "prod"] = "dev"
 
     DATABASE_URL: str
+    # 只读副本连接串列表 (JSON 数组)，为空时所有读请求走主库
+    DATABASE_REPLICA_URLS: list[str] = []
+    # 用户写入后在该窗口期内的读请求固定走主库，保证读到自己的修改
+    DATABASE_REPLICA_STICKY_SECONDS: int = 5
+    # 副本连接失败后被剔除的时长 (秒)，到期后重新参与轮询
+    DATABASE_REPLICA_EJECT_SECONDS: int = 30
+
+    # 每个 worker 进程 (每个引擎) 的连接池大小与允许的额外连接数
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    # 分配给本实例的数据库连接总数 (Postgres max_connections 减去预留，多实例时再均分)，
+    # 设置后 python -m app.serve 按 worker 数缩小上面两项，保证总连接数不超过该值
+    DB_MAX_CONNECTIONS: int | None = None
+
+    # asyncpg 每个连接缓存的预编译语句数量，0 表示关闭
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = 500
+    # 通过 PgBouncer (transaction 模式) 连接数据库时开启
+    DB_PGBOUNCER_TRANSACTION_MODE: bool = False
+
+    # 是否在终端打印 SQL 语句，开发调试时开启
+    DB_ECHO: bool = False
+    # 单个请求内同一形态 SQL 执行超过该次数时视为 N+1 查询
+    SQL_N_PLUS_ONE_THRESHOLD: int = 10
+    # 检测到 N+1 查询时直接抛出异常 (测试环境开启)，否则仅记录警告
+    SQL_N_PLUS_ONE_RAISE: bool = False
+
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 7 * 24 * 60
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
 
+    # 雪花 ID worker id (0~1023)：留空时每个进程启动时从 Redis 租用，设置后固定使用
+    WORKER_ID: int | None = None
+    # worker id 租约有效期 (秒)，心跳每 1/3 周期续期一次
+    WORKER_ID_LEASE_SECONDS: int = 30
+
+    # 操作审计日志：写请求提交的变更经内存队列由后台任务批量写入 sys_oper_log
+    AUDIT_ENABLED: bool = True
+    # 队列容量，写满后新日志被丢弃 (audit_log_records_total{result="dropped"})
+    AUDIT_QUEUE_SIZE: int = 10000
+    # 单条 INSERT 最多写入的行数
+    AUDIT_BATCH_SIZE: int = 500
+    # 攒批等待时间 (秒)
+    AUDIT_FLUSH_SECONDS: float = 1.0
+
+    # 用户活跃时间回写数据库 (sys_user.last_active_time) 的间隔 (秒)
+    ACTIVITY_FLUSH_SECONDS: int = 60
+    # Redis 中保留活跃记录的时长 (秒)
+    ACTIVITY_RETENTION_SECONDS: int = 24 * 60 * 60
+    # 最近该秒数内有请求的用户视为在线
+    ONLINE_WINDOW_SECONDS: int = 5 * 60
+
+    # 路由限流 (@rate_limit)：各 worker 从 Redis 令牌桶按批租用令牌后在本地扣减
+    RATE_LIMIT_ENABLED: bool = True
+    # 单次最多租用的令牌数 (实际不超过规则容量的 1/10)
+    RATE_LIMIT_MAX_LEASE: int = 20
+    # 租到的令牌在本地的有效期 (秒)，过期未用完的作废
+    RATE_LIMIT_LEASE_SECONDS: float = 1.0
+
+    # GET 接口响应缓存 (@cache_response)，写接口按标签失效
+    RESPONSE_CACHE_ENABLED: bool = True
+    # 默认缓存时长 (秒)，也是标签失效失败时旧数据的最长保留时间
+    RESPONSE_CACHE_TTL: int = 300
+
+    # 菜单/角色/权限内存快照检查 Redis 版本号的间隔 (秒)，即其他 worker 修改后的最大延迟
+    RBAC_CACHE_CHECK_SECONDS: float = 5
+    # 字典内存快照检查 Redis 版本号的间隔 (秒)
+    DICT_CACHE_CHECK_SECONDS: float = 5
+
+    # 按需性能分析：开启后携带有效令牌的请求在 pyinstrument 下执行 (需安装 .[profiling])
+    # 令牌生成: python -m scripts.profile_token
+    PROFILING_ENABLED: bool = False
+    # 报告保存目录，为空时报告直接作为响应体返回
+    PROFILING_OUTPUT_DIR: str | None = None
+    # 采样间隔 (秒)
+    PROFILING_INTERVAL: float = 0.001
+
+    # OpenAPI 文档: dynamic 运行时生成 / static 读取构建时导出的文件 / disabled 关闭文档
+    # 导出命令: python -m scripts.export_openapi
+    OPENAPI_MODE: Literal["dynamic", "static", "disabled"] = "dynamic"
+    OPENAPI_STATIC_PATH: str = "openapi.json"
+
+    # 生产入口 (python -m app.serve)
+    SERVER_HOST: str = "0.0.0.0"
+    SERVER_PORT: int = 8000
+    # worker 进程数，留空时取本机 (容器) 可用的 CPU 数
+    SERVER_WORKERS: int | None = None
+    # Keep-Alive 空闲超时 (秒)，需大于前置负载均衡的空闲超时，否则可能出现偶发 502
+    SERVER_KEEPALIVE: int = 75
+    # 监听队列长度 (实际上限受内核 net.core.somaxconn 限制)
+    SERVER_BACKLOG: int = 2048
+    # 收到退出信号后等待进行中请求完成的时间 (秒)
+    SERVER_GRACEFUL_TIMEOUT: int = 30
+    # 信任其 X-Forwarded-For / X-Forwarded-Proto 的前置代理地址 (逗号分隔，支持 CIDR)，
+    # 来自这些地址的请求以转发头中的客户端 IP 作为 scope["client"] (限流、审计日志使用)；
+    # 部署在负载均衡之后时必须配置，否则按 IP 限流的接口由所有用户共享同一配额
+    FORWARDED_ALLOW_IPS: str = "127.0.0.1,::1"
+
     # Redis 配置
     REDIS_HOST: str = "127.0.0.1"
     REDIS_PORT: int = 6379
     REDIS_PASSWORD: str | None = None
     REDIS_DB: int = 0
+    # RESP3 客户端缓存：热点键 (如各内存快照的版本号) 在本地保留副本，由服务端推送失效
+    REDIS_CLIENT_TRACKING: bool = False
+    # 跟踪的键前缀，前缀下任意键被修改都会推送失效消息
+    REDIS_TRACKING_PREFIXES: list[str] = ["rbac:", "dict:"]
+    # 本地副本的最大键数
+    REDIS_TRACKING_MAX_KEYS: int = 1000
 
     @property
     def REDIS_URL(self) -> str:
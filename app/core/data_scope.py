@@ -0,0 +1,63 @@
+from collections.abc import Iterable
+from dataclasses import dataclass
+from enum import StrEnum
+
+from sqlalchemy import ColumnElement, bindparam, false, or_
+
+from app.modules.system.crud.base import in_ids
+from app.modules.system.models.user import User
+
+
+class DataScope(StrEnum):
+    """角色数据权限范围 (sys_role.data_scope)"""
+
+    ALL = "1"  # 全部数据
+    CUSTOM = "2"  # 自定义部门 (sys_role_dept)
+    DEPT = "3"  # 本部门
+    SELF = "4"  # 仅本人
+
+
+@dataclass(frozen=True)
+class ScopeTarget:
+    """受数据权限约束的表：行所属部门列与行所属用户列"""
+
+    name: str
+    dept_column: ColumnElement[int]
+    owner_column: ColumnElement[int]
+
+
+USER_SCOPE = ScopeTarget("user", User.dept_id, User.user_id)
+
+
+def compile_scope(
+    scopes: Iterable[str], custom_dept_ids: Iterable[int], target: ScopeTarget
+) -> ColumnElement[bool] | None:
+    """
+    把一组角色的数据范围编译为 WHERE 条件模板，多个角色取并集；None 表示不限制。
+    本部门与本人条件使用命名绑定参数 scope_dept_id / scope_user_id，
+    同一角色组合的模板可以复用，每个请求只需用 bind_scope() 填入当前用户的值
+    """
+    scopes = set(scopes)
+    if DataScope.ALL in scopes:
+        return None
+
+    conditions = []
+    dept_ids = sorted(set(custom_dept_ids)) if DataScope.CUSTOM in scopes else []
+    if dept_ids:
+        conditions.append(in_ids(target.dept_column, dept_ids))
+    if DataScope.DEPT in scopes:
+        conditions.append(target.dept_column == bindparam("scope_dept_id"))
+    if DataScope.SELF in scopes:
+        conditions.append(target.owner_column == bindparam("scope_user_id"))
+
+    # 没有任何可见范围 (无启用角色或自定义部门为空) 时不返回任何数据
+    return or_(*conditions) if conditions else false()
+
+
+def bind_scope(
+    clause: ColumnElement[bool] | None, user_id: int, dept_id: int | None
+) -> ColumnElement[bool] | None:
+    """为条件模板填入当前用户；用户未分配部门时 dept = NULL 不匹配任何行"""
+    if clause is None:
+        return None
+    return clause.params(scope_user_id=user_id, scope_dept_id=dept_id)
@@ -0,0 +1,73 @@
+import hashlib
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.base_response import ResponseModel
+from app.core.config import settings
+from app.core.snapshot import VersionedSnapshot
+from app.modules.system.models.dict import DictData, DictType
+from app.modules.system.schemas.dict import DictOption
+
+# 同一快照内缓存的不同类型组合上限，超出后清空重建
+MAX_CACHED_LOOKUPS = 512
+
+
+@dataclass(frozen=True)
+class DictSnapshot:
+    """已启用字典的内存快照：dict_type -> 按 dict_sort 排序的字典项"""
+
+    options: dict[str, tuple[DictOption, ...]]
+    # 类型组合 -> (响应体, ETag)，随快照一起在版本变化时整体丢弃
+    _lookups: dict[tuple[str, ...], tuple[bytes, str]] = field(
+        default_factory=dict, compare=False, repr=False
+    )
+
+    def lookup(self, dict_types: Iterable[str]) -> tuple[bytes, str]:
+        """
+        多个字典类型的响应体与 ETag，同一组合只序列化一次；
+        未知类型返回空列表。ETag 取自响应体摘要，内容不变时各 worker 一致
+        """
+        key = tuple(sorted(set(dict_types)))
+        cached = self._lookups.get(key)
+        if cached is not None:
+            return cached
+
+        response = ResponseModel[dict[str, list[DictOption]]].success(
+            data={t: list(self.options.get(t, ())) for t in key}
+        )
+        body = response.__pydantic_serializer__.to_json(response, by_alias=True)
+        etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+        if len(self._lookups) >= MAX_CACHED_LOOKUPS:
+            self._lookups.clear()
+        self._lookups[key] = (body, etag)
+        return body, etag
+
+
+async def load_dict_snapshot(db: AsyncSession) -> DictSnapshot:
+    stmt = (
+        select(
+            DictData.dict_type,
+            DictData.dict_label,
+            DictData.dict_value,
+            DictData.tag_type,
+        )
+        .join(DictType, DictType.dict_type == DictData.dict_type)
+        .where(DictType.status == "1", DictData.status == "1")
+        .order_by(DictData.dict_type, DictData.dict_sort)
+    )
+    options: dict[str, list[DictOption]] = {}
+    for dict_type, label, value, tag_type in await db.execute(stmt):
+        options.setdefault(dict_type, []).append(
+            DictOption(label=label, value=value, tag_type=tag_type)
+        )
+    return DictSnapshot(options={t: tuple(items) for t, items in options.items()})
+
+
+# 字典类型或字典数据发生变更后需调用 dict_cache.invalidate()
+dict_cache = VersionedSnapshot(
+    "dict:version", load_dict_snapshot, settings.DICT_CACHE_CHECK_SECONDS
+)
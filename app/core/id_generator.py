@@ -1,10 +1,126 @@
-from snowflake import SnowflakeGenerator
+import threading
+import time
 
-# In actual production, worker_id can be obtained from environment variables or the container's hostname hash.
-# Here, it's set to 1 by default.
-generator = SnowflakeGenerator(instance=1)
+from app.core.config import settings
+
+# 位布局与 snowflake-id 保持一致：41 位毫秒时间戳 | 10 位实例号 | 12 位序列号
+TIMESTAMP_SHIFT = 22
+INSTANCE_SHIFT = 12
+MAX_INSTANCE = (1 << 10) - 1
+MAX_SEQ = (1 << 12) - 1
+MAX_TS = (1 << 41) - 1
+# 容忍的时钟回拨 (毫秒)：在此范围内持锁等待时钟追上，超出时直接报错，
+# 避免 NTP 大幅校正时在事件循环线程上无限期阻塞整个 worker
+MAX_CLOCK_BACKWARD_MS = 5
+
+
+class ClockMovedBackwardsError(RuntimeError):
+    """系统时钟回拨超过 MAX_CLOCK_BACKWARD_MS，无法保证 ID 单调递增"""
+
+
+class SnowflakeIdGenerator:
+    """
+    线程安全的雪花 ID 生成器
+
+    - 同一毫秒内的序列号用尽时等待下一毫秒，而不是返回 None
+    - 时钟小幅回拨 (不超过 MAX_CLOCK_BACKWARD_MS) 时等待时钟追上上次发号的时间戳，
+      更大的回拨抛出 ClockMovedBackwardsError，保证 ID 单调递增
+    - next_ids(n) 一次加锁预留整段序列号，批量插入时避免逐个发号
+    """
+
+    def __init__(self, instance: int, *, epoch: int = 0):
+        if not 0 <= instance <= MAX_INSTANCE:
+            raise ValueError(f"instance 必须在 0 ~ {MAX_INSTANCE} 之间")
+        self.instance = instance
+        self.epoch = epoch
+        self._instance_bits = instance << INSTANCE_SHIFT
+        self._lock = threading.Lock()
+        self._ts = -1
+        self._seq = 0  # 当前毫秒内下一个可用的序列号
+
+    def next_id(self) -> int:
+        with self._lock:
+            ts = self._now()
+            seq = self._seq
+            # 快速路径：仍在同一毫秒且序列号未用尽
+            if ts == self._ts and seq <= MAX_SEQ:
+                self._seq = seq + 1
+            else:
+                ts, seq, _ = self._reserve(1, ts)
+        return ts << TIMESTAMP_SHIFT | self._instance_bits | seq
+
+    def next_ids(self, n: int) -> list[int]:
+        """预留 n 个 ID，同一毫秒内的 ID 连续；超过单毫秒容量时跨越多个毫秒"""
+        ids: list[int] = []
+        with self._lock:
+            while len(ids) < n:
+                ts, start, count = self._reserve(n - len(ids))
+                base = ts << TIMESTAMP_SHIFT | self._instance_bits
+                ids.extend(range(base | start, (base | start) + count))
+        return ids
+
+    def _reserve(self, n: int, now: int | None = None) -> tuple[int, int, int]:
+        """在当前毫秒内预留至多 n 个序列号，返回 (时间戳, 起始序列号, 数量)，需持锁调用"""
+        if now is None:
+            now = self._now()
+        if now < self._ts:
+            if self._ts - now > MAX_CLOCK_BACKWARD_MS:
+                raise ClockMovedBackwardsError(
+                    f"系统时钟回拨 {self._ts - now} 毫秒，拒绝生成雪花 ID"
+                )
+            now = self._wait_until(self._ts)
+        if now == self._ts and self._seq > MAX_SEQ:
+            now = self._wait_until(self._ts + 1)
+        if now != self._ts:
+            self._ts = now
+            self._seq = 0
+
+        start = self._seq
+        count = min(n, MAX_SEQ + 1 - start)
+        self._seq += count
+        return now, start, count
+
+    def _wait_until(self, target: int) -> int:
+        while (now := self._now()) < target:
+            time.sleep((target - now) / 1000)
+        return now
+
+    def _now(self) -> int:
+        current = time.time_ns() // 1_000_000 - self.epoch
+        if current > MAX_TS:
+            raise OverflowError("雪花 ID 时间戳已超出 41 位范围")
+        return current
+
+
+_generator: SnowflakeIdGenerator | None = None
+_generator_lock = threading.Lock()
+
+
+def configure(instance: int) -> None:
+    """Switch the process-wide generator to the given worker id"""
+    global _generator
+    with _generator_lock:
+        _generator = SnowflakeIdGenerator(instance=instance)
+
+
+def get_generator() -> SnowflakeIdGenerator:
+    """Return the process-wide generator, creating it on first use"""
+    global _generator
+    if _generator is None:
+        with _generator_lock:
+            if _generator is None:
+                # The app leases a unique worker id from Redis at startup (see worker_id.py).
+                # Standalone scripts that never call configure() fall back to WORKER_ID or 1.
+                instance = settings.WORKER_ID if settings.WORKER_ID is not None else 1
+                _generator = SnowflakeIdGenerator(instance=instance)
+    return _generator
 
 
 def next_id() -> int:
     """Generate the next snowflake ID"""
-    return next(generator)
+    return get_generator().next_id()
+
+
+def next_ids(n: int) -> list[int]:
+    """Reserve n snowflake IDs in one step, for bulk inserts"""
+    return get_generator().next_ids(n)
@@ -0,0 +1,69 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import QueuePool
+
+from app.core.activity import activity_tracker
+from app.core.audit import audit_writer
+from app.core.config import settings
+from app.core.dict_cache import dict_cache
+from app.core.rbac import rbac_cache
+from app.core.redis import get_redis_client
+from app.core.redis_tracking import hot_keys
+from app.core.worker_id import setup_worker_id, teardown_worker_id
+from app.db.session import get_engines
+
+logger = logging.getLogger(__name__)
+
+
+async def prewarm_pool(async_engine: AsyncEngine) -> None:
+    """
+    预先建立 pool_size 个连接，
+    把 TCP/TLS 握手与 asyncpg 类型初始化的开销放在启动阶段
+    """
+    pool = async_engine.sync_engine.pool
+    if not isinstance(pool, QueuePool):
+        return  # NullPool (PgBouncer 模式) 不保留空闲连接，无需预热
+    size = pool.size()
+    conns = await asyncio.gather(*(async_engine.connect() for _ in range(size)))
+    await asyncio.gather(*(conn.close() for conn in conns))
+
+
+async def warmup() -> None:
+    await asyncio.gather(*(prewarm_pool(e) for e in get_engines().all))
+    await get_redis_client().ping()
+    if settings.REDIS_CLIENT_TRACKING:
+        await hot_keys.start()
+    await setup_worker_id()
+    await rbac_cache.get()
+    await dict_cache.get()
+    audit_writer.start()
+    activity_tracker.start()
+
+
+async def shutdown() -> None:
+    await activity_tracker.stop()
+    await audit_writer.stop()
+    await teardown_worker_id()
+    await hot_keys.stop()
+    await asyncio.gather(*(e.dispose() for e in get_engines().all))
+    await get_redis_client().aclose()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    启动时预热数据库连接池、Redis、权限与字典缓存、租用 worker id 并启动审计日志与活跃时间回写任务，
+    完成后才对外报告就绪；关闭时写完剩余审计日志，释放 worker id、数据库与 Redis 连接
+    """
+    await warmup()
+    app.state.ready = True
+    logger.info("应用预热完成")
+
+    yield
+
+    app.state.ready = False
+    await shutdown()
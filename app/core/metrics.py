@@ -0,0 +1,157 @@
+import os
+import time
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.route_path import route_template
+
+# 多 worker 部署时设置环境变量 PROMETHEUS_MULTIPROC_DIR，
+# 各进程将指标写入该目录，由 /metrics 汇总输出
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP 请求耗时 (按路由模板统计)",
+    ["method", "route", "status"],
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "正在处理中的 HTTP 请求数",
+    ["method"],
+    multiprocess_mode="livesum",
+)
+
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out_connections",
+    "已签出的数据库连接数",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_OVERFLOW = Gauge(
+    "db_pool_overflow_connections",
+    "超出 pool_size 的溢出连接数",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_ACQUIRE_DURATION = Histogram(
+    "db_pool_acquire_seconds",
+    "从连接池获取连接的耗时 (含排队等待与 pre_ping)",
+    ["pool"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5, 1, 5, 30),
+)
+
+REDIS_COMMAND_DURATION = Histogram(
+    "redis_command_duration_seconds",
+    "Redis 命令耗时",
+    ["command"],
+    buckets=(0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.1, 1),
+)
+
+PASSWORD_HASH_DURATION = Histogram(
+    "password_hash_duration_seconds",
+    "bcrypt 密码哈希/校验耗时",
+    ["operation"],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.2, 0.3, 0.5, 1, 2),
+)
+
+WORKER_ID_LEASE = Gauge(
+    "snowflake_worker_id_lease",
+    "进程持有的雪花 worker id 租约 (持有中为 1)",
+    ["worker_id", "holder"],
+    multiprocess_mode="livesum",
+)
+
+AUDIT_RECORDS = Counter(
+    "audit_log_records_total",
+    "审计日志处理条数 (queued 入队 / dropped 队列满丢弃 / written 写入 / failed 写入失败)",
+    ["result"],
+)
+
+RATE_LIMIT_DECISIONS = Counter(
+    "rate_limit_decisions_total",
+    "限流判定次数 (local 本地租约放行 / leased 向 Redis 租用后放行 / rejected 拒绝 / error Redis 失败放行)",
+    ["result"],
+)
+
+RESPONSE_CACHE_REQUESTS = Counter(
+    "response_cache_requests_total",
+    "响应缓存查询次数 (hit 命中 / miss 未命中 / error Redis 失败)",
+    ["result"],
+)
+
+CACHE_REQUESTS = Counter(
+    "cache_requests_total",
+    "两级缓存查询次数 (l1_hit / l2_hit / miss 回源 / coalesced 合并到进行中的回源)",
+    ["cache", "result"],
+)
+CACHE_L1_EVICTIONS = Counter(
+    "cache_l1_evictions_total",
+    "进程内缓存因容量淘汰的条目数",
+    ["cache"],
+)
+
+REDIS_TRACKING_REQUESTS = Counter(
+    "redis_tracking_requests_total",
+    "客户端缓存跟踪键的读取次数 (hit 本地命中 / miss 访问 Redis)",
+    ["result"],
+)
+REDIS_TRACKING_INVALIDATIONS = Counter(
+    "redis_tracking_invalidations_total",
+    "收到的客户端缓存失效键数",
+)
+
+
+class PrometheusMiddleware:
+    """
+    记录 HTTP 请求耗时与并发数，路由标签使用路由模板 (如 /system/role/{role_id})
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+        in_progress = HTTP_REQUESTS_IN_PROGRESS.labels(method)
+        in_progress.inc()
+        start = time.perf_counter()
+
+        async def send_wrapper(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            in_progress.dec()
+            # 标签取完整路由模板 (含 include_router 前缀)；未匹配的请求统一归类，避免标签爆炸
+            HTTP_REQUEST_DURATION.labels(
+                method, route_template(scope) or "<unmatched>", status_code
+            ).observe(time.perf_counter() - start)
+
+
+async def metrics(_request: Request) -> Response:
+    """Prometheus 指标抓取端点"""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return Response(generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,34 @@
+import json
+
+from fastapi import FastAPI
+from fastapi.openapi.utils import get_openapi
+
+from app.core.config import settings
+
+
+def build_openapi(app: FastAPI) -> dict:
+    """根据当前路由生成 OpenAPI 文档"""
+    return get_openapi(
+        title=app.title,
+        version=app.version,
+        openapi_version=app.openapi_version,
+        description=app.description,
+        routes=app.routes,
+    )
+
+
+def setup_openapi(app: FastAPI) -> None:
+    """
+    static 模式下首次访问时直接读取构建阶段导出的文档，
+    避免每个新进程都重新遍历全部路由与模型生成 Schema
+    """
+    if settings.OPENAPI_MODE != "static":
+        return
+
+    def static_openapi() -> dict:
+        if app.openapi_schema is None:
+            with open(settings.OPENAPI_STATIC_PATH, encoding="utf-8") as f:
+                app.openapi_schema = json.load(f)
+        return app.openapi_schema
+
+    app.openapi = static_openapi
@@ -0,0 +1,178 @@
+import asyncio
+import hashlib
+import hmac
+import logging
+import re
+import time
+from pathlib import Path
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# 令牌只从请求头读取：查询参数会被写入访问日志与代理日志
+TOKEN_HEADER = b"x-profile-token"
+FORMAT_HEADER = b"x-profile-format"
+# format -> (扩展名, 内联返回时的 Content-Type)
+FORMATS = {
+    "html": ("html", "text/html; charset=utf-8"),
+    "speedscope": ("speedscope.json", "application/json"),
+}
+_UNSAFE_CHARS = re.compile(r"[^A-Za-z0-9_-]+")
+
+
+def _sign(expires: int) -> str:
+    # 加 "profile:" 前缀，与 JWT 等其他使用 SECRET_KEY 的签名互不通用
+    message = f"profile:{expires}".encode()
+    return hmac.new(settings.SECRET_KEY.encode(), message, hashlib.sha256).hexdigest()
+
+
+def create_profile_token(ttl: int = 600) -> str:
+    """生成 ttl 秒内有效的性能分析令牌，格式为 "<过期时间戳>.<签名>" """
+    expires = int(time.time()) + ttl
+    return f"{expires}.{_sign(expires)}"
+
+
+def verify_profile_token(token: str) -> bool:
+    expires, _, signature = token.partition(".")
+    if not expires.isdigit() or int(expires) < time.time():
+        return False
+    return hmac.compare_digest(signature, _sign(int(expires)))
+
+
+def _profile_request(scope: Scope) -> tuple[str, str] | None:
+    """
+    请求携带的令牌与报告格式；未携带令牌时返回 None
+
+    只做字节级的快速判断，绝大多数请求在这里直接返回
+    """
+    token = fmt = None
+    for name, value in scope["headers"]:
+        if name == TOKEN_HEADER:
+            token = value.decode("latin-1")
+        elif name == FORMAT_HEADER:
+            fmt = value.decode("latin-1")
+    if not token:
+        return None
+    return token, fmt if fmt in FORMATS else "html"
+
+
+def _render(profiler, fmt: str) -> str:
+    if fmt == "speedscope":
+        from pyinstrument.renderers import SpeedscopeRenderer
+
+        return profiler.output(SpeedscopeRenderer())
+    return profiler.output_html()
+
+
+def _write_report(profiler, fmt: str, path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(_render(profiler, fmt), encoding="utf-8")
+
+
+class ProfilingMiddleware:
+    """
+    按需性能分析：携带有效令牌 (X-Profile-Token 头) 的请求在 pyinstrument 采样分析器下执行
+
+    - 令牌由管理员通过 python -m scripts.profile_token 生成，带过期时间与 HMAC 签名
+    - 报告格式为 html 或 speedscope (X-Profile-Format 头)
+    - 报告的渲染与写入在线程池中执行，数 MB 的报告不会阻塞事件循环上的其他请求
+    - 设置了 PROFILING_OUTPUT_DIR 时报告写入该目录，响应头 X-Profile-Report 给出文件名；
+      否则丢弃原响应体，直接返回报告 (原状态码见 X-Profile-Status)
+    - 同一时间只分析一个请求，其余带令牌的请求正常执行
+    - 只采样事件循环线程，同步 (def) 处理函数在线程池中的耗时显示为等待
+    - 仅在 PROFILING_ENABLED 时注册 (见 main.py)，关闭时没有任何开销；
+      开启后未携带令牌的请求只多一次请求头的扫描
+    """
+
+    def __init__(self, app: ASGIApp):
+        # pyinstrument 为可选依赖 (pip install .[profiling])，开启时缺少则启动失败
+        from pyinstrument import Profiler
+
+        self.app = app
+        self._profiler_cls = Profiler
+        self._busy = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request = _profile_request(scope)
+        if request is None:
+            await self.app(scope, receive, send)
+            return
+
+        token, fmt = request
+        if not verify_profile_token(token):
+            logger.warning("无效的性能分析令牌: %s %s", scope["method"], scope["path"])
+            await self.app(scope, receive, send)
+            return
+        if self._busy:
+            await self.app(scope, receive, send)
+            return
+
+        self._busy = True
+        try:
+            if settings.PROFILING_OUTPUT_DIR:
+                await self._profile_to_dir(scope, receive, send, fmt)
+            else:
+                await self._profile_inline(scope, receive, send, fmt)
+        finally:
+            self._busy = False
+
+    def _profiler(self):
+        return self._profiler_cls(interval=settings.PROFILING_INTERVAL)
+
+    async def _profile_to_dir(self, scope: Scope, receive: Receive, send: Send, fmt):
+        slug = _UNSAFE_CHARS.sub("_", scope["path"]).strip("_") or "root"
+        timestamp = time.strftime("%Y%m%d-%H%M%S")
+        name = f"{timestamp}-{scope['method']}-{slug}.{FORMATS[fmt][0]}"
+
+        async def send_wrapper(message: Message):
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append("X-Profile-Report", name)
+            await send(message)
+
+        profiler = self._profiler()
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # 请求抛出异常时同样保留报告
+            profiler.stop()
+            path = Path(settings.PROFILING_OUTPUT_DIR) / name
+            await asyncio.to_thread(_write_report, profiler, fmt, path)
+            logger.info("性能分析报告已写入: %s", path)
+
+    async def _profile_inline(self, scope: Scope, receive: Receive, send: Send, fmt):
+        status = 500
+
+        async def discard(message: Message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+
+        profiler = self._profiler()
+        profiler.start()
+        try:
+            await self.app(scope, receive, discard)
+        finally:
+            profiler.stop()
+
+        body = (await asyncio.to_thread(_render, profiler, fmt)).encode()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [
+                    (b"content-type", FORMATS[fmt][1].encode()),
+                    (b"content-length", str(len(body)).encode()),
+                    (b"x-profile-status", str(status).encode()),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
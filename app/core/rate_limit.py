@@ -0,0 +1,298 @@
+import asyncio
+import json
+import logging
+import math
+import re
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from typing import Literal
+
+from fastapi import HTTPException
+from redis.exceptions import RedisError
+from starlette.routing import compile_path
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.metrics import RATE_LIMIT_DECISIONS
+from app.core.redis import get_redis_client
+from app.modules.auth.service import decode_access_token
+
+logger = logging.getLogger(__name__)
+
+RATE_LIMIT_KEY_PREFIX = "ratelimit:"
+# 本地租约表的条目上限，超出后清空重建 (未用完的租约视为作废)
+MAX_LOCAL_LEASES = 10000
+
+# 令牌桶：按 Redis 服务器时间补充令牌，一次最多取出 ARGV[3] 个。
+# 返回 {取到的令牌数, 令牌不足时需等待的毫秒数}
+_LEASE_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local want = tonumber(ARGV[3])
+local t = redis.call('TIME')
+local now = t[1] * 1000 + math.floor(t[2] / 1000)
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or capacity
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local granted = math.min(want, math.floor(tokens))
+tokens = tokens - granted
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil((capacity - tokens) / rate) + 1000)
+if granted > 0 then
+    return {granted, 0}
+end
+return {0, math.ceil((1 - tokens) / rate)}
+"""
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """
+    路由限流规则：每个 key 在 seconds 秒内最多 times 次 (令牌桶，允许 times 的突发)
+
+    per: user 按登录用户 (未登录时按 IP)，ip 按客户端地址，route 整个路由共享
+    """
+
+    times: int
+    seconds: float
+    per: Literal["user", "ip", "route"] = "user"
+
+    @property
+    def rate_per_ms(self) -> float:
+        return self.times / (self.seconds * 1000)
+
+
+def rate_limit(
+    times: int,
+    seconds: float,
+    *,
+    per: Literal["user", "ip", "route"] = "user",
+) -> Callable:
+    """
+    在路由函数上声明限流规则，由 RateLimitMiddleware 在路由执行前检查
+
+    用法:
+        @router.post("/login")
+        @rate_limit(10, 60, per="ip")
+        async def login(...): ...
+    """
+    limit = RateLimit(times, seconds, per)
+
+    def decorator(endpoint: Callable) -> Callable:
+        endpoint.__rate_limit__ = limit
+        return endpoint
+
+    return decorator
+
+
+@dataclass
+class _Lease:
+    """本进程从 Redis 令牌桶租到、尚未用完的令牌"""
+
+    tokens: int = 0
+    expires_at: float = 0.0
+    blocked_until: float = 0.0
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+
+class TokenBucketLimiter:
+    """
+    Redis 令牌桶 + 本地令牌租约
+
+    - 本地还有未过期的租约令牌时直接扣减，不访问 Redis
+    - 用完后由一个协程通过 Lua 脚本一次租一批 (最多 max_lease 个，不超过容量的 1/10)，
+      同一 key 的并发请求等待这次租用结果
+    - 租约最多保留 lease_seconds 秒，过期未用完的令牌作废，
+      多个 worker 合计不会超过 Redis 中的配额
+    - Redis 告知需要等待时在本地记住解封时间，期间的请求直接拒绝
+    - Redis 不可用时放行 (限流只是保护措施，不应影响正常请求)
+    """
+
+    def __init__(
+        self,
+        max_lease: int,
+        lease_seconds: float,
+        *,
+        key_prefix: str = RATE_LIMIT_KEY_PREFIX,
+    ):
+        self.max_lease = max_lease
+        self.lease_seconds = lease_seconds
+        self.key_prefix = key_prefix
+        self._leases: dict[str, _Lease] = {}
+
+    def lease_size(self, limit: RateLimit) -> int:
+        return max(1, min(self.max_lease, limit.times // 10))
+
+    async def acquire(self, key: str, limit: RateLimit) -> float:
+        """取一个令牌；成功返回 0，被限流时返回建议的重试等待秒数"""
+        lease = self._leases.get(key)
+        if lease is None:
+            if len(self._leases) >= MAX_LOCAL_LEASES:
+                self._leases.clear()
+            lease = self._leases[key] = _Lease()
+
+        retry_after = self._take_local(lease, time.monotonic())
+        if retry_after is not None:
+            return retry_after
+
+        async with lease.lock:
+            # 等锁期间其他协程可能已经租到令牌或被告知等待
+            retry_after = self._take_local(lease, time.monotonic())
+            if retry_after is not None:
+                return retry_after
+
+            try:
+                granted, wait_ms = await get_redis_client().eval(
+                    _LEASE_SCRIPT,
+                    1,
+                    self.key_prefix + key,
+                    limit.times,
+                    limit.rate_per_ms,
+                    self.lease_size(limit),
+                )
+            except RedisError:
+                logger.warning("限流令牌租用失败，放行请求: %s", key)
+                RATE_LIMIT_DECISIONS.labels("error").inc()
+                return 0
+
+            now = time.monotonic()
+            if granted:
+                lease.tokens = int(granted) - 1
+                lease.expires_at = now + self.lease_seconds
+                RATE_LIMIT_DECISIONS.labels("leased").inc()
+                return 0
+            lease.tokens = 0
+            lease.blocked_until = now + int(wait_ms) / 1000
+            RATE_LIMIT_DECISIONS.labels("rejected").inc()
+            return lease.blocked_until - now
+
+    @staticmethod
+    def _take_local(lease: _Lease, now: float) -> float | None:
+        """本地能判定时返回结果 (0 放行 / >0 等待秒数)，需要访问 Redis 时返回 None"""
+        if lease.blocked_until > now:
+            RATE_LIMIT_DECISIONS.labels("rejected").inc()
+            return lease.blocked_until - now
+        if lease.tokens > 0 and lease.expires_at > now:
+            lease.tokens -= 1
+            RATE_LIMIT_DECISIONS.labels("local").inc()
+            return 0
+        return None
+
+
+rate_limiter = TokenBucketLimiter(
+    settings.RATE_LIMIT_MAX_LEASE, settings.RATE_LIMIT_LEASE_SECONDS
+)
+
+
+def _client_ip(scope: Scope) -> str:
+    # 负载均衡之后由 uvicorn 按 FORWARDED_ALLOW_IPS 从 X-Forwarded-For 还原 (见 app.serve)，
+    # 这里不直接读取转发头，避免客户端伪造 IP 绕过限流
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+def _token_user_id(scope: Scope) -> int | None:
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() != "bearer" or not token:
+                return None
+            try:
+                return decode_access_token(token)
+            except HTTPException:
+                return None
+    return None
+
+
+def rate_limit_key(scope: Scope, path: str, limit: RateLimit) -> str:
+    route = f"{scope['method']}:{path}"
+    if limit.per == "route":
+        return route
+    if limit.per == "user":
+        user_id = _token_user_id(scope)
+        if user_id is not None:
+            return f"{route}:u:{user_id}"
+    return f"{route}:ip:{_client_ip(scope)}"
+
+
+@dataclass(frozen=True)
+class _LimitedRoute:
+    path: str
+    regex: re.Pattern
+    methods: frozenset[str]
+    limit: RateLimit
+
+
+def _iter_routes(routes: list) -> Iterable:
+    """展开 include_router 的路由 (新版 FastAPI 延迟展开，需通过 iter_route_contexts 获取)"""
+    try:
+        from fastapi.routing import iter_route_contexts
+    except ImportError:
+        return routes
+    return iter_route_contexts(routes)
+
+
+class RateLimitMiddleware:
+    """
+    按路由上 @rate_limit 声明的规则限流，超出时返回 429 与 Retry-After
+
+    中间件在路由之前执行，首次请求时收集声明了规则的路由并编译路径正则，
+    之后每个请求只在这几条路由中匹配，其余请求不做任何额外工作
+    """
+
+    def __init__(self, app: ASGIApp, limiter: TokenBucketLimiter = rate_limiter):
+        self.app = app
+        self.limiter = limiter
+        self._limited_routes: list[_LimitedRoute] | None = None
+
+    def _routes(self, scope: Scope) -> list["_LimitedRoute"]:
+        if self._limited_routes is None:
+            self._limited_routes = [
+                _LimitedRoute(
+                    path=route.path,
+                    regex=compile_path(route.path)[0],
+                    methods=frozenset(route.methods or ()),
+                    limit=route.endpoint.__rate_limit__,
+                )
+                for route in _iter_routes(scope["app"].routes)
+                if hasattr(getattr(route, "endpoint", None), "__rate_limit__")
+            ]
+        return self._limited_routes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or not settings.RATE_LIMIT_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        method, path = scope["method"], scope["path"]
+        for route in self._routes(scope):
+            if method in route.methods and route.regex.match(path):
+                key = rate_limit_key(scope, route.path, route.limit)
+                retry_after = await self.limiter.acquire(key, route.limit)
+                if retry_after > 0:
+                    await self._reject(send, retry_after)
+                    return
+                break
+
+        await self.app(scope, receive, send)
+
+    @staticmethod
+    async def _reject(send: Send, retry_after: float):
+        body = json.dumps(
+            {"code": 429, "msg": "请求过于频繁，请稍后再试", "data": None},
+            ensure_ascii=False,
+        ).encode()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 429,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                    (b"retry-after", str(math.ceil(retry_after)).encode()),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
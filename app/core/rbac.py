@@ -0,0 +1,103 @@
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+
+from sqlalchemy import ColumnElement, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.data_scope import DataScope, ScopeTarget, compile_scope
+from app.core.snapshot import VersionedSnapshot
+from app.db.base import role_depts, role_menus
+from app.modules.system.models.menu import Menu
+from app.modules.system.models.role import Role
+
+# 同一快照内缓存的角色组合上限，超出后清空重建
+MAX_CACHED_SCOPES = 1024
+
+
+@dataclass(frozen=True)
+class RBACSnapshot:
+    """菜单、角色与权限索引的内存快照"""
+
+    menus: dict[int, Menu]  # menu_id -> 菜单 (已脱离 Session，只读)
+    role_menu_ids: dict[int, frozenset[int]]  # role_id -> 菜单ID集合
+    role_permissions: dict[int, frozenset[str]]  # role_id -> 权限标识集合
+    role_data_scopes: dict[int, str] = field(
+        default_factory=dict
+    )  # role_id -> 数据范围
+    role_dept_ids: dict[int, frozenset[int]] = field(default_factory=dict)
+    # (角色组合, 表) -> 编译后的数据权限条件模板，随快照一起在版本变化时整体丢弃
+    _scope_filters: dict[tuple[frozenset[int], str], ColumnElement[bool] | None] = (
+        field(default_factory=dict, compare=False, repr=False)
+    )
+
+    def permissions(self, role_ids: Iterable[int]) -> set[str]:
+        """汇总多个角色的权限标识"""
+        perms = set()
+        for role_id in role_ids:
+            perms |= self.role_permissions.get(role_id, frozenset())
+        return perms
+
+    def role_menus(self, role_ids: Iterable[int]) -> list[Menu]:
+        """汇总多个角色可访问的菜单 (去重)"""
+        menu_ids = set()
+        for role_id in role_ids:
+            menu_ids |= self.role_menu_ids.get(role_id, frozenset())
+        return [self.menus[m_id] for m_id in menu_ids if m_id in self.menus]
+
+    def scope_filter(
+        self, role_ids: Iterable[int], target: ScopeTarget
+    ) -> ColumnElement[bool] | None:
+        """
+        多个角色在 target 上的数据权限条件模板 (见 compile_scope)，
+        按角色组合指纹缓存，同一组合的用户共享一次编译结果
+        """
+        fingerprint = frozenset(role_ids)
+        key = (fingerprint, target.name)
+        if key in self._scope_filters:
+            return self._scope_filters[key]
+
+        scopes = {self.role_data_scopes.get(r) for r in fingerprint} - {None}
+        dept_ids = set()
+        for role_id in fingerprint:
+            if self.role_data_scopes.get(role_id) == DataScope.CUSTOM:
+                dept_ids |= self.role_dept_ids.get(role_id, frozenset())
+        clause = compile_scope(scopes, dept_ids, target)
+
+        if len(self._scope_filters) >= MAX_CACHED_SCOPES:
+            self._scope_filters.clear()
+        self._scope_filters[key] = clause
+        return clause
+
+
+async def load_rbac_snapshot(db: AsyncSession) -> RBACSnapshot:
+    menus = {m.menu_id: m for m in (await db.execute(select(Menu))).scalars().all()}
+
+    data_scopes = dict(
+        (await db.execute(select(Role.role_id, Role.data_scope))).tuples().all()
+    )
+    menu_ids_by_role: dict[int, set[int]] = {role_id: set() for role_id in data_scopes}
+    for role_id, menu_id in await db.execute(select(role_menus)):
+        menu_ids_by_role.setdefault(role_id, set()).add(menu_id)
+    dept_ids_by_role: dict[int, set[int]] = {}
+    for role_id, dept_id in await db.execute(select(role_depts)):
+        dept_ids_by_role.setdefault(role_id, set()).add(dept_id)
+
+    return RBACSnapshot(
+        menus=menus,
+        role_menu_ids={r: frozenset(ids) for r, ids in menu_ids_by_role.items()},
+        role_permissions={
+            r: frozenset(
+                menus[m].permission for m in ids if m in menus and menus[m].permission
+            )
+            for r, ids in menu_ids_by_role.items()
+        },
+        role_data_scopes=data_scopes,
+        role_dept_ids={r: frozenset(ids) for r, ids in dept_ids_by_role.items()},
+    )
+
+
+# 角色、菜单及其关联发生变更后需调用 rbac_cache.invalidate()
+rbac_cache = VersionedSnapshot(
+    "rbac:version", load_rbac_snapshot, settings.RBAC_CACHE_CHECK_SECONDS
+)
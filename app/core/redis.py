@@ -1,15 +1,52 @@
+import time
+
 import redis.asyncio as redis
 
 from app.core.config import settings
+from app.core.metrics import REDIS_COMMAND_DURATION
+
+
+class InstrumentedRedis(redis.Redis):
+    """记录每条 Redis 命令耗时的客户端"""
+
+    async def execute_command(self, *args, **options):
+        start = time.perf_counter()
+        try:
+            return await super().execute_command(*args, **options)
+        finally:
+            REDIS_COMMAND_DURATION.labels(str(args[0]).upper()).observe(
+                time.perf_counter() - start
+            )
+
+
+_redis_client: InstrumentedRedis | None = None
+
+
+def get_redis_client() -> InstrumentedRedis:
+    """获取异步 Redis 实例 (首次使用时创建)"""
+    global _redis_client
+    if _redis_client is None:
+        _redis_client = InstrumentedRedis.from_url(
+            settings.REDIS_URL,
+            encoding="utf-8",
+            decode_responses=True,  # 自动将返回结果转为字符串而非 bytes
+        )
+    return _redis_client
+
+
+def reset_redis_client_after_fork() -> None:
+    """fork 出的子进程调用：不再使用从父进程继承的连接池，下次使用时重新创建"""
+    global _redis_client
+    _redis_client = None
+
 
-# 创建异步 Redis 实例
-redis_client = redis.from_url(
-    settings.REDIS_URL,
-    encoding="utf-8",
-    decode_responses=True,  # 自动将返回结果转为字符串而非 bytes
-)
+def __getattr__(name: str):
+    # 兼容 `from app.core.redis import redis_client` 的旧写法
+    if name == "redis_client":
+        return get_redis_client()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 async def get_redis():
     """供 FastAPI Depends 使用的依赖函数"""
-    return redis_client
+    return get_redis_client()
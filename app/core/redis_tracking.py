@@ -0,0 +1,168 @@
+import asyncio
+import contextlib
+import logging
+from typing import Any
+
+import redis
+from redis.asyncio.connection import Connection, parse_url
+from redis.exceptions import RedisError
+
+from app.core.cache import MISSING, LocalCache
+from app.core.config import settings
+from app.core.metrics import REDIS_TRACKING_INVALIDATIONS, REDIS_TRACKING_REQUESTS
+from app.core.redis import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+# 本地副本的兜底有效期 (秒)：即使错过失效消息，旧值也不会无限期保留
+LOCAL_TTL = 60 * 60
+# 监听连接断开后的重连间隔 (秒)
+RECONNECT_DELAY = 1.0
+
+
+def install_invalidation_handler(conn: Connection, handler) -> None:
+    """
+    为 RESP3 连接注册 invalidate 推送消息的回调
+
+    redis-py 的 asyncio 客户端没有公开的客户端缓存接口，只能经由解析器的
+    set_invalidation_push_handler (redis-py 5.1 起 RESP3 / hiredis 解析器均提供)；
+    pyproject 中限定了 redis 的版本范围，接口缺失时直接报错，不会静默失去失效通知
+    """
+    parser = getattr(conn, "_parser", None)
+    setter = getattr(parser, "set_invalidation_push_handler", None)
+    if not callable(setter):
+        raise RuntimeError(
+            f"redis-py {redis.__version__} 的解析器 {type(parser).__name__} "
+            "不支持 invalidate 推送回调，请关闭 REDIS_CLIENT_TRACKING"
+        )
+    setter(handler)
+
+
+class ClientTrackingCache:
+    """
+    基于 RESP3 客户端缓存 (CLIENT TRACKING) 的热点键本地副本
+
+    - 专用的 RESP3 连接以 BCAST 模式订阅 prefixes 下所有键的变更，
+      任何客户端修改这些键时 Redis 推送 invalidate 消息，本地副本随即删除
+    - get() 命中本地副本时不访问 Redis；未命中时经普通客户端 GET 后写入本地
+    - 读取期间收到同一键的失效消息时不写入本地，避免缓存失效之前的旧值
+    - 监听连接断开期间无法得知变更，清空本地副本并退化为普通 GET，直到重连成功
+    """
+
+    def __init__(self, prefixes: tuple[str, ...], maxsize: int):
+        self.prefixes = prefixes
+        self.local = LocalCache(maxsize, LOCAL_TTL)
+        self._pending: dict[str, object] = {}
+        self._conn: Connection | None = None
+        self._task: asyncio.Task | None = None
+        self._active = False
+
+    @property
+    def active(self) -> bool:
+        return self._active
+
+    def tracks(self, key: str) -> bool:
+        return key.startswith(self.prefixes)
+
+    def peek(self, key: str) -> Any:
+        """只读本地副本，不访问 Redis；未启用或未缓存时返回 MISSING"""
+        if not self._active:
+            return MISSING
+        return self.local.get(key)
+
+    async def get(self, key: str) -> Any:
+        if not self._active or not self.tracks(key):
+            return await get_redis_client().get(key)
+
+        value = self.local.get(key)
+        if value is not MISSING:
+            REDIS_TRACKING_REQUESTS.labels("hit").inc()
+            return value
+
+        REDIS_TRACKING_REQUESTS.labels("miss").inc()
+        token = self._pending[key] = object()
+        try:
+            value = await get_redis_client().get(key)
+        finally:
+            # 读取期间收到失效消息时 _pending 中的令牌已被移除
+            still_valid = self._pending.get(key) is token
+            if still_valid:
+                del self._pending[key]
+        if still_valid and self._active:
+            self.local.set(key, value)
+        return value
+
+    def stats(self) -> dict[str, int]:
+        return self.local.stats()
+
+    async def start(self) -> None:
+        await self._connect()
+        self._task = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        await self._disconnect()
+
+    async def _connect(self) -> None:
+        conn = Connection(**parse_url(settings.REDIS_URL), protocol=3)
+        await conn.connect()
+        try:
+            install_invalidation_handler(conn, self._on_invalidate)
+        except RuntimeError:
+            await conn.disconnect()
+            raise
+        prefix_args = [arg for p in self.prefixes for arg in ("PREFIX", p)]
+        await conn.send_command("CLIENT", "TRACKING", "ON", "BCAST", *prefix_args)
+        reply = await conn.read_response()
+        if reply not in (b"OK", "OK"):
+            await conn.disconnect()
+            raise RedisError(f"CLIENT TRACKING 开启失败: {reply!r}")
+        self._conn = conn
+        self._active = True
+        logger.info("Redis 客户端缓存已开启，跟踪前缀: %s", ", ".join(self.prefixes))
+
+    async def _disconnect(self) -> None:
+        self._active = False
+        self.local.clear()
+        self._pending.clear()
+        if self._conn is not None:
+            await self._conn.disconnect()
+            self._conn = None
+
+    async def _on_invalidate(self, message: list) -> None:
+        keys = message[1]
+        if keys is None:
+            # FLUSHDB / FLUSHALL 时推送 null，表示全部失效
+            self.local.clear()
+            self._pending.clear()
+            REDIS_TRACKING_INVALIDATIONS.inc()
+            return
+        for key in keys:
+            key = key.decode() if isinstance(key, bytes) else key
+            self.local.delete(key)
+            self._pending.pop(key, None)
+        REDIS_TRACKING_INVALIDATIONS.inc(len(keys))
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                if self._conn is None:
+                    await self._connect()
+                await self._conn.read_response(push_request=True, timeout=None)
+            except asyncio.CancelledError:
+                raise
+            except (RedisError, OSError):
+                logger.warning(
+                    "Redis 客户端缓存监听连接断开，%ss 后重连", RECONNECT_DELAY
+                )
+                await self._disconnect()
+                await asyncio.sleep(RECONNECT_DELAY)
+
+
+hot_keys = ClientTrackingCache(
+    tuple(settings.REDIS_TRACKING_PREFIXES), settings.REDIS_TRACKING_MAX_KEYS
+)
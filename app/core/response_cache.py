@@ -0,0 +1,143 @@
+import functools
+import hashlib
+import inspect
+import logging
+from collections.abc import Callable, Iterable
+from urllib.parse import parse_qsl, urlencode
+
+from fastapi import Depends, Request, Response
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+from app.core.metrics import RESPONSE_CACHE_REQUESTS
+from app.core.redis import get_redis_client
+from app.modules.auth.service import get_current_user
+from app.modules.system.models.user import User
+
+logger = logging.getLogger(__name__)
+
+RESPONSE_KEY_PREFIX = "resp:"
+TAG_KEY_PREFIX = "resp:tag:"
+# 标签集合的有效期 (秒)，需不短于任何缓存条目的 TTL，否则条目会失去失效入口
+TAG_TTL = 24 * 60 * 60
+
+
+def permission_fingerprint(role_ids: Iterable[int]) -> str:
+    """同一组启用角色的用户权限相同，可以共享缓存"""
+    joined = ",".join(map(str, sorted(set(role_ids))))
+    return hashlib.blake2b(joined.encode(), digest_size=8).hexdigest()
+
+
+def response_cache_key(path: str, query_string: bytes, fingerprint: str) -> str:
+    """路径 + 规范化的查询参数 (排序，忽略空值) + 权限指纹"""
+    query = urlencode(
+        sorted(parse_qsl(query_string.decode("latin-1"), keep_blank_values=False))
+    )
+    return f"{RESPONSE_KEY_PREFIX}{path}?{query}#{fingerprint}"
+
+
+async def invalidate_tags(*tags: str) -> None:
+    """
+    删除带有任一标签的全部缓存条目：一次管道读取各标签集合，
+    再一次 UNLINK 删除条目与标签集合本身
+    """
+    if not tags:
+        return
+    tag_keys = [TAG_KEY_PREFIX + tag for tag in dict.fromkeys(tags)]
+    redis = get_redis_client()
+    try:
+        async with redis.pipeline(transaction=False) as pipe:
+            for tag_key in tag_keys:
+                pipe.smembers(tag_key)
+            members = await pipe.execute()
+        await redis.unlink(*tag_keys, *set().union(*members))
+    except RedisError:
+        # 失效失败时条目最多在 TTL 到期前返回旧数据
+        logger.warning("响应缓存失效失败: %s", tags)
+
+
+def cache_response(*tags: str, ttl: int | None = None) -> Callable:
+    """
+    GET 接口响应缓存装饰器，序列化后的响应体存入 Redis
+
+    - 缓存键由请求路径、规范化查询参数与当前用户的权限指纹组成
+    - tags 可引用路由参数，如 "role:{role_id}"；写接口通过 invalidate_tags() 精确失效
+    - 只缓存处理函数返回的 200 Response (如 FastJSONResponse)，命中时直接返回响应体，
+      不执行处理函数；Redis 不可用时退化为不缓存
+    - 失效与并发读之间没有加锁，极端情况下旧数据最多保留 ttl 秒
+
+    用法 (置于 @router.get 之下):
+        @router.get("/{role_id}")
+        @cache_response("role:{role_id}")
+        async def get_role_detail(role_id: int, ...): ...
+    """
+
+    def decorator(endpoint: Callable) -> Callable:
+        signature = inspect.signature(endpoint)
+
+        @functools.wraps(endpoint)
+        async def wrapper(*args, _cache_request: Request, _cache_user: User, **kwargs):
+            if not settings.RESPONSE_CACHE_ENABLED:
+                return await endpoint(*args, **kwargs)
+
+            key = response_cache_key(
+                _cache_request.url.path,
+                _cache_request.scope["query_string"],
+                permission_fingerprint(
+                    r.role_id for r in _cache_user.roles if r.status == "1"
+                ),
+            )
+            redis = get_redis_client()
+            try:
+                body = await redis.get(key)
+            except RedisError:
+                RESPONSE_CACHE_REQUESTS.labels("error").inc()
+                return await endpoint(*args, **kwargs)
+            if body is not None:
+                RESPONSE_CACHE_REQUESTS.labels("hit").inc()
+                return Response(
+                    body, media_type="application/json", headers={"X-Cache": "HIT"}
+                )
+
+            RESPONSE_CACHE_REQUESTS.labels("miss").inc()
+            response = await endpoint(*args, **kwargs)
+            if isinstance(response, Response) and response.status_code == 200:
+                await _store(
+                    key,
+                    response.body,
+                    [tag.format(**kwargs) for tag in tags],
+                    ttl or settings.RESPONSE_CACHE_TTL,
+                )
+                response.headers["X-Cache"] = "MISS"
+            return response
+
+        # 在原签名后追加缓存所需的依赖；get_current_user 在同一请求内只执行一次
+        wrapper.__signature__ = signature.replace(
+            parameters=[
+                *signature.parameters.values(),
+                inspect.Parameter(
+                    "_cache_request", inspect.Parameter.KEYWORD_ONLY, annotation=Request
+                ),
+                inspect.Parameter(
+                    "_cache_user",
+                    inspect.Parameter.KEYWORD_ONLY,
+                    annotation=User,
+                    default=Depends(get_current_user),
+                ),
+            ]
+        )
+        return wrapper
+
+    return decorator
+
+
+async def _store(key: str, body: bytes, tags: list[str], ttl: int) -> None:
+    try:
+        async with get_redis_client().pipeline(transaction=False) as pipe:
+            pipe.set(key, body, ex=min(ttl, TAG_TTL))
+            for tag in tags:
+                pipe.sadd(TAG_KEY_PREFIX + tag, key)
+                pipe.expire(TAG_KEY_PREFIX + tag, TAG_TTL)
+            await pipe.execute()
+    except RedisError:
+        logger.warning("写入响应缓存失败: %s", key)
@@ -0,0 +1,15 @@
+from starlette.types import Scope
+
+
+def route_template(scope: Scope) -> str | None:
+    """
+    当前请求匹配到的完整路由模板 (如 /system/role/{role_id})，未匹配时返回 None
+
+    新版 FastAPI 延迟展开 include_router，scope["route"] 为子路由本身、不含前缀，
+    完整路径记录在 scope["fastapi"]["effective_route_context"] 中；旧版本直接取 route.path
+    """
+    context = scope.get("fastapi", {}).get("effective_route_context")
+    if context is not None and getattr(context, "path", None):
+        return context.path
+    route = scope.get("route")
+    return route.path if route else None
@@ -5,20 +5,23 @@ import bcrypt
 from jose import jwt
 
 from app.core.config import settings
+from app.core.metrics import PASSWORD_HASH_DURATION
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """验证明文密码与哈希值是否匹配"""
-    return bcrypt.checkpw(
-        plain_password.encode("utf-8"), hashed_password.encode("utf-8")
-    )
+    with PASSWORD_HASH_DURATION.labels("verify").time():
+        return bcrypt.checkpw(
+            plain_password.encode("utf-8"), hashed_password.encode("utf-8")
+        )
 
 
 def get_password_hash(password: str) -> str:
     """生成密码哈希值"""
     pwd_bytes = password.encode("utf-8")
-    salt = bcrypt.gensalt()
-    hashed = bcrypt.hashpw(pwd_bytes, salt)
+    with PASSWORD_HASH_DURATION.labels("hash").time():
+        salt = bcrypt.gensalt()
+        hashed = bcrypt.hashpw(pwd_bytes, salt)
     return hashed.decode("utf-8")
 
 
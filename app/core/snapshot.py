@@ -0,0 +1,100 @@
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+
+from redis.exceptions import RedisError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.redis import get_redis_client
+from app.core.redis_tracking import MISSING, hot_keys
+from app.db.session import AsyncSessionLocal, get_engines
+
+logger = logging.getLogger(__name__)
+
+
+class VersionedSnapshot[T]:
+    """
+    进程内只读快照，通过 Redis 中的版本号在多个 worker 之间失效
+
+    - 每隔 check_interval 秒最多查询一次 Redis 版本号，其余请求直接读内存
+    - 版本号变化 (任意 worker 调用 invalidate) 时重新执行 loader 加载
+    - 开启 REDIS_CLIENT_TRACKING 时版本号读取本地副本，变更由 Redis 推送，
+      不再受 check_interval 延迟
+    """
+
+    def __init__(
+        self,
+        version_key: str,
+        loader: Callable[[AsyncSession], Awaitable[T]],
+        check_interval: float,
+    ):
+        self.version_key = version_key
+        self.loader = loader
+        self.check_interval = check_interval
+        self._data: T | None = None
+        self._version: str | None = None
+        self._checked_at = 0.0
+        # invalidate 时 Redis 不可用，版本号尚未递增
+        self._unpublished = False
+        self._lock = asyncio.Lock()
+
+    @property
+    def version(self) -> str | None:
+        return self._version
+
+    async def get(self) -> T:
+        if self._data is not None and self._is_fresh():
+            return self._data
+
+        async with self._lock:
+            # 等锁期间可能已被其他协程刷新
+            if self._data is not None and self._is_fresh():
+                return self._data
+
+            if self._unpublished:
+                await self._publish()
+            try:
+                version = await hot_keys.get(self.version_key) or "0"
+            except RedisError:
+                if self._data is not None:
+                    logger.warning(
+                        "读取缓存版本号失败，继续使用旧快照: %s", self.version_key
+                    )
+                    return self._data
+                version = None
+
+            if self._data is None or version != self._version:
+                async with AsyncSessionLocal(bind=get_engines().read) as db:
+                    self._data = await self.loader(db)
+                self._version = version
+
+            self._checked_at = time.monotonic()
+            return self._data
+
+    async def invalidate(self) -> None:
+        """
+        数据发生变更后调用：丢弃本进程快照并递增全局版本号
+
+        在业务事务提交之后执行，Redis 不可用时只记录日志，不让已提交的写请求失败；
+        版本号在之后的 get() 中补递增，其他 worker 届时刷新
+        """
+        self._data = None
+        self._unpublished = True
+        await self._publish()
+
+    async def _publish(self) -> None:
+        try:
+            await get_redis_client().incr(self.version_key)
+        except RedisError:
+            logger.warning("递增缓存版本号失败，稍后重试: %s", self.version_key)
+            return
+        self._unpublished = False
+
+    def _is_fresh(self) -> bool:
+        # 开启客户端缓存时版本号的本地副本会被服务端推送失效，每次请求都可以核对；
+        # 副本已被删除 (收到失效推送) 时视为过期，经 get() 重新读取版本号
+        if hot_keys.active and hot_keys.tracks(self.version_key):
+            cached = hot_keys.peek(self.version_key)
+            return cached is not MISSING and (cached or "0") == self._version
+        return time.monotonic() - self._checked_at < self.check_interval
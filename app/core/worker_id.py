@@ -0,0 +1,173 @@
+import asyncio
+import logging
+import os
+import random
+import socket
+import uuid
+
+from redis.exceptions import RedisError
+
+from app.core import id_generator
+from app.core.config import settings
+from app.core.metrics import WORKER_ID_LEASE
+from app.core.redis import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+WORKER_ID_KEY_PREFIX = "snowflake:worker:"
+SLOT_COUNT = id_generator.MAX_INSTANCE + 1
+
+# 从 start 开始依次尝试 SET NX，一次往返找到空闲槽位，全部占满时返回 -1
+_ACQUIRE_SCRIPT = """
+local slots = tonumber(ARGV[3])
+local start = tonumber(ARGV[4])
+for i = 0, slots - 1 do
+    local slot = (start + i) % slots
+    if redis.call('SET', ARGV[1] .. slot, ARGV[2], 'NX', 'EX', ARGV[5]) then
+        return slot
+    end
+end
+return -1
+"""
+
+# 续期与释放都先确认持有者仍是自己，避免误操作他人租约
+_RENEW_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('EXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+_RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+class WorkerIdExhaustedError(RuntimeError):
+    """所有 worker id 槽位都已被占用"""
+
+
+class WorkerIdLease:
+    """
+    从 Redis 租用进程唯一的雪花 worker id
+
+    - SET NX + TTL 抢占槽位，后台心跳按 TTL 的 1/3 续期
+    - 续期发现租约丢失 (如 Redis 故障超过 TTL) 时重新申请，并切换 ID 生成器
+    - 关闭时主动释放，供新进程立即复用
+    """
+
+    def __init__(
+        self,
+        ttl: int,
+        *,
+        slots: int = SLOT_COUNT,
+        key_prefix: str = WORKER_ID_KEY_PREFIX,
+    ):
+        self.ttl = ttl
+        self.slots = slots
+        self.key_prefix = key_prefix
+        self.holder: str | None = None
+        self.worker_id: int | None = None
+        self._heartbeat: asyncio.Task | None = None
+
+    @property
+    def key(self) -> str:
+        return f"{self.key_prefix}{self.worker_id}"
+
+    async def acquire(self) -> int:
+        # 持有者在申请时生成，fork 出的子进程不会沿用父进程的身份
+        holder = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        # 重新申请时优先尝试原槽位，其余情况随机起点以减少冲突
+        start = (
+            self.worker_id
+            if self.worker_id is not None
+            else random.randrange(self.slots)
+        )
+        slot = await get_redis_client().eval(
+            _ACQUIRE_SCRIPT,
+            0,
+            self.key_prefix,
+            holder,
+            self.slots,
+            start,
+            self.ttl,
+        )
+        if slot < 0:
+            raise WorkerIdExhaustedError(f"{self.slots} 个 worker id 均已被占用")
+
+        self._switch(int(slot), holder)
+        logger.info("已租用 worker id %s (%s)", self.worker_id, self.holder)
+        return self.worker_id
+
+    async def renew(self) -> bool:
+        """续期租约，返回 False 表示租约已不属于本进程"""
+        return bool(
+            await get_redis_client().eval(
+                _RENEW_SCRIPT, 1, self.key, self.holder, self.ttl
+            )
+        )
+
+    async def release(self) -> None:
+        if self._heartbeat:
+            self._heartbeat.cancel()
+            self._heartbeat = None
+        if self.worker_id is None:
+            return
+        try:
+            await get_redis_client().eval(_RELEASE_SCRIPT, 1, self.key, self.holder)
+        except RedisError:
+            # 释放失败时租约会在 TTL 后自动过期
+            logger.warning("释放 worker id %s 失败", self.worker_id)
+        WORKER_ID_LEASE.labels(str(self.worker_id), self.holder).set(0)
+
+    def reset_after_fork(self) -> None:
+        """fork 出的子进程调用：忘记父进程的租约 (不释放，父进程仍持有)，启动时重新申请"""
+        self._heartbeat = None
+        self.worker_id = None
+        self.holder = None
+
+    def start_heartbeat(self) -> None:
+        self._heartbeat = asyncio.create_task(self._heartbeat_loop())
+
+    async def _heartbeat_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.ttl / 3)
+            try:
+                if await self.renew():
+                    continue
+                logger.error("worker id %s 租约已丢失，重新申请", self.worker_id)
+                await self.acquire()
+            except RedisError:
+                logger.warning("worker id %s 续期失败，稍后重试", self.worker_id)
+            except WorkerIdExhaustedError:
+                logger.critical("worker id 租约丢失且没有空闲槽位，稍后重试")
+
+    def _switch(self, worker_id: int, holder: str) -> None:
+        if self.worker_id is not None:
+            WORKER_ID_LEASE.labels(str(self.worker_id), self.holder).set(0)
+        # 重新租到同一槽位时沿用原生成器，避免同一毫秒内序列号从 0 重新开始
+        if self.worker_id != worker_id:
+            id_generator.configure(worker_id)
+        self.worker_id = worker_id
+        self.holder = holder
+        WORKER_ID_LEASE.labels(str(worker_id), self.holder).set(1)
+
+
+worker_lease = WorkerIdLease(settings.WORKER_ID_LEASE_SECONDS)
+
+
+async def setup_worker_id() -> None:
+    """启动时确定本进程的 worker id：优先使用固定配置，否则从 Redis 租用"""
+    if settings.WORKER_ID is not None:
+        id_generator.configure(settings.WORKER_ID)
+        WORKER_ID_LEASE.labels(str(settings.WORKER_ID), "static").set(1)
+        return
+    await worker_lease.acquire()
+    worker_lease.start_heartbeat()
+
+
+async def teardown_worker_id() -> None:
+    await worker_lease.release()
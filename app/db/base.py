@@ -42,3 +42,17 @@ role_menus = Table(
         primary_key=True,
     ),
 )
+
+
+# 角色-部门 关联表 (数据范围为自定义部门时可见的部门)
+role_depts = Table(
+    "sys_role_dept",
+    Base.metadata,
+    Column(
+        "role_id",
+        BigInteger,
+        ForeignKey("sys_role.role_id", ondelete="CASCADE"),
+        primary_key=True,
+    ),
+    Column("dept_id", BigInteger, primary_key=True, comment="部门ID"),
+)
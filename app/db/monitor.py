@@ -0,0 +1,155 @@
+import logging
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.metrics import (
+    DB_POOL_ACQUIRE_DURATION,
+    DB_POOL_CHECKED_OUT,
+    DB_POOL_OVERFLOW,
+)
+
+logger = logging.getLogger(__name__)
+
+# 展开后的 IN 参数列表 ($1, $2, ...) 归一化为同一种 SQL 形态
+_PARAM_LIST = re.compile(r"\((?:\s*(?:\$\d+|%\(\w+\)s|\?|:\w+)\s*,?)+\)")
+# 有意分块重复执行同一语句时 (如 CRUDBase.bulk_delete) 设置该执行选项，
+# 这些语句照常计入条数与耗时，但不参与 N+1 检测
+BATCHED_EXECUTION_OPTION = "sql_monitor_batched"
+
+
+class NPlusOneError(RuntimeError):
+    """同一请求内重复执行同一形态的 SQL 次数超出阈值"""
+
+
+@dataclass
+class QueryStats:
+    """单个请求内的 SQL 统计"""
+
+    count: int = 0
+    duration: float = 0.0  # 秒
+    shapes: Counter = field(default_factory=Counter)
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.duration * 1000:.2f};desc="{self.count} queries"'
+
+
+_query_stats: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+def statement_shape(statement: str) -> str:
+    """去掉参数差异后的 SQL 形态，用于识别 N+1 查询"""
+    return _PARAM_LIST.sub("(?)", statement)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, _cursor, _statement, _parameters, _context, _many):
+    if _query_stats.get() is not None:
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, _cursor, statement, _parameters, context, _many):
+    stats = _query_stats.get()
+    if stats is None:
+        return
+
+    stats.count += 1
+    stats.duration += time.perf_counter() - conn.info["query_start_time"].pop()
+    if context is not None and context.execution_options.get(BATCHED_EXECUTION_OPTION):
+        return
+
+    shape = statement_shape(statement)
+    stats.shapes[shape] += 1
+    if stats.shapes[shape] == settings.SQL_N_PLUS_ONE_THRESHOLD + 1:
+        msg = (
+            f"疑似 N+1 查询: 同一 SQL 在单个请求中执行超过 "
+            f"{settings.SQL_N_PLUS_ONE_THRESHOLD} 次: {shape}"
+        )
+        if settings.SQL_N_PLUS_ONE_RAISE:
+            raise NPlusOneError(msg)
+        logger.warning(msg)
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """记录连接获取耗时的连接池，指标标签取自 pool_logging_name"""
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            DB_POOL_ACQUIRE_DURATION.labels(self._orig_logging_name).observe(
+                time.perf_counter() - start
+            )
+
+
+def instrument_pool(engine: AsyncEngine) -> None:
+    """为引擎的连接池注册签出/归还事件，更新连接数指标 (dispose 重建连接池后依然生效)"""
+    sync_engine = engine.sync_engine
+    if not isinstance(sync_engine.pool, InstrumentedPool):
+        return
+    name = sync_engine.pool._orig_logging_name
+
+    def update_gauges(checked_out_delta: int):
+        DB_POOL_CHECKED_OUT.labels(name).inc(checked_out_delta)
+        DB_POOL_OVERFLOW.labels(name).set(max(sync_engine.pool.overflow(), 0))
+
+    @event.listens_for(sync_engine.pool, "checkout")
+    def _on_checkout(_dbapi_conn, _connection_record, _connection_proxy):
+        update_gauges(1)
+
+    @event.listens_for(sync_engine.pool, "checkin")
+    def _on_checkin(_dbapi_conn, _connection_record):
+        update_gauges(-1)
+
+
+class SQLMonitorMiddleware:
+    """
+    统计每个请求的 SQL 条数与耗时，写入 Server-Timing 响应头并输出结构化日志
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = _query_stats.set(stats)
+
+        async def send_wrapper(message: Message):
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append(
+                    "Server-Timing", stats.server_timing()
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _query_stats.reset(token)
+            if stats.count:
+                logger.info(
+                    "sql_stats method=%s path=%s count=%d duration_ms=%.2f",
+                    scope["method"],
+                    scope["path"],
+                    stats.count,
+                    stats.duration * 1000,
+                    extra={
+                        "sql_count": stats.count,
+                        "sql_duration_ms": round(stats.duration * 1000, 2),
+                    },
+                )
@@ -0,0 +1,81 @@
+import itertools
+import time
+
+from fastapi import Request
+from jose import JWTError, jwt
+from redis.exceptions import RedisError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import settings
+from app.core.redis import get_redis_client
+
+STICKY_KEY_PREFIX = "db:sticky:"
+
+
+class ReplicaRouter:
+    """
+    只读副本路由器：轮询选择副本，连接失败的副本在一段时间内被剔除
+    """
+
+    def __init__(self, engines: list[AsyncEngine], eject_seconds: int):
+        self.engines = engines
+        self.eject_seconds = eject_seconds
+        self._cursor = itertools.count()
+        self._ejected_until: dict[AsyncEngine, float] = {}
+
+    def candidates(self) -> list[AsyncEngine]:
+        """按轮询顺序返回当前健康的副本列表"""
+        count = len(self.engines)
+        if not count:
+            return []
+
+        start = next(self._cursor) % count
+        now = time.monotonic()
+        ordered = self.engines[start:] + self.engines[:start]
+        return [e for e in ordered if self._ejected_until.get(e, 0) <= now]
+
+    def eject(self, engine: AsyncEngine) -> None:
+        """将副本标记为不可用，直到剔除窗口结束"""
+        self._ejected_until[engine] = time.monotonic() + self.eject_seconds
+
+
+def request_subject(request: Request) -> str | None:
+    """
+    从 Bearer Token 中提取 sub (用户ID)，仅用于读写路由，不做签名校验
+    """
+    authorization = request.headers.get("Authorization")
+    if not authorization:
+        return None
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        return jwt.get_unverified_claims(token).get("sub")
+    except JWTError:
+        return None
+
+
+async def mark_primary_sticky(subject: str | None) -> None:
+    """记录用户刚刚发生过写入，窗口期内该用户的读请求走主库"""
+    if not subject or not settings.DATABASE_REPLICA_URLS:
+        return
+    try:
+        await get_redis_client().set(
+            STICKY_KEY_PREFIX + subject,
+            1,
+            ex=settings.DATABASE_REPLICA_STICKY_SECONDS,
+        )
+    except RedisError:
+        # 粘滞标记丢失只会导致短暂读到旧数据，不应影响写请求本身
+        pass
+
+
+async def is_primary_sticky(subject: str | None) -> bool:
+    """判断用户是否处于写后读主库的窗口期内"""
+    if not subject:
+        return False
+    try:
+        return bool(await get_redis_client().exists(STICKY_KEY_PREFIX + subject))
+    except RedisError:
+        # 无法确认时保守地读主库
+        return True
@@ -1,27 +1,172 @@
+import logging
 from collections.abc import AsyncGenerator
+from dataclasses import dataclass
+from uuid import uuid4
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
-from sqlalchemy.orm import DeclarativeBase
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.exc import DBAPIError, InvalidRequestError
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import DeclarativeBase, Session
+from sqlalchemy.pool import NullPool
 
 from app.core.config import settings
+from app.db.monitor import InstrumentedPool, instrument_pool
+from app.db.routing import (
+    ReplicaRouter,
+    is_primary_sticky,
+    mark_primary_sticky,
+    request_subject,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _pool_args() -> dict:
+    if settings.DB_PGBOUNCER_TRANSACTION_MODE:
+        # PgBouncer transaction 模式下服务端连接会在事务之间切换：
+        # 关闭预编译语句缓存并使用唯一语句名，连接复用交给 PgBouncer (NullPool)
+        return {
+            "poolclass": NullPool,
+            "connect_args": {
+                "statement_cache_size": 0,
+                "prepared_statement_cache_size": 0,
+                "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+            },
+        }
+    return {
+        "poolclass": InstrumentedPool,
+        "pool_size": settings.DB_POOL_SIZE,  # 连接池大小
+        "max_overflow": settings.DB_MAX_OVERFLOW,  # 超过池大小后允许的额外连接数
+        "pool_timeout": 30,  # 等待连接池中连接释放的最大秒数
+        "pool_use_lifo": True,  # 优先使用最近使用过的连接（保持连接活跃，减少被断开风险）
+        "connect_args": {
+            # 每个连接缓存的预编译语句数量，连接存活期间重复查询无需再次 PREPARE
+            "prepared_statement_cache_size": settings.DB_PREPARED_STATEMENT_CACHE_SIZE,
+        },
+    }
+
+
+def _create_engine(url: str, name: str) -> AsyncEngine:
+    async_engine = create_async_engine(
+        url,
+        echo=settings.DB_ECHO,
+        pool_logging_name=name,  # 同时作为连接池监控指标的 pool 标签
+        pool_pre_ping=True,  # 自动检查连接是否存活
+        pool_recycle=3600,  # 每隔一小时强制回收连接（建议小于数据库或防火墙的 idle_timeout）
+        **_pool_args(),
+    )
+    instrument_pool(async_engine)
+    return async_engine
+
+
+def _autocommit(bind: AsyncEngine) -> AsyncEngine:
+    # 读请求使用 AUTOCOMMIT：不发送 BEGIN / COMMIT，每个查询省去两次往返
+    # 与原引擎共享同一个连接池，连接归还时隔离级别会被自动还原
+    return bind.execution_options(isolation_level="AUTOCOMMIT")
+
+
+@dataclass(frozen=True)
+class DatabaseEngines:
+    primary: AsyncEngine
+    read: AsyncEngine  # 主库的只读 (AUTOCOMMIT) 视图
+    replicas: list[AsyncEngine]  # 未配置 DATABASE_REPLICA_URLS 时为空，读请求直接走主库
+    replica_router: ReplicaRouter
+
+    @property
+    def all(self) -> list[AsyncEngine]:
+        return [self.primary, *self.replicas]
+
 
 # 1. 创建异步数据库引擎
-# echo=True 会在终端打印 SQL 语句，开发环境下很有用
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=True,
-    pool_pre_ping=True,  # 自动检查连接是否存活
-    pool_size=10,  # 连接池大小
-    max_overflow=20,  # 超过池大小后允许的额外连接数
-    pool_recycle=3600,  # 每隔一小时强制回收连接（建议小于数据库或防火墙的 idle_timeout）
-    pool_timeout=30,  # 等待连接池中连接释放的最大秒数
-    pool_use_lifo=True,  # 优先使用最近使用过的连接（保持连接活跃，减少被断开风险）
-)
+# 引擎在首次使用时才创建，导入本模块不会加载数据库驱动或建立连接池
+# DB_ECHO=true 会在终端打印 SQL 语句，开发环境下很有用
+_engines: DatabaseEngines | None = None
+
+
+def get_engines() -> DatabaseEngines:
+    """获取 (必要时创建) 主库与只读副本引擎"""
+    global _engines
+    if _engines is None:
+        primary = _create_engine(settings.DATABASE_URL, "primary")
+        replicas = [
+            _create_engine(url, f"replica{i}")
+            for i, url in enumerate(settings.DATABASE_REPLICA_URLS)
+        ]
+        _engines = DatabaseEngines(
+            primary=primary,
+            read=_autocommit(primary),
+            replicas=replicas,
+            replica_router=ReplicaRouter(
+                [_autocommit(e) for e in replicas],
+                eject_seconds=settings.DATABASE_REPLICA_EJECT_SECONDS,
+            ),
+        )
+    return _engines
+
+
+def reset_engines_after_fork() -> None:
+    """
+    fork 出的子进程调用：丢弃从父进程继承的引擎，下次使用时重新创建。
+    close=False 只丢弃连接池而不关闭继承来的连接，避免影响父进程仍在使用的 socket
+    """
+    global _engines
+    if _engines is not None:
+        for async_engine in _engines.all:
+            async_engine.sync_engine.dispose(close=False)
+        _engines = None
+
+
+def get_engine() -> AsyncEngine:
+    """主库引擎"""
+    return get_engines().primary
+
+
+def __getattr__(name: str):
+    # 兼容 `from app.db.session import engine` 的旧写法
+    if name == "engine":
+        return get_engines().primary
+    if name == "read_engine":
+        return get_engines().read
+    if name == "replica_engines":
+        return get_engines().replicas
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class TrackedSession(Session):
+    """在 session.info 中记录本次会话是否产生过写操作，只读 Session 禁止写入"""
+
+
+@event.listens_for(TrackedSession, "before_flush")
+def _forbid_read_only_flush(session, _flush_context, _instances):
+    if session.info.get("read_only"):
+        raise InvalidRequestError("只读 Session 不允许写操作，请使用 get_db")
+
+
+@event.listens_for(TrackedSession, "after_flush")
+def _mark_flush_writes(session, _flush_context):
+    session.info["has_writes"] = True
+
+
+@event.listens_for(TrackedSession, "do_orm_execute")
+def _mark_dml_writes(orm_execute_state):
+    # delete()/update()/insert() 语句不经过 flush，需要单独记录
+    if not orm_execute_state.is_select:
+        if orm_execute_state.session.info.get("read_only"):
+            raise InvalidRequestError("只读 Session 不允许写操作，请使用 get_db")
+        orm_execute_state.session.info["has_writes"] = True
+
 
 # 2. 创建异步 Session 工厂
+# 引擎延迟创建，使用时需显式传入 bind，例如 AsyncSessionLocal(bind=get_engine())
 AsyncSessionLocal = async_sessionmaker(
-    bind=engine,
     class_=AsyncSession,
+    sync_session_class=TrackedSession,
     autocommit=False,
     autoflush=False,
     expire_on_commit=False,  # 异步环境下通常设为 False 避免属性过期错误
@@ -35,16 +180,55 @@ class Base(DeclarativeBase):
 
 # 4. 数据库依赖注入函数 (Dependency Injection)
 # 这个函数用于 FastAPI 的 Depends()
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
+async def get_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
     """
     每个请求创建一个新的异步 Session，并在请求结束时自动关闭。
     """
-    async with AsyncSessionLocal() as session:
+    async with AsyncSessionLocal(bind=get_engine()) as session:
         try:
             yield session
-            await session.commit()  # 也可以在业务代码中手动 commit
+            # 业务代码通常已手动 commit，只有仍处于事务中时才需要提交
+            if session.in_transaction():
+                await session.commit()
+            if session.info.get("has_writes"):
+                await mark_primary_sticky(request_subject(request))
         except Exception:
             await session.rollback()
             raise
         finally:
             await session.close()
+
+
+async def _open_read_session(request: Request) -> AsyncSession:
+    """
+    轮询选择健康的只读副本建立 Session；副本全部不可用、
+    或当前用户处于写后粘滞窗口期时回落到主库。
+    """
+    engines = get_engines()
+    if engines.replicas and not await is_primary_sticky(request_subject(request)):
+        for replica in engines.replica_router.candidates():
+            session = AsyncSessionLocal(bind=replica)
+            try:
+                # 提前签出连接，连接失败时可以立即切换到下一个副本
+                await session.connection()
+            except (OSError, DBAPIError):
+                await session.close()
+                engines.replica_router.eject(replica)
+                logger.warning("只读副本不可用，已暂时剔除: %s", replica.url)
+                continue
+            return session
+
+    return AsyncSessionLocal(bind=engines.read)
+
+
+async def get_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """
+    只读 Session 依赖：用于所有 GET 查询接口。
+    以 AUTOCOMMIT 模式执行，从不提交；任何写操作都会直接报错。
+    """
+    session = await _open_read_session(request)
+    session.info["read_only"] = True
+    try:
+        yield session
+    finally:
+        await session.close()
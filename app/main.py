@@ -1,18 +1,58 @@
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse
 
+from app.core.audit import AuditMiddleware
+from app.core.config import settings
+from app.core.lifespan import lifespan
+from app.core.metrics import PrometheusMiddleware, metrics
+from app.core.openapi import setup_openapi
+from app.core.profiling import ProfilingMiddleware
+from app.core.rate_limit import RateLimitMiddleware
+from app.db.monitor import SQLMonitorMiddleware
 from app.modules.auth.api import router as auth_router
+from app.modules.system.api.dict import router as dict_router
 from app.modules.system.api.menu import router as menu_router
 from app.modules.system.api.role import router as role_router
 from app.modules.system.api.user import router as user_router
 
-app = FastAPI()
+app = FastAPI(
+    lifespan=lifespan,
+    # 生产环境可设置 OPENAPI_MODE=disabled 关闭 /docs 与 /openapi.json
+    openapi_url=None if settings.OPENAPI_MODE == "disabled" else "/openapi.json",
+)
+app.state.ready = False  # 预热完成后由 lifespan 置为 True
+
+app.add_middleware(AuditMiddleware)
+app.add_middleware(SQLMonitorMiddleware)
+app.add_middleware(RateLimitMiddleware)
+app.add_middleware(PrometheusMiddleware)
+if settings.PROFILING_ENABLED:
+    # 最外层，报告覆盖全部中间件；关闭时不注册，没有任何开销
+    app.add_middleware(ProfilingMiddleware)
+app.add_route("/metrics", metrics, include_in_schema=False)
 
 app.include_router(auth_router, prefix="/auth", tags=["认证模块"])
 app.include_router(user_router, prefix="/system/user", tags=["用户管理"])
 app.include_router(role_router, prefix="/system/role", tags=["角色管理"])
 app.include_router(menu_router, prefix="/system/menu", tags=["菜单管理"])
+app.include_router(dict_router, prefix="/system/dict", tags=["字典管理"])
+
+setup_openapi(app)
 
 
 @app.get("/")
 def read_root():
     return {"Hello": "PancakeAdmin"}
+
+
+@app.get("/health/live", include_in_schema=False)
+async def liveness():
+    return {"status": "ok"}
+
+
+@app.get("/health/ready", include_in_schema=False)
+async def readiness():
+    # 连接池、Redis 与权限缓存预热完成前返回 503，负载均衡暂不转发流量
+    if not app.state.ready:
+        return JSONResponse(status_code=503, content={"status": "warming_up"})
+    return {"status": "ready"}
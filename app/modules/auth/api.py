@@ -5,11 +5,17 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.constants.static_routes import CONSTANT_ROUTES
 from app.core.base_response import ResponseModel
+from app.core.rate_limit import rate_limit
+from app.core.rbac import rbac_cache
 from app.core.security import get_password_hash
-from app.db.session import get_db
+from app.db.session import get_db, get_read_db
 from app.modules.auth.schemas.auth import LoginCredentials
-from app.modules.auth.service import auth_service, build_menu_tree, get_current_user
-from app.modules.system.models.menu import Menu
+from app.modules.auth.service import (
+    auth_service,
+    build_menu_tree,
+    get_current_user,
+    route_name_exists,
+)
 from app.modules.system.models.user import User
 from app.modules.system.schemas.user import UserCreate, UserOut
 
@@ -17,6 +23,7 @@ router = APIRouter()
 
 
 @router.post("/register", response_model=UserOut, summary="用户注册")
+@rate_limit(5, 60, per="ip")
 async def register(user_in: UserCreate, db: AsyncSession = Depends(get_db)):
     """
     注册新用户：校验重复 -> Hash密码 -> 持久化
@@ -41,6 +48,7 @@ async def register(user_in: UserCreate, db: AsyncSession = Depends(get_db)):
 
 
 @router.post("/login", summary="用户登录")
+@rate_limit(10, 60, per="ip")
 async def login(
     credentials: LoginCredentials,
     db: AsyncSession = Depends(get_db),
@@ -58,12 +66,9 @@ async def get_user_info(current_user: User = Depends(get_current_user)):
     roles = [role.role_code for role in current_user.roles]
 
     # 提取按钮级权限标识 (如: ['sys:user:add', 'sys:user:edit'])
-    # 遍历用户持有的所有角色，再遍历角色拥有的菜单，提取 permission 字段
-    permissions = set()
-    for role in current_user.roles:
-        for menu in role.menus:
-            if menu.permission:  # 只有定义了权限标识的才加入
-                permissions.add(menu.permission)
+    # 从内存权限索引中汇总用户所有角色拥有的 permission
+    snapshot = await rbac_cache.get()
+    permissions = snapshot.permissions(role.role_id for role in current_user.roles)
 
     return ResponseModel.success(
         data={
@@ -84,15 +89,15 @@ async def get_user_routes(current_user: User = Depends(get_current_user)):
     获取当前用户的动态路由树
     """
     # 汇总当前用户所有角色下的菜单 (去重)
-    all_menus_dict = {}
-    for role in current_user.roles:
-        for menu in role.menus:
-            # 过滤掉按钮级权限，只保留菜单和目录
-            if menu.menu_type in ["M", "C"] and menu.status == "1":
-                all_menus_dict[menu.menu_id] = menu
+    snapshot = await rbac_cache.get()
+    menu_list = [
+        menu
+        for menu in snapshot.role_menus(role.role_id for role in current_user.roles)
+        # 过滤掉按钮级权限，只保留菜单和目录
+        if menu.menu_type in ["M", "C"] and menu.status == "1"
+    ]
 
     # 构建树形结构
-    menu_list = list(all_menus_dict.values())
     route_tree = build_menu_tree(menu_list, 0)
 
     return ResponseModel.success(
@@ -123,9 +128,6 @@ async def get_constant_routes():
 @router.get("/isRouteExist", summary="检查路由名称是否存在")
 async def is_route_exist(
     route_name: str = Query(..., description="前端路由名称"),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    stmt = select(Menu).where(Menu.route_name == route_name)
-    result = await db.execute(stmt)
-    exists = result.scalars().first() is not None
-    return ResponseModel.success(data=exists)
+    return ResponseModel.success(data=await route_name_exists(db, route_name))
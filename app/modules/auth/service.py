@@ -1,14 +1,17 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
-from sqlalchemy import select
+from sqlalchemy import StatementLambdaElement, lambda_stmt, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from app.core.activity import activity_tracker
+from app.core.audit import set_actor as set_audit_actor
 from app.core.base_response import ResponseModel
+from app.core.cache import cached
 from app.core.config import settings
 from app.core.security import create_access_token, verify_password
-from app.db.session import get_db
+from app.db.session import get_read_db
 from app.modules.auth.schemas.auth import LoginCredentials, RouteMeta, UserRoute
 from app.modules.system.models.menu import Menu
 from app.modules.system.models.role import Role
@@ -18,6 +21,23 @@ from app.modules.system.models.user import User
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
 
+# 高频查询使用 lambda_stmt：语句只在首次调用时构建并生成缓存键，
+# 之后的调用仅提取闭包中的参数值，直接命中 SQLAlchemy 编译缓存
+def login_user_stmt(user_name: str) -> StatementLambdaElement:
+    return lambda_stmt(lambda: select(User).where(User.user_name == user_name))
+
+
+def current_user_stmt(user_id: int) -> StatementLambdaElement:
+    # 角色对应的菜单与权限从内存快照 rbac_cache 获取，这里不加载 Role.menus
+    return lambda_stmt(
+        lambda: (
+            select(User)
+            .where(User.user_id == user_id)
+            .options(selectinload(User.roles).noload(Role.menus))
+        )
+    )
+
+
 class AuthService:
     async def authenticate(self, credentials: LoginCredentials, db: AsyncSession):
         # 策略分发
@@ -41,7 +61,7 @@ class AuthService:
 
     async def _verify_password_login(self, cred, db):
         # 1. 查找用户
-        result = await db.execute(select(User).where(User.user_name == cred.user_name))
+        result = await db.execute(login_user_stmt(cred.user_name))
         user = result.scalars().first()
 
         # 2. 验证密码
@@ -63,50 +83,69 @@ class AuthService:
 auth_service = AuthService()
 
 
-async def get_current_user(
-    token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)
-) -> User:
-    """
-    JWT Token 验证依赖项
-    """
-    credentials_exception = HTTPException(
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Token 无效或已过期",
         headers={"WWW-Authenticate": "Bearer"},
     )
 
+
+def decode_access_token(token: str) -> int:
+    """校验 JWT 签名与有效期，返回其中的用户ID"""
     try:
-        # 1. 解码 Token
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
         )
         user_id_str: str = payload.get("sub")
         if user_id_str is None:
-            raise credentials_exception
+            raise _credentials_exception()
 
         # --- 核心修复点：将字符串转为整数 ---
-        user_id = int(user_id_str)
+        return int(user_id_str)
     except JWTError:
-        raise credentials_exception
-
-    # 2. 查询用户并预加载角色和菜单 (RBAC 核心)
-    # 使用 selectinload 解决异步环境下的关联查询
-    result = await db.execute(
-        select(User)
-        .where(User.user_id == user_id)
-        .options(selectinload(User.roles).selectinload(Role.menus))
-    )
+        raise _credentials_exception()
+
+
+async def get_token_user_id(token: str = Depends(oauth2_scheme)) -> int:
+    """
+    只校验 Token 的依赖项，不查询数据库；
+    用于字典等无需角色信息的高频只读接口
+    """
+    return decode_access_token(token)
+
+
+async def get_current_user(
+    token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_read_db)
+) -> User:
+    """
+    JWT Token 验证依赖项
+    """
+    # 1. 解码 Token
+    user_id = decode_access_token(token)
+
+    # 2. 查询用户并预加载角色 (RBAC 核心)
+    result = await db.execute(current_user_stmt(user_id))
     user = result.scalars().first()
 
     if user is None:
-        raise credentials_exception
+        raise _credentials_exception()
 
     if not user.status or user.status == "2":
         raise HTTPException(status_code=403, detail="账号已被禁用")
 
+    set_audit_actor(user.user_id, user.user_name)
+    await activity_tracker.touch(user.user_id)
     return user
 
 
+@cached("route_exists", ttl=300)
+async def route_name_exists(db: AsyncSession, route_name: str) -> bool:
+    """前端路由名称是否已被菜单占用；菜单变更后需调用 route_name_exists.cache.clear()"""
+    stmt = select(Menu.menu_id).where(Menu.route_name == route_name).limit(1)
+    return (await db.execute(stmt)).first() is not None
+
+
 def build_menu_tree(menus: list[Menu], parent_id: int = None) -> list[UserRoute]:
     """
     递归构建路由树
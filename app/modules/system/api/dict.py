@@ -0,0 +1,303 @@
+from fastapi import APIRouter, Body, Depends, Header, HTTPException, Query, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.auth import get_current_user
+from app.core.base_response import FastJSONResponse, PageResult, ResponseModel
+from app.core.dict_cache import dict_cache
+from app.core.rate_limit import rate_limit
+from app.db.session import get_db, get_read_db
+from app.modules.auth.service import get_token_user_id
+from app.modules.system.crud.crud_dict import crud_dict_data, crud_dict_type
+from app.modules.system.models.dict import DictData, DictType
+from app.modules.system.models.user import User
+from app.modules.system.schemas.dict import (
+    DictDataCreate,
+    DictDataOut,
+    DictDataQuery,
+    DictDataUpdate,
+    DictOption,
+    DictTypeCreate,
+    DictTypeOut,
+    DictTypeQuery,
+    DictTypeUpdate,
+)
+
+router = APIRouter()
+
+# 单次批量获取的字典类型数量上限
+MAX_LOOKUP_TYPES = 50
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = {t.strip().removeprefix("W/") for t in if_none_match.split(",")}
+    return "*" in tags or etag in tags
+
+
+@router.get(
+    "/lookup",
+    response_model=ResponseModel[dict[str, list[DictOption]]],
+    summary="批量获取字典项",
+)
+async def lookup_dicts(
+    types: str = Query(..., description="字典类型编码，多个以逗号分隔"),
+    if_none_match: str | None = Header(None),
+    _user_id: int = Depends(get_token_user_id),
+):
+    """
+    一次返回多个字典类型的启用项，例如 ?types=sys_user_gender,sys_status
+
+    数据来自进程内快照 (字典变更时按版本号失效)，响应体按类型组合缓存；
+    只校验 Token 不查询用户，整个请求不访问数据库。
+    客户端携带 If-None-Match 且内容未变化时返回 304。
+    """
+    dict_types = [t for t in (s.strip() for s in types.split(",")) if t]
+    if not dict_types:
+        raise HTTPException(status_code=400, detail="未指定字典类型")
+    if len(dict_types) > MAX_LOOKUP_TYPES:
+        raise HTTPException(
+            status_code=400, detail=f"一次最多获取 {MAX_LOOKUP_TYPES} 个字典类型"
+        )
+
+    snapshot = await dict_cache.get()
+    body, etag = snapshot.lookup(dict_types)
+    # no-cache：浏览器可以缓存，但每次使用前需携带 ETag 向服务端确认
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(body, media_type="application/json", headers=headers)
+
+
+@router.get(
+    "/type/list",
+    response_model=ResponseModel[PageResult[DictTypeOut]],
+    summary="获取字典类型分页",
+)
+async def list_dict_types(
+    query: DictTypeQuery = Depends(),
+    db: AsyncSession = Depends(get_read_db),
+    _current_user: User = Depends(get_current_user),
+):
+    filters = []
+    if query.dict_name:
+        filters.append(DictType.dict_name.contains(query.dict_name))
+    if query.dict_type:
+        filters.append(DictType.dict_type.contains(query.dict_type))
+    if query.status:
+        filters.append(DictType.status == query.status)
+
+    total, dict_types = await crud_dict_type.get_page(
+        db,
+        current=query.current,
+        size=query.size,
+        filters=filters,
+        order_by=[DictType.create_time.desc()],
+    )
+
+    return FastJSONResponse(
+        ResponseModel.success(
+            data=PageResult(
+                records=[DictTypeOut.model_validate(t) for t in dict_types],
+                total=total,
+                current=query.current,
+                size=query.size,
+            )
+        )
+    )
+
+
+@router.post("/type/add", summary="创建字典类型")
+async def add_dict_type(
+    type_in: DictTypeCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    check = await db.execute(
+        select(DictType.dict_id).where(DictType.dict_type == type_in.dict_type)
+    )
+    if check.first():
+        raise HTTPException(status_code=400, detail="字典类型编码已存在")
+
+    db.add(DictType(**type_in.model_dump(), create_by=current_user.user_name))
+    await db.commit()
+    await dict_cache.invalidate()
+    return ResponseModel.success(msg="字典类型创建成功")
+
+
+@router.put("/type/{dict_id}", summary="编辑字典类型")
+async def update_dict_type(
+    dict_id: int,
+    type_in: DictTypeUpdate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    修改字典类型编码时，数据库外键会级联更新对应的字典数据
+    """
+    dict_type = await db.get(DictType, dict_id)
+    if not dict_type:
+        raise HTTPException(status_code=404, detail="字典类型不存在")
+
+    update_data = type_in.model_dump(exclude_unset=True)
+    new_code = update_data.get("dict_type")
+    if new_code and new_code != dict_type.dict_type:
+        check = await db.execute(
+            select(DictType.dict_id).where(DictType.dict_type == new_code)
+        )
+        if check.first():
+            raise HTTPException(status_code=400, detail="字典类型编码已存在")
+
+    for field, value in update_data.items():
+        setattr(dict_type, field, value)
+
+    dict_type.update_by = current_user.user_name
+    await db.commit()
+    await dict_cache.invalidate()
+    return ResponseModel.success(msg="字典类型更新成功")
+
+
+@router.delete("/type/{dict_id}", summary="删除字典类型")
+async def delete_dict_type(
+    dict_id: int,
+    db: AsyncSession = Depends(get_db),
+    _current_user: User = Depends(get_current_user),
+):
+    """
+    删除字典类型及其全部字典数据 (外键级联删除)
+    """
+    dict_type = await db.get(DictType, dict_id)
+    if not dict_type:
+        raise HTTPException(status_code=404, detail="字典类型不存在")
+
+    await db.delete(dict_type)
+    await db.commit()
+    await dict_cache.invalidate()
+    return ResponseModel.success(msg="字典类型删除成功")
+
+
+@router.post("/type/batch-delete", summary="批量删除字典类型")
+@rate_limit(30, 60)
+async def batch_delete_dict_types(
+    ids: list[int] = Body(...),
+    db: AsyncSession = Depends(get_db),
+    _current_user: User = Depends(get_current_user),
+):
+    counts = await crud_dict_type.bulk_delete(db, ids)
+
+    await db.commit()
+    await dict_cache.invalidate()
+    return ResponseModel.success(
+        data={"deleted": sum(counts), "chunks": counts},
+        msg=f"成功删除 {sum(counts)} 条数据",
+    )
+
+
+@router.get(
+    "/data/list",
+    response_model=ResponseModel[PageResult[DictDataOut]],
+    summary="获取字典数据分页",
+)
+async def list_dict_data(
+    query: DictDataQuery = Depends(),
+    db: AsyncSession = Depends(get_read_db),
+    _current_user: User = Depends(get_current_user),
+):
+    filters = []
+    if query.dict_type:
+        filters.append(DictData.dict_type == query.dict_type)
+    if query.dict_label:
+        filters.append(DictData.dict_label.contains(query.dict_label))
+    if query.status:
+        filters.append(DictData.status == query.status)
+
+    total, dict_data = await crud_dict_data.get_page(
+        db,
+        current=query.current,
+        size=query.size,
+        filters=filters,
+        order_by=[DictData.dict_type, DictData.dict_sort],
+    )
+
+    return FastJSONResponse(
+        ResponseModel.success(
+            data=PageResult(
+                records=[DictDataOut.model_validate(d) for d in dict_data],
+                total=total,
+                current=query.current,
+                size=query.size,
+            )
+        )
+    )
+
+
+@router.post("/data/add", summary="创建字典数据")
+async def add_dict_data(
+    data_in: DictDataCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    check = await db.execute(
+        select(DictType.dict_id).where(DictType.dict_type == data_in.dict_type)
+    )
+    if not check.first():
+        raise HTTPException(status_code=400, detail="字典类型不存在")
+
+    db.add(DictData(**data_in.model_dump(), create_by=current_user.user_name))
+    await db.commit()
+    await dict_cache.invalidate()
+    return ResponseModel.success(msg="字典数据创建成功")
+
+
+@router.put("/data/{data_id}", summary="编辑字典数据")
+async def update_dict_data(
+    data_id: int,
+    data_in: DictDataUpdate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    dict_data = await db.get(DictData, data_id)
+    if not dict_data:
+        raise HTTPException(status_code=404, detail="字典数据不存在")
+
+    for field, value in data_in.model_dump(exclude_unset=True).items():
+        setattr(dict_data, field, value)
+
+    dict_data.update_by = current_user.user_name
+    await db.commit()
+    await dict_cache.invalidate()
+    return ResponseModel.success(msg="字典数据更新成功")
+
+
+@router.delete("/data/{data_id}", summary="删除字典数据")
+async def delete_dict_data(
+    data_id: int,
+    db: AsyncSession = Depends(get_db),
+    _current_user: User = Depends(get_current_user),
+):
+    dict_data = await db.get(DictData, data_id)
+    if not dict_data:
+        raise HTTPException(status_code=404, detail="字典数据不存在")
+
+    await db.delete(dict_data)
+    await db.commit()
+    await dict_cache.invalidate()
+    return ResponseModel.success(msg="字典数据删除成功")
+
+
+@router.post("/data/batch-delete", summary="批量删除字典数据")
+@rate_limit(30, 60)
+async def batch_delete_dict_data(
+    ids: list[int] = Body(...),
+    db: AsyncSession = Depends(get_db),
+    _current_user: User = Depends(get_current_user),
+):
+    counts = await crud_dict_data.bulk_delete(db, ids)
+
+    await db.commit()
+    await dict_cache.invalidate()
+    return ResponseModel.success(
+        data={"deleted": sum(counts), "chunks": counts},
+        msg=f"成功删除 {sum(counts)} 条数据",
+    )
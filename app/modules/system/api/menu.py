@@ -1,13 +1,20 @@
 from fastapi import APIRouter, Body, Depends, HTTPException
-from sqlalchemy import and_, delete, func, select
+from sqlalchemy import and_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.auth import get_current_user
-from app.core.base_response import PageResult, ResponseModel
-from app.db.session import get_db
+from app.core.base_response import FastJSONResponse, PageResult, ResponseModel
+from app.core.rate_limit import rate_limit
+from app.core.rbac import rbac_cache
+from app.core.response_cache import cache_response, invalidate_tags
+from app.db.session import get_db, get_read_db
+from app.modules.auth.service import route_name_exists
+from app.modules.system.crud.base import in_ids
+from app.modules.system.crud.crud_menu import crud_menu
 from app.modules.system.models.menu import Menu
 from app.modules.system.models.user import User
 from app.modules.system.schemas.menu import (
+    ButtonCreate,
     MenuCreate,
     MenuOut,
     MenuQuery,
@@ -20,40 +27,20 @@ from app.modules.system.schemas.menu import (
 router = APIRouter()
 
 
-# 树形列表 (通常用于前端菜单管理页面)
-@router.get(
-    "/tree", response_model=ResponseModel[list[MenuTreeOut]], summary="获取菜单树形列表"
-)
-async def get_menu_tree(db: AsyncSession = Depends(get_db)):
-    stmt = select(Menu).order_by(Menu.order.asc())
-    result = await db.execute(stmt)
-    menus = result.scalars().all()
-
-    # 递归组装树形结构
-    menu_map = {m.menu_id: MenuTreeOut.model_validate(m).model_dump() for m in menus}
+def assemble_menu_tree(menus: list[Menu]) -> list[MenuTreeOut]:
+    """组装树形结构，节点直接使用已校验的 Schema 对象，响应时只序列化一次"""
+    menu_map = {m.menu_id: MenuTreeOut.model_validate(m) for m in menus}
     tree = []
-    for _m_id, m_dict in menu_map.items():
-        p_id = int(m_dict["parent_id"]) if m_dict["parent_id"] else None
-        if p_id in menu_map:
-            if "children" not in menu_map[p_id]:
-                menu_map[p_id]["children"] = []
-            menu_map[p_id]["children"].append(m_dict)
+    for node in menu_map.values():
+        if node.parent_id in menu_map:
+            menu_map[node.parent_id].children.append(node)
         else:
-            tree.append(m_dict)
-    return ResponseModel.success(data=tree)  # 1. 树形列表 (通常用于前端菜单管理页面)
+            tree.append(node)
+    return tree
 
 
-@router.get(
-    "/tree-option",
-    response_model=ResponseModel[list[MenuTreeOptionOut]],
-    summary="获取菜单树形列表(前端option结构)",
-)
-async def get_menu_tree_option(db: AsyncSession = Depends(get_db)):
-    stmt = select(Menu).where(Menu.status == "1").order_by(Menu.order.asc())
-    result = await db.execute(stmt)
-    menus = result.scalars().all()
-
-    # 递归组装树形结构
+def assemble_menu_tree_options(menus: list[Menu]) -> list[MenuTreeOptionOut]:
+    """组装前端 option 结构的菜单树"""
     menu_map = {}
     for m in menus:
         menu_out = MenuTreeOptionOut(
@@ -72,56 +59,75 @@ async def get_menu_tree_option(db: AsyncSession = Depends(get_db)):
             menu_map[p_id].children.append(menu_out)
         else:
             tree.append(menu_out)
+    return tree
 
-    return ResponseModel.success(data=tree)
 
-
-# 树形列表 (通常用于前端菜单管理页面)
-@router.get(
-    "/tree-list",
-    response_model=ResponseModel[PageResult[MenuTreeOut]],
-    summary="获取菜单树形列表(带伪分页数据-适配前端)",
-)
-async def get_menu_tree_list(db: AsyncSession = Depends(get_db)):
-    stmt = select(Menu).order_by(Menu.order.asc())
-    result = await db.execute(stmt)
-    menus = result.scalars().all()
-
-    # 预处理：将所有数据转为字典，并初始化 children 和 buttons
-    menu_map = {}
-    for m in menus:
-        m_dict = MenuTreeOut.model_validate(m).model_dump()
-        m_dict["children"] = []
-        m_dict["buttons"] = []
-        menu_map[m.menu_id] = m_dict
+def assemble_menu_tree_list(menus: list[Menu]) -> list[MenuTreeOut]:
+    """组装菜单管理页的树：按钮 (F) 挂到父节点的 buttons，其余挂到 children"""
+    # 预处理：将所有数据转为 Schema 对象 (children 和 buttons 默认为空列表)
+    menu_map = {m.menu_id: MenuTreeOut.model_validate(m) for m in menus}
 
     tree = []
 
     # 第二次遍历：组装树形结构
     for m in menus:
-        m_id = m.menu_id
-        m_dict = menu_map[m_id]
-        p_id = int(m.parent_id) if m.parent_id else None
+        node = menu_map[m.menu_id]
+        p_id = m.parent_id or None
 
         if p_id in menu_map:
             # 如果当前节点是按钮 (menu_type == 'F')
             if m.menu_type == "F":
                 # 将按钮信息放入父节点的 buttons 中
-                button_data = {
-                    "desc": m.menu_name,
-                    "code": m.permission,
-                }
-                menu_map[p_id]["buttons"].append(button_data)
+                menu_map[p_id].buttons.append(
+                    ButtonCreate(desc=m.menu_name, code=m.permission)
+                )
             else:
                 # 非按钮节点，放入父节点的 children 中
-                menu_map[p_id]["children"].append(m_dict)
+                menu_map[p_id].children.append(node)
         else:
             # 没有父节点且不是按钮的作为根节点（通常 F 类不会是根节点）
             if m.menu_type != "F":
-                tree.append(m_dict)
+                tree.append(node)
+    return tree
+
+
+# 树形列表 (通常用于前端菜单管理页面)
+@router.get(
+    "/tree", response_model=ResponseModel[list[MenuTreeOut]], summary="获取菜单树形列表"
+)
+async def get_menu_tree(db: AsyncSession = Depends(get_read_db)):
+    stmt = select(Menu).order_by(Menu.order.asc())
+    result = await db.execute(stmt)
+    menus = result.scalars().all()
+    return FastJSONResponse(ResponseModel.success(data=assemble_menu_tree(menus)))
 
+
+@router.get(
+    "/tree-option",
+    response_model=ResponseModel[list[MenuTreeOptionOut]],
+    summary="获取菜单树形列表(前端option结构)",
+)
+async def get_menu_tree_option(db: AsyncSession = Depends(get_read_db)):
+    stmt = select(Menu).where(Menu.status == "1").order_by(Menu.order.asc())
+    result = await db.execute(stmt)
+    menus = result.scalars().all()
+    return ResponseModel.success(data=assemble_menu_tree_options(menus))
+
+
+# 树形列表 (通常用于前端菜单管理页面)
+@router.get(
+    "/tree-list",
+    response_model=ResponseModel[PageResult[MenuTreeOut]],
+    summary="获取菜单树形列表(带伪分页数据-适配前端)",
+)
+async def get_menu_tree_list(db: AsyncSession = Depends(get_read_db)):
+    stmt = select(Menu).order_by(Menu.order.asc())
+    result = await db.execute(stmt)
+    menus = result.scalars().all()
+
+    tree = assemble_menu_tree_list(menus)
     page_data = PageResult(records=tree, total=len(tree), current=1, size=len(tree))
-    return ResponseModel.success(data=page_data)
+    return FastJSONResponse(ResponseModel.success(data=page_data))
 
 
 # 分页列表 (备用，某些简单管理页面使用)
@@ -130,23 +136,20 @@ async def get_menu_tree_list(db: AsyncSession = Depends(get_db)):
     response_model=ResponseModel[PageResult[MenuOut]],
     summary="获取菜单分页列表",
 )
-async def list_menus(query: MenuQuery = Depends(), db: AsyncSession = Depends(get_db)):
-    count_stmt = select(func.count()).select_from(Menu)
-    total = (await db.execute(count_stmt)).scalar() or 0
-
-    stmt = (
-        select(Menu)
-        .offset((query.current - 1) * query.size)
-        .limit(query.size)
-        .order_by(Menu.order.asc())
+async def list_menus(
+    query: MenuQuery = Depends(), db: AsyncSession = Depends(get_read_db)
+):
+    total, menus = await crud_menu.get_page(
+        db, current=query.current, size=query.size, order_by=[Menu.order.asc()]
     )
-    result = await db.execute(stmt)
-    return ResponseModel.success(
-        data=PageResult(
-            records=result.scalars().all(),
-            total=total,
-            current=query.current,
-            size=query.size,
+    return FastJSONResponse(
+        ResponseModel.success(
+            data=PageResult(
+                records=[MenuOut.model_validate(m) for m in menus],
+                total=total,
+                current=query.current,
+                size=query.size,
+            )
         )
     )
 
@@ -156,15 +159,19 @@ async def list_menus(query: MenuQuery = Depends(), db: AsyncSession = Depends(ge
     response_model=ResponseModel[list[MenuSimpleOut]],
     summary="获取全部菜单列表(不分页)",
 )
+@cache_response("menu")
 async def get_all_menu(
-    db: AsyncSession = Depends(get_db), _current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_read_db),
+    _current_user: User = Depends(get_current_user),
 ):
     # 只查询状态为 "1" (启用) 的菜单，按创建时间排序
     stmt = select(Menu).where(Menu.status == "1").order_by(Menu.order.asc())
     result = await db.execute(stmt)
     menus = result.scalars().all()
 
-    return ResponseModel.success(data=menus)
+    return FastJSONResponse(
+        ResponseModel.success(data=[MenuSimpleOut.model_validate(m) for m in menus])
+    )
 
 
 @router.get(
@@ -172,8 +179,10 @@ async def get_all_menu(
     response_model=ResponseModel[list[str]],
     summary="获取所有页面",
 )
+@cache_response("menu")
 async def get_all_pages(
-    db: AsyncSession = Depends(get_db), _current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_read_db),
+    _current_user: User = Depends(get_current_user),
 ):
     # 只查询状态为 "1" (启用) 的菜单，按创建时间排序
     stmt = (
@@ -184,7 +193,7 @@ async def get_all_pages(
     result = await db.execute(stmt)
     menus = result.scalars().all()
 
-    return ResponseModel.success(data=menus)
+    return FastJSONResponse(ResponseModel.success(data=menus))
 
 
 # 新增菜单
@@ -198,9 +207,11 @@ async def add_menu(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    new_menu = Menu(**menu_in.model_dump(), create_by=current_user.user_name)
-    db.add(new_menu)
+    crud_menu.create(db, menu_in, create_by=current_user.user_name)
     await db.commit()
+    await rbac_cache.invalidate()
+    await invalidate_tags("menu")
+    await route_name_exists.cache.clear()
     return ResponseModel.success(msg="菜单创建成功")
 
 
@@ -216,41 +227,23 @@ async def update_menu(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    menu = await db.get(Menu, menu_id)
+    menu = await crud_menu.get(db, menu_id)
     if not menu:
         raise HTTPException(status_code=404, detail="菜单不存在")
 
-    update_data = menu_in.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(menu, field, value)
+    crud_menu.update(menu, menu_in)
 
-    # 更新按钮权限
+    # 更新按钮权限：删除现有按钮后一次性批量写入
     if menu_in.buttons is not None:
-        # 删除该菜单下所有现有按钮（只删 button 类型）
-        delete_stmt = delete(Menu).where(
-            Menu.parent_id == menu_id, Menu.menu_type == "F"
+        await crud_menu.replace_buttons(
+            db, menu_id, menu_in.buttons, current_user.user_name
         )
-        await db.execute(delete_stmt)
-
-        # 批量添加新按钮
-        new_buttons = []
-        for btn in menu_in.buttons:
-            button_menu = Menu(
-                menu_name=btn.desc,
-                permission=btn.code,
-                menu_type="F",
-                parent_id=menu_id,
-                create_by=current_user.user_name,
-                update_by=current_user.user_name,
-                order=0,
-                status="1",
-            )
-            new_buttons.append(button_menu)
-
-        db.add_all(new_buttons)
 
     menu.update_by = current_user.user_name
     await db.commit()
+    await rbac_cache.invalidate()
+    await invalidate_tags("menu")
+    await route_name_exists.cache.clear()
     return ResponseModel.success(msg="菜单更新成功")
 
 
@@ -267,12 +260,15 @@ async def delete_menu(menu_id: int, db: AsyncSession = Depends(get_db)):
     if child:
         raise HTTPException(status_code=400, detail="请先删除子菜单")
 
-    menu = await db.get(Menu, menu_id)
+    menu = await crud_menu.get(db, menu_id)
     if not menu:
         raise HTTPException(status_code=404, detail="菜单不存在")
 
     await db.delete(menu)
     await db.commit()
+    await rbac_cache.invalidate()
+    await invalidate_tags("menu")
+    await route_name_exists.cache.clear()
     return ResponseModel.success(msg="菜单删除成功")
 
 
@@ -282,6 +278,7 @@ async def delete_menu(menu_id: int, db: AsyncSession = Depends(get_db)):
     summary="批量删除菜单",
     # dependencies=[Depends(require_permissions("sys:menu:delete"))],
 )
+@rate_limit(30, 60)
 async def batch_delete_menus(
     ids: list[int] = Body(...), db: AsyncSession = Depends(get_db)
 ):
@@ -290,7 +287,7 @@ async def batch_delete_menus(
 
     # 批量检查子菜单逻辑 (简单处理：如果选中的菜单中有任何一个包含不在选中列表里的子菜单，则禁止)
     check_stmt = select(Menu).where(
-        and_(Menu.parent_id.in_(ids), ~Menu.menu_id.in_(ids))
+        and_(in_ids(Menu.parent_id, ids), ~in_ids(Menu.menu_id, ids))
     )
     has_child = (await db.execute(check_stmt)).first()
     if has_child:
@@ -298,7 +295,12 @@ async def batch_delete_menus(
             status_code=400, detail="选中的菜单中包含未选中的子菜单，请先处理"
         )
 
-    stmt = delete(Menu).where(Menu.menu_id.in_(ids))
-    result = await db.execute(stmt)
+    counts = await crud_menu.bulk_delete(db, ids)
     await db.commit()
-    return ResponseModel.success(msg=f"成功删除 {result.rowcount} 个菜单")
+    await rbac_cache.invalidate()
+    await invalidate_tags("menu")
+    await route_name_exists.cache.clear()
+    return ResponseModel.success(
+        data={"deleted": sum(counts), "chunks": counts},
+        msg=f"成功删除 {sum(counts)} 个菜单",
+    )
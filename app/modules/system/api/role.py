@@ -1,11 +1,17 @@
 from fastapi import APIRouter, Body, Depends, HTTPException
-from sqlalchemy import and_, delete, func, select
+from sqlalchemy import and_, delete, insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.auth import get_current_user
-from app.core.base_response import PageResult, ResponseModel
-from app.db.base import role_menus
-from app.db.session import get_db
+from app.core.base_response import FastJSONResponse, PageResult, ResponseModel
+from app.core.rate_limit import rate_limit
+from app.core.rbac import rbac_cache
+from app.core.response_cache import cache_response, invalidate_tags
+from app.db.base import role_depts, role_menus
+from app.db.session import get_db, get_read_db
+from app.modules.system.crud.base import in_ids
+from app.modules.system.crud.crud_menu import crud_menu
+from app.modules.system.crud.crud_role import crud_role
 from app.modules.system.models.menu import Menu
 from app.modules.system.models.role import Role
 from app.modules.system.models.user import User
@@ -27,7 +33,7 @@ router = APIRouter()
 )
 async def list_roles(
     query: RoleQuery = Depends(),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     _current_user: User = Depends(get_current_user),
 ):
     """
@@ -41,26 +47,22 @@ async def list_roles(
     if query.status:
         filters.append(Role.status == query.status)
 
-    # 计算总数
-    count_stmt = select(func.count()).select_from(Role).where(and_(*filters))
-    total = (await db.execute(count_stmt)).scalar() or 0
-
-    # 分页数据
-    stmt = (
-        select(Role)
-        .where(and_(*filters))
-        .offset((query.current - 1) * query.size)
-        .limit(query.size)
-        .order_by(Role.create_time.desc())
+    total, roles = await crud_role.get_page(
+        db,
+        current=query.current,
+        size=query.size,
+        filters=filters,
+        order_by=[Role.create_time.desc()],
     )
-    result = await db.execute(stmt)
 
-    return ResponseModel.success(
-        data=PageResult(
-            records=result.scalars().all(),
-            total=total,
-            current=query.current,
-            size=query.size,
+    return FastJSONResponse(
+        ResponseModel.success(
+            data=PageResult(
+                records=[RoleOut.model_validate(r) for r in roles],
+                total=total,
+                current=query.current,
+                size=query.size,
+            )
         )
     )
 
@@ -70,8 +72,10 @@ async def list_roles(
     response_model=ResponseModel[list[RoleSimpleOut]],
     summary="获取全部角色列表(不分页)",
 )
+@cache_response("role")
 async def get_all_roles(
-    db: AsyncSession = Depends(get_db), _current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_read_db),
+    _current_user: User = Depends(get_current_user),
 ):
     """
     获取系统中所有已启用的角色列表，常用于前端下拉选择框。
@@ -82,7 +86,11 @@ async def get_all_roles(
     result = await db.execute(stmt)
     roles = result.scalars().all()
 
-    return ResponseModel.success(data=roles)
+    return FastJSONResponse(
+        ResponseModel.success(
+            data=[RoleSimpleOut.model_validate(r, from_attributes=True) for r in roles]
+        )
+    )
 
 
 @router.get(
@@ -90,9 +98,10 @@ async def get_all_roles(
     response_model=ResponseModel[list[str]],
     summary="获取角色菜单列表",
 )
+@cache_response("menu", "role:{role_id}")
 async def get_menus(
     role_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     _current_user: User = Depends(get_current_user),
 ):
     # 子查询：找出该角色拥有的菜单中，作为 parent_id 出现过的 ID
@@ -114,7 +123,7 @@ async def get_menus(
     result = await db.execute(stmt)
     menu_ids = [str(menu_id) for menu_id in result.scalars().all()]
 
-    return ResponseModel.success(data=menu_ids)
+    return FastJSONResponse(ResponseModel.success(data=menu_ids))
 
 
 @router.post("/add", summary="创建新角色")
@@ -127,13 +136,13 @@ async def add_role(
     创建角色，并自动记录创建人
     """
     # 检查编码唯一性
-    check = await db.execute(select(Role).where(Role.role_code == role_in.role_code))
-    if check.scalars().first():
+    if await crud_role.get_by_code(db, role_in.role_code):
         raise HTTPException(status_code=400, detail="角色编码已存在")
 
-    new_role = Role(**role_in.model_dump(), create_by=current_user.user_name)
-    db.add(new_role)
+    crud_role.create(db, role_in, create_by=current_user.user_name)
     await db.commit()
+    await rbac_cache.invalidate()
+    await invalidate_tags("role")
     return ResponseModel.success(msg="角色创建成功")
 
 
@@ -147,16 +156,14 @@ async def update_role(
     """
     根据 ID 更新角色基本信息，并自动更新修改人
     """
-    role = await db.get(Role, role_id)
+    role = await crud_role.get(db, role_id)
     if not role:
         raise HTTPException(status_code=404, detail="角色不存在")
 
-    update_data = role_in.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(role, field, value)
-
-    role.update_by = current_user.user_name
+    crud_role.update(role, role_in, update_by=current_user.user_name)
     await db.commit()
+    await rbac_cache.invalidate()
+    await invalidate_tags("role", f"role:{role_id}")
     return ResponseModel.success(msg="角色更新成功")
 
 
@@ -170,16 +177,59 @@ async def update_role_menu(
     """
     根据 ID 更新角色 菜单权限，并自动更新修改人
     """
-    role = await db.get(Role, role_id)
+    role = await crud_role.get(db, role_id)
     if not role:
         raise HTTPException(status_code=404, detail="角色不存在")
 
     if ids:
-        menu_result = await db.execute(select(Menu).where(Menu.menu_id.in_(ids)))
-        role.menus = menu_result.scalars().all()
+        role.menus = await crud_menu.get_many(db, ids)
 
     role.update_by = current_user.user_name
     await db.commit()
+    await rbac_cache.invalidate()
+    await invalidate_tags(f"role:{role_id}")
+    return ResponseModel.success(msg="角色更新成功")
+
+
+@router.get(
+    "/depts/{role_id}",
+    response_model=ResponseModel[list[str]],
+    summary="获取角色自定义数据权限部门",
+)
+async def get_depts(
+    role_id: int,
+    db: AsyncSession = Depends(get_read_db),
+    _current_user: User = Depends(get_current_user),
+):
+    stmt = select(role_depts.c.dept_id).where(role_depts.c.role_id == role_id)
+    result = await db.execute(stmt)
+    return ResponseModel.success(data=[str(d) for d in result.scalars().all()])
+
+
+@router.put("/dept/{role_id}", summary="编辑角色自定义数据权限部门")
+async def update_role_dept(
+    role_id: int,
+    ids: list[int] = Body(...),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    整体替换角色的自定义部门，仅在数据范围为 "2"-自定义部门 时生效
+    """
+    role = await crud_role.get(db, role_id)
+    if not role:
+        raise HTTPException(status_code=404, detail="角色不存在")
+
+    await db.execute(delete(role_depts).where(role_depts.c.role_id == role_id))
+    if ids:
+        await db.execute(
+            insert(role_depts),
+            [{"role_id": role_id, "dept_id": d} for d in dict.fromkeys(ids)],
+        )
+
+    role.update_by = current_user.user_name
+    await db.commit()
+    await rbac_cache.invalidate()
     return ResponseModel.success(msg="角色更新成功")
 
 
@@ -188,16 +238,19 @@ async def delete_role(role_id: int, db: AsyncSession = Depends(get_db)):
     """
     物理删除角色。注意：在有用户关联此角色时应谨慎操作
     """
-    role = await db.get(Role, role_id)
+    role = await crud_role.get(db, role_id)
     if not role:
         raise HTTPException(status_code=404, detail="角色不存在")
 
     await db.delete(role)
     await db.commit()
+    await rbac_cache.invalidate()
+    await invalidate_tags("role", f"role:{role_id}")
     return ResponseModel.success(msg="角色删除成功")
 
 
 @router.post("/batch-delete", summary="批量删除用户")
+@rate_limit(30, 60)
 async def batch_delete_roles(
     ids: list[int] = Body(...),
     db: AsyncSession = Depends(get_db),
@@ -205,7 +258,7 @@ async def batch_delete_roles(
 ):
     # 过滤掉 超级管理员 权限，防止误删
     check_stmt = select(Role.role_id).where(
-        and_(Role.role_id.in_(ids), Role.role_code == "R_SUPER")
+        and_(in_ids(Role.role_id, ids), Role.role_code == "R_SUPER")
     )
     admin_result = await db.execute(check_stmt)
     if admin_result.scalars().first():
@@ -213,19 +266,24 @@ async def batch_delete_roles(
             status_code=400, detail="所选列表中包含系统管理员角色，禁止批量删除"
         )
 
-    stmt = delete(Role).where(Role.role_id.in_(ids))
-    result = await db.execute(stmt)
+    counts = await crud_role.bulk_delete(db, ids)
 
     await db.commit()
-    return ResponseModel.success(msg=f"成功删除 {result.rowcount} 条数据")
+    await rbac_cache.invalidate()
+    await invalidate_tags("role", *(f"role:{role_id}" for role_id in ids))
+    return ResponseModel.success(
+        data={"deleted": sum(counts), "chunks": counts},
+        msg=f"成功删除 {sum(counts)} 条数据",
+    )
 
 
 @router.get("/{role_id}", response_model=ResponseModel[RoleOut], summary="获取角色详情")
-async def get_role_detail(role_id: int, db: AsyncSession = Depends(get_db)):
+@cache_response("role:{role_id}")
+async def get_role_detail(role_id: int, db: AsyncSession = Depends(get_read_db)):
     """
     根据 ID 获取单个角色的完整信息
     """
-    role = await db.get(Role, role_id)
+    role = await crud_role.get(db, role_id)
     if not role:
         raise HTTPException(status_code=404, detail="角色不存在")
-    return ResponseModel.success(data=role)
+    return FastJSONResponse(ResponseModel.success(data=RoleOut.model_validate(role)))
@@ -1,15 +1,25 @@
+from datetime import datetime
+
 from fastapi import APIRouter, Body, Depends, HTTPException
-from sqlalchemy import and_, delete, func, select
+from sqlalchemy import ColumnElement, and_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from app.core.auth import get_current_user
-from app.core.base_response import PageResult, ResponseModel
+from app.core.activity import activity_tracker
+from app.core.auth import data_scope_filter, get_current_user
+from app.core.base_response import FastJSONResponse, PageResult, ResponseModel
+from app.core.config import settings
+from app.core.data_scope import USER_SCOPE
+from app.core.rate_limit import rate_limit
 from app.core.security import get_password_hash
-from app.db.session import get_db
-from app.modules.system.models.role import Role
+from app.db.session import get_db, get_read_db
+from app.modules.system.crud.base import in_ids
+from app.modules.system.crud.crud_role import crud_role
+from app.modules.system.crud.crud_user import crud_user
 from app.modules.system.models.user import User
 from app.modules.system.schemas.user import (
+    OnlineUserOut,
+    OnlineUserQuery,
     UserCreate,
     UserItemOut,
     UserQuery,
@@ -26,11 +36,11 @@ router = APIRouter()
 )
 async def get_user_list(
     query: UserQuery = Depends(),
-    db: AsyncSession = Depends(get_db),
-    _current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+    scope: ColumnElement[bool] | None = Depends(data_scope_filter(USER_SCOPE)),
 ):
-    # 构建查询条件
-    filters = []
+    # 构建查询条件，数据权限作为 WHERE 条件交给数据库 (命中 dept_id / 主键索引)
+    filters = [] if scope is None else [scope]
     if query.user_name:
         filters.append(User.user_name.contains(query.user_name))
     if query.nickname:
@@ -44,22 +54,15 @@ async def get_user_list(
     if query.status:
         filters.append(User.status == query.status)
 
-    # 查询总数
-    count_stmt = select(func.count()).select_from(User).where(and_(*filters))
-    total = (await db.execute(count_stmt)).scalar() or 0
-
-    # 分页查询数据
-    # 使用 selectinload 预加载角色信息
-    stmt = (
-        select(User)
-        .where(and_(*filters))
-        .offset((query.current - 1) * query.size)
-        .limit(query.size)
-        .options(selectinload(User.roles))
-        .order_by(User.create_time.desc())
+    # 分页查询数据，使用 selectinload 预加载角色信息
+    total, users = await crud_user.get_page(
+        db,
+        current=query.current,
+        size=query.size,
+        filters=filters,
+        order_by=[User.create_time.desc()],
+        options=[selectinload(User.roles)],
     )
-    result = await db.execute(stmt)
-    users = result.scalars().all()
 
     # 转换为 Schema 对象 (处理角色简化)
     user_list = []
@@ -72,29 +75,63 @@ async def get_user_list(
     page_data = PageResult(
         records=user_list, total=total, current=query.current, size=query.size
     )
-    return ResponseModel.success(data=page_data)
+    return FastJSONResponse(ResponseModel.success(data=page_data))
+
+
+@router.get(
+    "/online",
+    response_model=ResponseModel[PageResult[OnlineUserOut]],
+    summary="获取在线用户分页",
+)
+async def get_online_users(
+    query: OnlineUserQuery = Depends(),
+    db: AsyncSession = Depends(get_read_db),
+    _current_user: User = Depends(get_current_user),
+):
+    # 直接从 Redis 有序集合分页，数据库只补充当前页的账号信息
+    total, page = await activity_tracker.online(
+        settings.ONLINE_WINDOW_SECONDS, (query.current - 1) * query.size, query.size
+    )
+    names = {}
+    if page:
+        stmt = select(User.user_id, User.user_name, User.nickname).where(
+            User.user_id.in_([user_id for user_id, _ in page])
+        )
+        names = {row.user_id: row for row in await db.execute(stmt)}
+
+    records = [
+        OnlineUserOut(
+            user_id=user_id,
+            user_name=getattr(names.get(user_id), "user_name", None),
+            nickname=getattr(names.get(user_id), "nickname", None),
+            last_active_time=datetime.fromtimestamp(score),
+        )
+        for user_id, score in page
+    ]
+    page_data = PageResult(
+        records=records, total=total, current=query.current, size=query.size
+    )
+    return FastJSONResponse(ResponseModel.success(data=page_data))
 
 
 @router.post("/add", summary="创建用户")
 async def add_user(user_in: UserCreate, db: AsyncSession = Depends(get_db)):
     # 检查唯一性
-    result = await db.execute(select(User).where(User.user_name == user_in.user_name))
-    if result.scalars().first():
+    if await crud_user.get_by_user_name(db, user_in.user_name):
         raise HTTPException(status_code=400, detail="用户名已存在")
 
     # 准备用户数据
-    obj_data = user_in.model_dump(exclude={"roles", "password"})
-    new_user = User(**obj_data)
-    new_user.hashed_password = get_password_hash(user_in.password)
+    new_user = crud_user.create(
+        db,
+        user_in,
+        exclude={"roles", "password"},
+        hashed_password=get_password_hash(user_in.password),
+    )
 
     # 分配角色
     if user_in.roles:
-        role_result = await db.execute(
-            select(Role).where(Role.role_code.in_(user_in.roles))
-        )
-        new_user.roles = role_result.scalars().all()
+        new_user.roles = await crud_role.get_by_codes(db, user_in.roles)
 
-    db.add(new_user)
     await db.commit()
     return ResponseModel.success(msg="创建成功")
 
@@ -103,24 +140,17 @@ async def add_user(user_in: UserCreate, db: AsyncSession = Depends(get_db)):
 async def update_user(
     user_id: int, user_in: UserUpdate, db: AsyncSession = Depends(get_db)
 ):
-    # 查询用户（带角色预加载）
-    stmt = select(User).where(User.user_id == user_id).options(selectinload(User.roles))
-    result = await db.execute(stmt)
-    user = result.scalars().first()
+    # 查询用户 (User.roles 为 selectin 关系，随用户一起加载)
+    user = await crud_user.get(db, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="用户不存在")
 
     # 更新基础字段, 排出roles 和 password
-    update_data = user_in.model_dump(exclude={"roles", "password"}, exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(user, field, value)
+    crud_user.update(user, user_in, exclude={"roles", "password"})
 
     # 更新角色关联
     if user_in.roles is not None:
-        role_result = await db.execute(
-            select(Role).where(Role.role_code.in_(user_in.roles))
-        )
-        user.roles = role_result.scalars().all()
+        user.roles = await crud_role.get_by_codes(db, user_in.roles)
 
     await db.commit()
     return ResponseModel.success(msg="更新成功")
@@ -128,7 +158,7 @@ async def update_user(
 
 @router.delete("/{user_id}", summary="删除用户")
 async def delete_user(user_id: int, db: AsyncSession = Depends(get_db)):
-    user = await db.get(User, user_id)
+    user = await crud_user.get(db, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="用户不存在")
     if user.user_name == "admin":
@@ -140,6 +170,7 @@ async def delete_user(user_id: int, db: AsyncSession = Depends(get_db)):
 
 
 @router.post("/batch-delete", summary="批量删除用户")
+@rate_limit(30, 60)
 async def batch_delete_users(
     ids: list[int] = Body(...),
     db: AsyncSession = Depends(get_db),
@@ -154,7 +185,7 @@ async def batch_delete_users(
     # 过滤掉 admin 账号，防止误删
     # 先查询这些 ID 中是否包含 admin
     check_stmt = select(User.user_id).where(
-        and_(User.user_id.in_(ids), User.user_name == "admin")
+        and_(in_ids(User.user_id, ids), User.user_name == "admin")
     )
     admin_result = await db.execute(check_stmt)
     if admin_result.scalars().first():
@@ -166,12 +197,13 @@ async def batch_delete_users(
     if current_user.user_id in ids:
         raise HTTPException(status_code=400, detail="不能删除当前登录的账号")
 
-    # 执行批量删除
-    # 使用 sqlalchemy 的 delete 语句更高效
-    stmt = delete(User).where(User.user_id.in_(ids))
-    result = await db.execute(stmt)
+    # 执行批量删除 (ID 列表绑定为数组参数，超大批量在同一事务内分块)
+    counts = await crud_user.bulk_delete(db, ids)
 
     # 提交事务
     await db.commit()
 
-    return ResponseModel.success(msg=f"成功删除 {result.rowcount} 个用户")
+    return ResponseModel.success(
+        data={"deleted": sum(counts), "chunks": counts},
+        msg=f"成功删除 {sum(counts)} 个用户",
+    )
@@ -0,0 +1,15 @@
+from .base import CRUDBase, in_ids
+from .crud_dict import crud_dict_data, crud_dict_type
+from .crud_menu import crud_menu
+from .crud_role import crud_role
+from .crud_user import crud_user
+
+__all__ = [
+    "CRUDBase",
+    "in_ids",
+    "crud_user",
+    "crud_role",
+    "crud_menu",
+    "crud_dict_type",
+    "crud_dict_data",
+]
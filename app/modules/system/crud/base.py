@@ -0,0 +1,173 @@
+from collections.abc import Iterable, Sequence
+from typing import Any
+
+from pydantic import BaseModel
+from sqlalchemy import (
+    BigInteger,
+    ColumnElement,
+    any_,
+    bindparam,
+    delete,
+    func,
+    insert,
+    inspect,
+    select,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import lazyload
+from sqlalchemy.orm.interfaces import ORMOption
+
+from app.core.id_generator import next_ids
+from app.db.base import Base
+from app.db.monitor import BATCHED_EXECUTION_OPTION
+
+
+def in_ids(column: ColumnElement[int], ids: Sequence[int]) -> ColumnElement[bool]:
+    """
+    column = ANY($1::BIGINT[])：整个 ID 列表只占一个数组参数。
+    in_(ids) 会为每个元素生成一个绑定参数，语句随列表变长，
+    且超过 asyncpg 的 32767 个参数上限时直接报错
+    """
+    return column == any_(bindparam("ids", list(ids), ARRAY(BigInteger), unique=True))
+
+
+class CRUDBase[ModelT: Base, CreateSchemaT: BaseModel, UpdateSchemaT: BaseModel]:
+    """
+    通用异步 CRUD，模型须为单列雪花ID主键
+
+    - 所有方法都不提交事务，由调用方统一 commit
+    - 批量方法每批只需一次往返：
+      bulk_create 为多行 INSERT ... RETURNING，bulk_update 为按主键的 executemany，
+      bulk_delete 为按 chunk_size 分块的 DELETE ... WHERE pk = ANY(:ids)
+    """
+
+    # 单条 DELETE 处理的最大行数，超大批量在同一事务内分块执行，限制单条语句的锁与耗时
+    chunk_size = 10_000
+
+    def __init__(self, model: type[ModelT]):
+        self.model = model
+        mapper = inspect(model)
+        self.pk_column = mapper.primary_key[0]
+        self.pk_name = mapper.get_property_by_column(self.pk_column).key
+
+    async def get(self, db: AsyncSession, id: int) -> ModelT | None:
+        return await db.get(self.model, id)
+
+    async def get_many(
+        self, db: AsyncSession, ids: Iterable[int], *, options: Sequence[ORMOption] = ()
+    ) -> list[ModelT]:
+        """按主键批量获取 (一条查询，结果顺序不保证与 ids 一致)"""
+        ids = list(ids)
+        if not ids:
+            return []
+        stmt = select(self.model).where(in_ids(self.pk_column, ids)).options(*options)
+        return list((await db.scalars(stmt)).all())
+
+    async def get_page(
+        self,
+        db: AsyncSession,
+        *,
+        current: int,
+        size: int,
+        filters: Sequence[ColumnElement[bool]] = (),
+        order_by: Sequence[Any] = (),
+        options: Sequence[ORMOption] = (),
+    ) -> tuple[int, list[ModelT]]:
+        """分页查询，返回 (总数, 当前页记录)"""
+        count_stmt = select(func.count()).select_from(self.model).where(*filters)
+        total = (await db.execute(count_stmt)).scalar() or 0
+
+        stmt = (
+            select(self.model)
+            .where(*filters)
+            .offset((current - 1) * size)
+            .limit(size)
+            .order_by(*order_by)
+            .options(*options)
+        )
+        return total, list((await db.scalars(stmt)).all())
+
+    def create(
+        self,
+        db: AsyncSession,
+        obj_in: CreateSchemaT | dict,
+        *,
+        exclude: set[str] | None = None,
+        **extra,
+    ) -> ModelT:
+        """构造对象并加入 Session，随调用方的 commit 一起写入"""
+        db_obj = self.model(**self._dump(obj_in, exclude=exclude), **extra)
+        db.add(db_obj)
+        return db_obj
+
+    async def bulk_create(
+        self, db: AsyncSession, objs_in: Sequence[CreateSchemaT | dict], **extra
+    ) -> list[ModelT]:
+        """
+        多行 INSERT ... RETURNING 批量创建，返回与输入顺序一致的 ORM 对象 (含服务端默认值)。
+        主键一次性预留，extra 中的字段 (如 create_by) 应用到每一行
+        """
+        if not objs_in:
+            return []
+        rows = [self._dump(obj) | extra for obj in objs_in]
+        for row, pk in zip(rows, next_ids(len(rows)), strict=True):
+            row.setdefault(self.pk_name, pk)
+        # 新建的行还没有关联数据，不触发关系的 selectin 预加载
+        stmt = (
+            insert(self.model)
+            .returning(self.model, sort_by_parameter_order=True)
+            .options(lazyload("*"))
+        )
+        return list((await db.scalars(stmt, rows)).all())
+
+    def update(
+        self,
+        db_obj: ModelT,
+        obj_in: UpdateSchemaT | dict,
+        *,
+        exclude: set[str] | None = None,
+        **extra,
+    ) -> ModelT:
+        """只更新传入的字段 (exclude_unset)，extra 中的字段 (如 update_by) 一并写入"""
+        changes = self._dump(obj_in, exclude=exclude, exclude_unset=True) | extra
+        for field, value in changes.items():
+            setattr(db_obj, field, value)
+        return db_obj
+
+    async def bulk_update(self, db: AsyncSession, rows: Sequence[dict]) -> None:
+        """
+        按主键批量更新，每行必须包含主键；字段组合相同的行合并为一次 executemany。
+        不会加载对象，Session 中已加载的同一对象不会被同步
+        """
+        if rows:
+            await db.execute(update(self.model), list(rows))
+
+    async def bulk_delete(self, db: AsyncSession, ids: Iterable[int]) -> list[int]:
+        """
+        按主键批量删除，返回每个分块删除的行数；
+        所有分块在调用方的同一事务中执行，任一分块失败时整体回滚
+        """
+        ids = list(dict.fromkeys(ids))
+        counts = []
+        for start in range(0, len(ids), self.chunk_size):
+            chunk = ids[start : start + self.chunk_size]
+            stmt = delete(self.model).where(in_ids(self.pk_column, chunk))
+            # 不需要同步 Session 中的对象，省去 fetch 或 Python 端条件求值；
+            # 分块是有意的重复语句，不计入 N+1 检测
+            result = await db.execute(
+                stmt,
+                execution_options={
+                    "synchronize_session": False,
+                    BATCHED_EXECUTION_OPTION: True,
+                },
+            )
+            counts.append(result.rowcount)
+        return counts
+
+    @staticmethod
+    def _dump(obj: BaseModel | dict, *, exclude: set[str] | None = None, **kwargs):
+        if isinstance(obj, BaseModel):
+            return obj.model_dump(exclude=exclude, **kwargs)
+        return {k: v for k, v in obj.items() if not exclude or k not in exclude}
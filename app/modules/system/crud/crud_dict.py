@@ -0,0 +1,11 @@
+from app.modules.system.crud.base import CRUDBase
+from app.modules.system.models.dict import DictData, DictType
+from app.modules.system.schemas.dict import (
+    DictDataCreate,
+    DictDataUpdate,
+    DictTypeCreate,
+    DictTypeUpdate,
+)
+
+crud_dict_type = CRUDBase[DictType, DictTypeCreate, DictTypeUpdate](DictType)
+crud_dict_data = CRUDBase[DictData, DictDataCreate, DictDataUpdate](DictData)
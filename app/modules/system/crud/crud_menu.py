@@ -0,0 +1,41 @@
+from collections.abc import Sequence
+
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.modules.system.crud.base import CRUDBase
+from app.modules.system.models.menu import Menu
+from app.modules.system.schemas.menu import ButtonCreate, MenuCreate, MenuUpdate
+
+
+class CRUDMenu(CRUDBase[Menu, MenuCreate, MenuUpdate]):
+    async def replace_buttons(
+        self,
+        db: AsyncSession,
+        menu_id: int,
+        buttons: Sequence[ButtonCreate],
+        operator: str,
+    ) -> list[Menu]:
+        """删除菜单下现有的按钮 (menu_type == 'F')，再一次性批量写入新按钮"""
+        await db.execute(
+            delete(Menu).where(Menu.parent_id == menu_id, Menu.menu_type == "F")
+        )
+        return await self.bulk_create(
+            db,
+            [
+                {
+                    "menu_name": btn.desc,
+                    "permission": btn.code,
+                    "menu_type": "F",
+                    "parent_id": menu_id,
+                    "order": 0,
+                    "status": "1",
+                }
+                for btn in buttons
+            ],
+            create_by=operator,
+            update_by=operator,
+        )
+
+
+crud_menu = CRUDMenu(Menu)
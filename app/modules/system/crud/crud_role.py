@@ -0,0 +1,24 @@
+from collections.abc import Iterable
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.modules.system.crud.base import CRUDBase
+from app.modules.system.models.role import Role
+from app.modules.system.schemas.role import RoleCreate, RoleUpdate
+
+
+class CRUDRole(CRUDBase[Role, RoleCreate, RoleUpdate]):
+    async def get_by_code(self, db: AsyncSession, role_code: str) -> Role | None:
+        result = await db.execute(select(Role).where(Role.role_code == role_code))
+        return result.scalars().first()
+
+    async def get_by_codes(
+        self, db: AsyncSession, role_codes: Iterable[str]
+    ) -> list[Role]:
+        """按角色编码批量获取，用于给用户分配角色"""
+        result = await db.execute(select(Role).where(Role.role_code.in_(role_codes)))
+        return list(result.scalars().all())
+
+
+crud_role = CRUDRole(Role)
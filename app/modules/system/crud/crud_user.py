@@ -0,0 +1,15 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.modules.system.crud.base import CRUDBase
+from app.modules.system.models.user import User
+from app.modules.system.schemas.user import UserCreate, UserUpdate
+
+
+class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
+    async def get_by_user_name(self, db: AsyncSession, user_name: str) -> User | None:
+        result = await db.execute(select(User).where(User.user_name == user_name))
+        return result.scalars().first()
+
+
+crud_user = CRUDUser(User)
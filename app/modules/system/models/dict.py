@@ -0,0 +1,73 @@
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, ForeignKey, Integer, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.id_generator import next_id
+from app.db.base import Base
+
+
+class DictType(Base):
+    __tablename__ = "sys_dict_type"
+
+    dict_id: Mapped[int] = mapped_column(
+        BigInteger, primary_key=True, default=next_id, comment="字典类型ID"
+    )
+    dict_name: Mapped[str] = mapped_column(
+        String(100), nullable=False, comment="字典名称"
+    )
+    dict_type: Mapped[str] = mapped_column(
+        String(100), unique=True, nullable=False, comment="字典类型编码"
+    )
+    status = mapped_column(
+        String(2), nullable=False, default="1", comment="状态：1-启用，2-禁用"
+    )
+    remark: Mapped[str] = mapped_column(String(255), nullable=True, comment="备注")
+    create_by = mapped_column(String(32), nullable=True, comment="创建人")
+    create_time: Mapped[datetime] = mapped_column(
+        DateTime, server_default=func.now(), comment="创建时间"
+    )
+    update_by = mapped_column(String(64), nullable=True, comment="更新人")
+    update_time: Mapped[datetime] = mapped_column(
+        DateTime, server_default=func.now(), onupdate=func.now(), comment="更新时间"
+    )
+
+
+class DictData(Base):
+    __tablename__ = "sys_dict_data"
+
+    data_id: Mapped[int] = mapped_column(
+        BigInteger, primary_key=True, default=next_id, comment="字典数据ID"
+    )
+    # 修改/删除字典类型时由数据库级联到字典数据
+    dict_type: Mapped[str] = mapped_column(
+        String(100),
+        ForeignKey("sys_dict_type.dict_type", onupdate="CASCADE", ondelete="CASCADE"),
+        index=True,
+        nullable=False,
+        comment="字典类型编码",
+    )
+    dict_label: Mapped[str] = mapped_column(
+        String(100), nullable=False, comment="字典标签"
+    )
+    dict_value: Mapped[str] = mapped_column(
+        String(100), nullable=False, comment="字典键值"
+    )
+    dict_sort: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, comment="排序（越小越靠前）"
+    )
+    tag_type: Mapped[str] = mapped_column(
+        String(20), nullable=True, comment="前端标签样式: primary/success/warning..."
+    )
+    status = mapped_column(
+        String(2), nullable=False, default="1", comment="状态：1-启用，2-禁用"
+    )
+    remark: Mapped[str] = mapped_column(String(255), nullable=True, comment="备注")
+    create_by = mapped_column(String(32), nullable=True, comment="创建人")
+    create_time: Mapped[datetime] = mapped_column(
+        DateTime, server_default=func.now(), comment="创建时间"
+    )
+    update_by = mapped_column(String(64), nullable=True, comment="更新人")
+    update_time: Mapped[datetime] = mapped_column(
+        DateTime, server_default=func.now(), onupdate=func.now(), comment="更新时间"
+    )
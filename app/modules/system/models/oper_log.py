@@ -0,0 +1,48 @@
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, Float, Integer, String, func
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.id_generator import next_id
+from app.db.base import Base
+
+
+class OperLog(Base):
+    """操作审计日志，由 app.core.audit 后台任务批量写入"""
+
+    __tablename__ = "sys_oper_log"
+
+    oper_id: Mapped[int] = mapped_column(
+        BigInteger, primary_key=True, default=next_id, comment="日志ID"
+    )
+    title: Mapped[str] = mapped_column(
+        String(100), nullable=True, comment="操作名称 (接口 summary)"
+    )
+    business_type: Mapped[str] = mapped_column(
+        String(30), nullable=False, comment="操作类型：create/update/delete"
+    )
+    request_method: Mapped[str] = mapped_column(
+        String(10), nullable=False, comment="请求方式"
+    )
+    oper_url: Mapped[str] = mapped_column(
+        String(255), nullable=False, comment="路由模板"
+    )
+    status_code: Mapped[int] = mapped_column(Integer, comment="响应状态码")
+    oper_user_id: Mapped[int] = mapped_column(
+        BigInteger, nullable=True, index=True, comment="操作人ID"
+    )
+    oper_user_name: Mapped[str] = mapped_column(
+        String(50), nullable=True, comment="操作人账号"
+    )
+    oper_ip: Mapped[str] = mapped_column(String(64), nullable=True, comment="客户端IP")
+    target_ids: Mapped[list[int]] = mapped_column(
+        ARRAY(BigInteger), nullable=True, comment="受影响记录ID"
+    )
+    changes: Mapped[list] = mapped_column(
+        JSONB, nullable=True, comment="变更明细：表、操作、ID 与字段新旧值"
+    )
+    cost_time: Mapped[float] = mapped_column(Float, comment="耗时(毫秒)")
+    oper_time: Mapped[datetime] = mapped_column(
+        DateTime, server_default=func.now(), index=True, comment="操作时间"
+    )
@@ -28,6 +28,13 @@ class Role(Base):
         String(255), nullable=True, comment="角色描述"
     )
     status = mapped_column(String(2), nullable=False, comment="状态：1-启用，2-禁用")
+    data_scope: Mapped[str] = mapped_column(
+        String(1),
+        default="1",
+        server_default="1",
+        nullable=False,
+        comment="数据范围：1-全部，2-自定义部门，3-本部门，4-仅本人",
+    )
     create_by = mapped_column(String(32), nullable=True, comment="创建人")
     create_time: Mapped[datetime] = mapped_column(
         DateTime, server_default=func.now(), comment="创建时间"
@@ -25,6 +25,9 @@ class User(Base):
         String(255), nullable=False, comment="加密密码"
     )
     status: Mapped[str] = mapped_column(String(10), default="1", comment="状态")
+    dept_id: Mapped[int] = mapped_column(
+        BigInteger, nullable=True, index=True, comment="所属部门ID"
+    )
 
     user_avatar: Mapped[str] = mapped_column(
         String(255), nullable=True, comment="头像地址"
@@ -41,6 +44,9 @@ class User(Base):
     update_time: Mapped[datetime] = mapped_column(
         DateTime, server_default=func.now(), onupdate=func.now(), comment="更新时间"
     )
+    last_active_time: Mapped[datetime] = mapped_column(
+        DateTime, nullable=True, comment="最近活跃时间 (由 Redis 定期回写)"
+    )
 
     roles: Mapped[list["Role"]] = relationship(
         "Role", secondary=user_roles, back_populates="users", lazy="selectin"
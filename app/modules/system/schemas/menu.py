@@ -1,8 +1,10 @@
 from datetime import datetime
 
-from pydantic import BaseModel, ConfigDict, Field, field_serializer
+from pydantic import BaseModel, ConfigDict, Field
 from pydantic.alias_generators import to_camel
 
+from app.core.base_response import SnowflakeId
+
 
 class ButtonCreate(BaseModel):
     desc: str
@@ -59,24 +61,18 @@ class MenuQuery(BaseModel):
 
 
 class MenuOut(MenuBase):
-    menu_id: int
+    menu_id: SnowflakeId
+    parent_id: SnowflakeId | None = None
     create_time: datetime
 
-    @field_serializer("menu_id", "parent_id")
-    def serialize_id(self, v: int, _info):
-        return str(v) if v is not None else None
-
     model_config = ConfigDict(from_attributes=True, populate_by_name=True)
 
 
 class MenuSimpleOut(MenuBase):
-    menu_id: int
+    menu_id: SnowflakeId
+    parent_id: SnowflakeId | None = None
     create_time: datetime
 
-    @field_serializer("menu_id", "parent_id")
-    def serialize_id(self, v: int, _info):
-        return str(v) if v is not None else None
-
     model_config = ConfigDict(from_attributes=True, populate_by_name=True)
 
 
@@ -86,13 +82,9 @@ class MenuTreeOut(MenuOut):
 
 
 class MenuTreeOptionOut(BaseModel):
-    id: int
+    id: SnowflakeId
     label: str
     p_id: str
     children: list["MenuTreeOptionOut"] = []
 
-    @field_serializer("id")
-    def serialize_id(self, v: int, _info):
-        return str(v) if v is not None else None
-
     model_config = ConfigDict(from_attributes=True, populate_by_name=True)
@@ -1,14 +1,19 @@
 from datetime import datetime
+from typing import Literal
 
-from pydantic import BaseModel, ConfigDict, field_serializer
+from pydantic import BaseModel, ConfigDict
 from pydantic.alias_generators import to_camel
 
+from app.core.base_response import SnowflakeId
+
 
 class RoleBase(BaseModel):
     role_name: str
     role_code: str
     role_desc: str | None = None
     status: str = "1"  # "1"-启用, "2"-禁用
+    # 数据范围："1"-全部, "2"-自定义部门, "3"-本部门, "4"-仅本人
+    data_scope: Literal["1", "2", "3", "4"] = "1"
 
     model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
 
@@ -22,6 +27,7 @@ class RoleUpdate(BaseModel):
     role_code: str | None = None
     role_desc: str | None = None
     status: str | None = None
+    data_scope: Literal["1", "2", "3", "4"] | None = None
 
     model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
 
@@ -30,13 +36,9 @@ class RoleUpdate(BaseModel):
 
 
 class RoleOut(RoleBase):
-    role_id: int
+    role_id: SnowflakeId
     create_time: datetime
 
-    @field_serializer("role_id")
-    def serialize_id(self, role_id: int, _info):
-        return str(role_id)
-
     model_config = ConfigDict(from_attributes=True, populate_by_name=True)
 
 
@@ -51,12 +53,8 @@ class RoleQuery(BaseModel):
 
 
 class RoleSimpleOut(BaseModel):
-    role_id: int
+    role_id: SnowflakeId
     role_name: str
     role_code: str
 
-    @field_serializer("role_id")
-    def serialize_id(self, role_id: int, _info):
-        return str(role_id)
-
     model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
@@ -3,6 +3,7 @@ from datetime import datetime
 from pydantic import BaseModel, ConfigDict, Field, field_serializer, field_validator
 from pydantic.alias_generators import to_camel
 
+from app.core.base_response import SnowflakeId
 from app.utils.mask_util import MaskUtil
 
 
@@ -13,6 +14,7 @@ class UserBase(BaseModel):
     user_phone: str = Field(..., description="手机号")
     user_gender: str = Field(..., description="用户性别")
     status: str = Field(..., description="状态")
+    dept_id: int | None = Field(None, description="所属部门ID")
     roles: list[str] = []  # 创建时分配的角色 ID 列表
 
     model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
@@ -47,16 +49,12 @@ class UserQuery(BaseModel):
 
 
 class UserOut(BaseModel):
-    user_id: int
+    # 核心：返回给前端时转为字符串
+    user_id: SnowflakeId
     user_name: str
     nickname: str
     status: str
 
-    # 核心：返回给前端时转为字符串
-    @field_serializer("user_id")
-    def serialize_id(self, user_id: int, _info):
-        return str(user_id)
-
     # 核心：允许 Pydantic 直接读取 SQLAlchemy 模型属性
     model_config = ConfigDict(from_attributes=True)
 
@@ -64,13 +62,14 @@ class UserOut(BaseModel):
 class UserItemOut(BaseModel):
     """列表显示的用户对象"""
 
-    user_id: int
+    user_id: SnowflakeId
     user_name: str
     nickname: str | None = None
     user_email: str | None = None
     user_phone: str | None = None
     user_gender: str | None = None
     status: str | None = None
+    dept_id: SnowflakeId | None = None
     create_time: datetime
     # 可以在此扩展角色信息
     roles: list[str] = []
@@ -79,11 +78,6 @@ class UserItemOut(BaseModel):
         from_attributes=True, alias_generator=to_camel, populate_by_name=True
     )
 
-    # 核心：处理 Snowflake ID 精度丢失问题
-    @field_serializer("user_id")
-    def serialize_id(self, user_id: int, _info):
-        return str(user_id)
-
     @field_serializer("user_phone")
     def serialize_phone(self, v: str) -> str:
         return MaskUtil.phone(v)
@@ -103,3 +97,27 @@ class UserItemOut(BaseModel):
         if v and not isinstance(v[0], str):
             return [r.role_name for r in v]
         return v
+
+
+class OnlineUserQuery(BaseModel):
+    """在线用户查询参数"""
+
+    current: int = Field(1, ge=1)
+    size: int = Field(10, ge=1, le=100)
+
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
+
+
+class OnlineUserOut(BaseModel):
+    """在线用户"""
+
+    user_id: SnowflakeId
+    user_name: str | None = None
+    nickname: str | None = None
+    last_active_time: datetime
+
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
+
+    @field_serializer("last_active_time")
+    def serialize_last_active_time(self, dt: datetime) -> str:
+        return dt.strftime("%Y-%m-%d %H:%M:%S")
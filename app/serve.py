@@ -0,0 +1,208 @@
+"""
+生产环境入口
+
+用法: python -m app.serve [--host 0.0.0.0] [--port 8000] [--workers N]
+
+- gunicorn 预加载应用 (preload_app) 后 fork 出 worker，worker 内运行 uvicorn；
+  事件循环与 HTTP 解析优先使用 uvloop / httptools，未安装时回落到 asyncio / h11
+- fork 后在每个 worker 中重置数据库引擎、Redis 客户端与 worker id 租约，
+  连接与租约不会在进程之间共享 (均在 lifespan 中按需重新建立)
+- worker 数默认取可用 CPU 数 (考虑 CPU 亲和性与容器配额)，异步 worker 每个即可占满一个核
+- 设置 DB_MAX_CONNECTIONS 时按 worker 数缩小每个进程的连接池，总连接数不超过该值
+- 启动时清空 PROMETHEUS_MULTIPROC_DIR 中上次运行留下的指标文件
+- 只信任 FORWARDED_ALLOW_IPS 中代理的 X-Forwarded-For，据此还原客户端 IP (按 IP 限流依赖)
+- 没有 gunicorn 的平台 (Windows) 回落到 uvicorn 多进程模式，各进程独立导入应用
+"""
+
+import argparse
+import importlib.util
+import logging
+import math
+import os
+from pathlib import Path
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def available_cpus() -> int:
+    try:
+        count = len(os.sched_getaffinity(0))
+    except AttributeError:  # macOS / Windows
+        count = os.cpu_count() or 1
+    # 容器内 os.cpu_count() 返回宿主机核数，需再按 cgroup v2 的 CPU 配额收紧
+    try:
+        quota, period = Path("/sys/fs/cgroup/cpu.max").read_text().split()
+        if quota != "max":
+            count = min(count, math.ceil(int(quota) / int(period)))
+    except (OSError, ValueError):
+        pass
+    return max(1, count)
+
+
+def event_loop() -> str:
+    return "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+
+
+def http_protocol() -> str:
+    return "httptools" if importlib.util.find_spec("httptools") else "h11"
+
+
+def pool_limits(
+    workers: int, max_connections: int, pool_size: int, max_overflow: int
+) -> tuple[int, int]:
+    """
+    每个 worker 的 (pool_size, max_overflow)，
+    保证 workers * (pool_size + max_overflow) <= max_connections；
+    配置值本身已满足时原样返回，否则按原比例缩小
+    """
+    per_worker = max_connections // workers
+    if per_worker < 1:
+        raise ValueError(
+            f"DB_MAX_CONNECTIONS={max_connections} 不足以给 {workers} 个 worker 各分配一个连接"
+        )
+    if pool_size + max_overflow <= per_worker:
+        return pool_size, max_overflow
+    size = max(1, per_worker * pool_size // (pool_size + max_overflow))
+    return size, per_worker - size
+
+
+def configure_pools(workers: int) -> None:
+    if settings.DB_MAX_CONNECTIONS is None or settings.DB_PGBOUNCER_TRANSACTION_MODE:
+        return
+    pool_size, max_overflow = pool_limits(
+        workers,
+        settings.DB_MAX_CONNECTIONS,
+        settings.DB_POOL_SIZE,
+        settings.DB_MAX_OVERFLOW,
+    )
+    # 同时写入环境变量，uvicorn 多进程模式下子进程重新读取配置
+    settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW = pool_size, max_overflow
+    os.environ["DB_POOL_SIZE"] = str(pool_size)
+    os.environ["DB_MAX_OVERFLOW"] = str(max_overflow)
+    logger.info(
+        "每个 worker 的连接池: pool_size=%d max_overflow=%d (共 %d 个 worker，上限 %d)",
+        pool_size,
+        max_overflow,
+        workers,
+        settings.DB_MAX_CONNECTIONS,
+    )
+
+
+def reinit_after_fork() -> None:
+    """在 fork 出的 worker 中丢弃从主进程继承的连接与租约"""
+    from app.core.redis import reset_redis_client_after_fork
+    from app.core.worker_id import worker_lease
+    from app.db.session import reset_engines_after_fork
+
+    reset_engines_after_fork()
+    reset_redis_client_after_fork()
+    worker_lease.reset_after_fork()
+
+
+def reset_multiproc_dir() -> None:
+    """
+    启动时清空 PROMETHEUS_MULTIPROC_DIR (须在 fork worker 之前)，
+    否则上次运行留下的计数器与直方图文件会继续累加进 /metrics
+    """
+    directory = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if not directory:
+        return
+    path = Path(directory)
+    path.mkdir(parents=True, exist_ok=True)
+    for file in path.glob("*.db"):
+        file.unlink(missing_ok=True)
+
+
+def _post_fork(_server, _worker) -> None:
+    reinit_after_fork()
+
+
+def _child_exit(_server, worker) -> None:
+    # 多进程指标模式下清理已退出 worker 的 livesum 指标文件
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
+
+
+def run_gunicorn(host: str, port: int, workers: int) -> None:
+    from gunicorn.app.base import BaseApplication
+
+    try:
+        from uvicorn_worker import UvicornWorker
+    except ImportError:
+        from uvicorn.workers import UvicornWorker
+
+    class Worker(UvicornWorker):
+        CONFIG_KWARGS = {"loop": event_loop(), "http": http_protocol()}
+
+    class Server(BaseApplication):
+        def load_config(self):
+            options = {
+                "bind": f"{host}:{port}",
+                "workers": workers,
+                "worker_class": Worker,
+                "preload_app": True,
+                "keepalive": settings.SERVER_KEEPALIVE,
+                "backlog": settings.SERVER_BACKLOG,
+                "graceful_timeout": settings.SERVER_GRACEFUL_TIMEOUT,
+                "forwarded_allow_ips": settings.FORWARDED_ALLOW_IPS,
+                "post_fork": _post_fork,
+                "child_exit": _child_exit,
+            }
+            for key, value in options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            from app.main import app
+
+            return app
+
+    Server().run()
+
+
+def run_uvicorn(host: str, port: int, workers: int) -> None:
+    import uvicorn
+
+    uvicorn.run(
+        "app.main:app",
+        host=host,
+        port=port,
+        workers=workers,
+        loop=event_loop(),
+        http=http_protocol(),
+        backlog=settings.SERVER_BACKLOG,
+        timeout_keep_alive=settings.SERVER_KEEPALIVE,
+        timeout_graceful_shutdown=settings.SERVER_GRACEFUL_TIMEOUT,
+        proxy_headers=True,
+        forwarded_allow_ips=settings.FORWARDED_ALLOW_IPS,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="生产环境启动入口")
+    parser.add_argument("--host", default=settings.SERVER_HOST)
+    parser.add_argument("--port", type=int, default=settings.SERVER_PORT)
+    parser.add_argument(
+        "--workers", type=int, default=settings.SERVER_WORKERS or available_cpus()
+    )
+    args = parser.parse_args()
+    if args.workers > 1 and settings.WORKER_ID is not None:
+        parser.error("WORKER_ID 固定时只能启动一个 worker，否则雪花 ID 会重复")
+
+    logging.basicConfig(level=logging.INFO)
+    reset_multiproc_dir()
+    configure_pools(args.workers)
+    logger.info(
+        "启动 %d 个 worker (%s + %s)", args.workers, event_loop(), http_protocol()
+    )
+    if importlib.util.find_spec("gunicorn"):
+        run_gunicorn(args.host, args.port, args.workers)
+    else:
+        run_uvicorn(args.host, args.port, args.workers)
+
+
+if __name__ == "__main__":
+    main()
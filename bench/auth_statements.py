@@ -0,0 +1,64 @@
+# ruff: noqa: T201
+"""
+认证热路径语句基准：对比普通 select() 与 lambda_stmt 每次调用的
+语句构建 + 缓存键生成耗时 (即 SQLAlchemy 编译缓存命中前的 Python 侧开销)
+
+不连接数据库，只衡量 Python 侧开销。
+用法: python -m bench.auth_statements [--number 20000]
+"""
+
+import argparse
+import json
+import timeit
+
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+
+from app.modules.auth.service import current_user_stmt, login_user_stmt
+from app.modules.system.models.role import Role
+from app.modules.system.models.user import User
+
+
+def plain_login(user_name: str):
+    return select(User).where(User.user_name == user_name)
+
+
+def plain_current_user(user_id: int):
+    return (
+        select(User)
+        .where(User.user_id == user_id)
+        .options(selectinload(User.roles).noload(Role.menus))
+    )
+
+
+CASES = {
+    "login": (plain_login, login_user_stmt, "admin"),
+    "current_user": (plain_current_user, current_user_stmt, 1),
+}
+
+
+def measure(factory, arg, number: int) -> float:
+    """单次 构建语句 + 生成缓存键 的平均耗时 (微秒)"""
+    seconds = timeit.timeit(lambda: factory(arg)._generate_cache_key(), number=number)
+    return round(seconds / number * 1_000_000, 2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="认证语句构建开销基准")
+    parser.add_argument("--number", type=int, default=20000)
+    args = parser.parse_args()
+
+    report = {}
+    for name, (plain, cached, arg) in CASES.items():
+        plain_us = measure(plain, arg, args.number)
+        lambda_us = measure(cached, arg, args.number)
+        report[name] = {
+            "select_us": plain_us,
+            "lambda_stmt_us": lambda_us,
+            "speedup": round(plain_us / lambda_us, 2),
+        }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
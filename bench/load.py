@@ -0,0 +1,285 @@
+# ruff: noqa: T201
+"""
+端到端压测：按场景组合并发驱动真实应用，输出各接口 p50/p95/p99 与 RPS (JSON)，
+并可与保存的基线对比
+
+- 默认在进程内通过 ASGITransport 请求 app.main.app (与 tests/conftest.py 的 client
+  夹具相同，另外执行 lifespan 预热)；指定 --base-url 时改为请求运行中的 uvicorn
+- 需要可用的数据库与 Redis，以及可登录的账号 (默认为 init_db 创建的 admin)
+- 场景:
+    login      登录突发 (POST /auth/login)
+    bootstrap  SPA 首屏 (常量路由 + 用户信息 + 动态路由 + 字典)
+    paging     管理端列表翻页 (用户 / 角色 / 字典类型，随机页码)
+- 登录接口限流为每 IP 10 次/分钟，压测登录突发时需以 RATE_LIMIT_ENABLED=false
+  启动应用，否则大部分登录请求返回 429 (计入 errors)
+
+用法:
+    python -m bench.load --concurrency 20 --duration 30 \\
+        --mix login=1,bootstrap=5,paging=4 --output load.json
+    python -m bench.load --base-url http://127.0.0.1:8000 --baseline load.json
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import sys
+import time
+from collections import Counter, defaultdict
+from collections.abc import Awaitable, Callable
+from contextlib import AsyncExitStack
+from dataclasses import dataclass, field
+
+from httpx import ASGITransport, AsyncClient, HTTPError, Limits
+
+PAGE_SIZE = 20
+DICT_TYPES = "sys_user_gender,sys_status"
+# 与基线对比的指标：延迟越高越差，RPS 越低越差
+LATENCY_KEYS = ("p50_ms", "p95_ms", "p99_ms")
+
+
+@dataclass
+class Recorder:
+    """按接口名记录每次请求的耗时与失败次数"""
+
+    samples: defaultdict[str, list[float]] = field(
+        default_factory=lambda: defaultdict(list)
+    )
+    errors: Counter = field(default_factory=Counter)
+    enabled: bool = True
+
+    async def request(self, client: AsyncClient, method: str, url: str, **kwargs):
+        # 接口名不含查询参数，同一接口的不同页码合并统计
+        name = f"{method} {url.split('?', 1)[0]}"
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except HTTPError:
+            response = None
+        elapsed = time.perf_counter() - start
+        if self.enabled:
+            self.samples[name].append(elapsed)
+            if response is None or response.status_code >= 400:
+                self.errors[name] += 1
+        return response
+
+
+@dataclass
+class Context:
+    client: AsyncClient
+    recorder: Recorder
+    credentials: dict
+    headers: dict
+    pages: int
+    rng: random.Random
+
+
+async def login(ctx: Context) -> None:
+    await ctx.recorder.request(ctx.client, "POST", "/auth/login", json=ctx.credentials)
+
+
+async def bootstrap(ctx: Context) -> None:
+    # 前端首屏先并行取常量路由与用户信息，再取动态路由与字典
+    await asyncio.gather(
+        ctx.recorder.request(ctx.client, "GET", "/auth/getConstantRoutes"),
+        ctx.recorder.request(
+            ctx.client, "GET", "/auth/getUserInfo", headers=ctx.headers
+        ),
+    )
+    await asyncio.gather(
+        ctx.recorder.request(
+            ctx.client, "GET", "/auth/getUserRoutes", headers=ctx.headers
+        ),
+        ctx.recorder.request(
+            ctx.client,
+            "GET",
+            f"/system/dict/lookup?types={DICT_TYPES}",
+            headers=ctx.headers,
+        ),
+    )
+
+
+async def paging(ctx: Context) -> None:
+    path = ctx.rng.choice(
+        ("/system/user/list", "/system/role/list", "/system/dict/type/list")
+    )
+    current = ctx.rng.randint(1, ctx.pages)
+    await ctx.recorder.request(
+        ctx.client,
+        "GET",
+        f"{path}?current={current}&size={PAGE_SIZE}",
+        headers=ctx.headers,
+    )
+
+
+SCENARIOS: dict[str, Callable[[Context], Awaitable[None]]] = {
+    "login": login,
+    "bootstrap": bootstrap,
+    "paging": paging,
+}
+
+
+def parse_mix(text: str) -> dict[str, float]:
+    """解析 "login=1,bootstrap=5" 形式的场景权重"""
+    mix = {}
+    for item in filter(None, (s.strip() for s in text.split(","))):
+        name, _, weight = item.partition("=")
+        if name not in SCENARIOS:
+            raise argparse.ArgumentTypeError(f"未知场景: {name}")
+        mix[name] = float(weight or 1)
+    if not mix or sum(mix.values()) <= 0:
+        raise argparse.ArgumentTypeError("场景权重之和须大于 0")
+    return mix
+
+
+def percentile(ordered: list[float], q: float) -> float:
+    """最近秩法 (nearest-rank) 百分位，ordered 须已排序"""
+    return ordered[max(0, math.ceil(q * len(ordered)) - 1)]
+
+
+def summarize(samples: list[float], errors: int, elapsed: float) -> dict:
+    ordered = sorted(samples)
+    return {
+        "requests": len(ordered),
+        "errors": errors,
+        "rps": round(len(ordered) / elapsed, 1),
+        "p50_ms": round(percentile(ordered, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(ordered, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(ordered, 0.99) * 1000, 2),
+        "max_ms": round(ordered[-1] * 1000, 2),
+    }
+
+
+def compare(report: dict, baseline: dict, tolerance: float) -> dict:
+    """
+    逐接口对比延迟百分位与 RPS，超出 tolerance (相对变化) 的记为退化；
+    只对比双方都有的接口
+    """
+    deltas, regressions = {}, []
+    for name, current in report["endpoints"].items():
+        base = baseline.get("endpoints", {}).get(name)
+        if not base:
+            continue
+        delta = {}
+        for key in (*LATENCY_KEYS, "rps"):
+            if not base.get(key):
+                continue
+            change = current[key] / base[key] - 1
+            delta[key] = round(change, 3)
+            worse = change < -tolerance if key == "rps" else change > tolerance
+            if worse:
+                regressions.append(f"{name} {key}: {base[key]} -> {current[key]}")
+        deltas[name] = delta
+    return {"tolerance": tolerance, "deltas": deltas, "regressions": regressions}
+
+
+async def fetch_token(client: AsyncClient, credentials: dict) -> str:
+    response = await client.post("/auth/login", json=credentials)
+    response.raise_for_status()
+    return response.json()["data"]["token"]
+
+
+async def worker(ctx: Context, mix: dict[str, float], deadline: float) -> None:
+    names, weights = list(mix), list(mix.values())
+    while time.perf_counter() < deadline:
+        await SCENARIOS[ctx.rng.choices(names, weights)[0]](ctx)
+
+
+async def run(args) -> dict:
+    async with AsyncExitStack() as stack:
+        if args.base_url:
+            client = AsyncClient(
+                base_url=args.base_url,
+                timeout=args.timeout,
+                limits=Limits(
+                    max_connections=args.concurrency,
+                    max_keepalive_connections=args.concurrency,
+                ),
+            )
+        else:
+            from app.main import app
+
+            # ASGITransport 不发送 lifespan 事件，这里手动执行预热与收尾
+            await stack.enter_async_context(app.router.lifespan_context(app))
+            client = AsyncClient(
+                transport=ASGITransport(app=app),
+                base_url="http://bench",
+                timeout=args.timeout,
+            )
+        await stack.enter_async_context(client)
+
+        credentials = {"userName": args.username, "password": args.password}
+        headers = {"Authorization": f"Bearer {await fetch_token(client, credentials)}"}
+        recorder = Recorder()
+        contexts = [
+            Context(
+                client, recorder, credentials, headers, args.pages, random.Random(i)
+            )
+            for i in range(args.concurrency)
+        ]
+
+        # 预热：每个场景各执行一次，不计入结果
+        recorder.enabled = False
+        for name in args.mix:
+            await SCENARIOS[name](contexts[0])
+        recorder.enabled = True
+
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(worker(ctx, args.mix, start + args.duration) for ctx in contexts)
+        )
+        elapsed = time.perf_counter() - start
+
+    all_samples = [s for samples in recorder.samples.values() for s in samples]
+    return {
+        "target": args.base_url or "asgi",
+        "concurrency": args.concurrency,
+        "duration": round(elapsed, 2),
+        "mix": args.mix,
+        "endpoints": {
+            name: summarize(samples, recorder.errors[name], elapsed)
+            for name, samples in sorted(recorder.samples.items())
+        },
+        "total": summarize(all_samples, sum(recorder.errors.values()), elapsed),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="端到端压测")
+    parser.add_argument("--base-url", help="运行中的服务地址，缺省时在进程内请求")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--duration", type=float, default=10, help="压测时长 (秒)")
+    parser.add_argument(
+        "--mix",
+        type=parse_mix,
+        default="login=1,bootstrap=5,paging=4",
+        help="场景权重，如 login=1,bootstrap=5,paging=4",
+    )
+    parser.add_argument("--pages", type=int, default=10, help="翻页场景的最大页码")
+    parser.add_argument("--username", default="admin")
+    parser.add_argument("--password", default="hohu123456")
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--output", help="结果 JSON 输出路径")
+    parser.add_argument("--baseline", help="基线结果 JSON，对比后有退化时退出码为 1")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.2, help="允许的相对变化，默认 20%%"
+    )
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            report["comparison"] = compare(report, json.load(f), args.tolerance)
+
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    print(text)
+    if report.get("comparison", {}).get("regressions"):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
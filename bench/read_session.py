@@ -0,0 +1,122 @@
+# ruff: noqa: T201
+"""
+只读会话基准：对比 user-027 之前的事务会话 (get_db，结束时 COMMIT) 与
+get_read_db 使用的 AUTOCOMMIT 会话，在同一组读查询下每个请求的数据库往返次数与耗时
+
+- 工作负载与 GET /system/role/list 相同：get_page 的 COUNT + 分页 SELECT
+- 往返次数在 asyncpg 协议层统计 (BEGIN / COMMIT 等简单查询、PREPARE、执行各计一次)，
+  预热后预编译语句已缓存，结果即稳态下每个请求的往返次数，并按类型给出明细
+- 两种会话都包含 pool_pre_ping 的开销：asyncpg 方言的 ping 为 BEGIN + ";" + ROLLBACK，
+  每次签出连接 3 次往返
+- 需要可连接的数据库 (DATABASE_URL) 且已执行 alembic upgrade head
+
+用法: python -m bench.read_session [--number 500]
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from collections import Counter
+
+from sqlalchemy import event
+
+from app.db.session import AsyncSessionLocal, get_engines
+from app.modules.system.crud.crud_role import crud_role
+from app.modules.system.models.role import Role
+
+# asyncpg Protocol 上每次调用对应一次网络往返的方法
+ROUND_TRIP_METHODS = frozenset(
+    {"query", "prepare", "bind_execute", "bind_execute_many", "bind", "execute"}
+)
+
+
+class CountingProtocol:
+    """代理 asyncpg 连接的协议对象，统计往返次数"""
+
+    def __init__(self, protocol, counter: Counter):
+        self._protocol = protocol
+        self._counter = counter
+
+    def __getattr__(self, name):
+        attr = getattr(self._protocol, name)
+        if name not in ROUND_TRIP_METHODS:
+            return attr
+
+        def counted(*args, **kwargs):
+            # 简单查询按语句区分 (BEGIN; / COMMIT; / ROLLBACK;)，其余按协议方法
+            kind = args[0].strip(" ;") if name == "query" else name
+            self._counter[kind] += 1
+            return attr(*args, **kwargs)
+
+        return counted
+
+
+async def role_list(db) -> None:
+    await crud_role.get_page(db, current=1, size=20, order_by=[Role.create_time.desc()])
+
+
+async def transactional_request(engines) -> None:
+    # user-027 之前的 get_db：隐式 BEGIN，请求结束时 COMMIT
+    async with AsyncSessionLocal(bind=engines.primary) as db:
+        await role_list(db)
+        await db.commit()
+
+
+async def autocommit_request(engines) -> None:
+    # get_read_db：AUTOCOMMIT，不发送 BEGIN / COMMIT，从不提交
+    async with AsyncSessionLocal(bind=engines.read) as db:
+        await role_list(db)
+
+
+CASES = {
+    "get_db (commit)": transactional_request,
+    "get_read_db (autocommit)": autocommit_request,
+}
+
+
+async def measure(request, engines, counter: Counter, number: int) -> dict:
+    for _ in range(10):
+        await request(engines)
+    counter.clear()
+    durations = []
+    for _ in range(number):
+        start = time.perf_counter()
+        await request(engines)
+        durations.append(time.perf_counter() - start)
+    return {
+        "round_trips": round(counter.total() / number, 2),
+        "breakdown": {kind: round(n / number, 2) for kind, n in counter.items()},
+        "mean_ms": round(statistics.fmean(durations) * 1000, 3),
+        "p50_ms": round(statistics.median(durations) * 1000, 3),
+    }
+
+
+async def run(number: int) -> dict:
+    engines = get_engines()
+    counter = Counter()
+
+    @event.listens_for(engines.primary.sync_engine, "connect")
+    def _count_round_trips(dbapi_conn, _record):
+        raw = dbapi_conn._connection
+        raw._protocol = CountingProtocol(raw._protocol, counter)
+
+    try:
+        return {
+            name: await measure(request, engines, counter, number)
+            for name, request in CASES.items()
+        }
+    finally:
+        await engines.primary.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="只读会话往返次数基准")
+    parser.add_argument("--number", type=int, default=500)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args.number)), indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+# ruff: noqa: T201
+"""
+响应序列化基准：通过 ASGITransport 在进程内请求 /system/user/list 与 /system/menu/tree
+
+会话工厂被替换为返回内存固定数据的会话 (不使用 dependency_overrides，
+它会让 FastAPI 每个请求重新分析依赖)，只衡量鉴权、路由、校验与序列化开销。
+serialization 部分单独对比同一响应体走 FastAPI response_model 路径
+(重新校验 + dump_json) 与 FastJSONResponse 的耗时。
+用法: python -m bench.responses [--requests 500] [--users 20] [--menus 200]
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+import timeit
+from datetime import datetime
+
+from httpx import ASGITransport, AsyncClient
+from pydantic import TypeAdapter
+
+from app.core.base_response import FastJSONResponse, PageResult, ResponseModel
+from app.core.id_generator import next_ids
+from app.core.security import create_access_token
+from app.db import session as db_session
+from app.main import app
+from app.modules.system.api.menu import assemble_menu_tree
+from app.modules.system.models.menu import Menu
+from app.modules.system.models.role import Role
+from app.modules.system.models.user import User
+from app.modules.system.schemas.menu import MenuTreeOut
+from app.modules.system.schemas.user import UserItemOut
+
+NOW = datetime(2025, 1, 1, 8, 30)
+
+
+class StaticResult:
+    """模拟 Result：count 查询返回 total，当前用户查询返回第一行，其余查询返回全部行"""
+
+    def __init__(self, rows: list):
+        self.rows = rows
+
+    def scalar(self) -> int:
+        return len(self.rows)
+
+    def scalars(self) -> "StaticResult":
+        return self
+
+    def first(self):
+        return self.rows[0] if self.rows else None
+
+    def all(self) -> list:
+        return self.rows
+
+    def __iter__(self):
+        return iter(self.rows)
+
+
+class StaticSession:
+    def __init__(self, rows: list):
+        self.result = StaticResult(rows)
+        self.info = {}
+
+    async def execute(self, _stmt):
+        return self.result
+
+    async def close(self):
+        pass
+
+
+def loaded(model, **values):
+    """构造所有列都已赋值的实例，与从数据库加载的对象一样不会触发属性默认值计算"""
+    columns = {c.key: None for c in model.__mapper__.column_attrs}
+    return model(**(columns | values))
+
+
+def build_users(count: int) -> list[User]:
+    roles = [
+        loaded(
+            Role,
+            role_id=rid,
+            role_name=f"角色{i}",
+            role_code=f"R_{i}",
+            status="1",
+            create_time=NOW,
+        )
+        for i, rid in enumerate(next_ids(3))
+    ]
+    return [
+        loaded(
+            User,
+            user_id=uid,
+            user_name=f"user{i:04d}",
+            nickname=f"用户{i}",
+            user_email=f"user{i}@example.com",
+            user_phone=f"138{i:08d}",
+            user_gender="1",
+            status="1",
+            create_time=NOW,
+            roles=roles[: i % 3 + 1],
+        )
+        for i, uid in enumerate(next_ids(count))
+    ]
+
+
+def build_menus(count: int) -> list[Menu]:
+    ids = next_ids(count)
+    # 每个目录下挂 9 个子菜单
+    return [
+        loaded(
+            Menu,
+            menu_id=mid,
+            parent_id=None if i % 10 == 0 else ids[i - i % 10],
+            menu_name=f"菜单{i}",
+            menu_type="M" if i % 10 == 0 else "C",
+            icon="mdi:menu",
+            route_name=f"route_{i}",
+            route_path=f"/route/{i}",
+            component="layout.base" if i % 10 == 0 else "view.page",
+            i18n_key=f"route.r{i}",
+            order=i,
+            status="1",
+            keep_alive=False,
+            constant=False,
+            hide_in_menu=False,
+            create_time=NOW,
+        )
+        for i, mid in enumerate(ids)
+    ]
+
+
+async def measure(client: AsyncClient, path: str, rows: list, requests: int) -> dict:
+    db_session.AsyncSessionLocal = lambda **_kw: StaticSession(rows)
+
+    # 预热一次，排除首次请求的懒加载开销
+    response = await client.get(path)
+    response.raise_for_status()
+
+    samples = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        await client.get(path)
+        samples.append(time.perf_counter() - start)
+
+    samples.sort()
+    return {
+        "bytes": len(response.content),
+        "mean_ms": round(statistics.fmean(samples) * 1000, 3),
+        "p50_ms": round(samples[len(samples) // 2] * 1000, 3),
+        "p99_ms": round(samples[int(len(samples) * 0.99)] * 1000, 3),
+    }
+
+
+def user_page(users: list[User]) -> ResponseModel:
+    records = []
+    for u in users:
+        item = UserItemOut.model_validate(u)
+        item.roles = [r.role_code for r in u.roles]
+        records.append(item)
+    page = PageResult(records=records, total=len(users), current=1, size=len(users))
+    return ResponseModel.success(data=page)
+
+
+def menu_tree(menus: list[Menu]) -> ResponseModel:
+    return ResponseModel.success(data=assemble_menu_tree(menus))
+
+
+def compare_serialization(payload: ResponseModel, response_model, number: int):
+    """单次序列化耗时 (微秒)：FastAPI response_model 路径 vs FastJSONResponse"""
+    adapter = TypeAdapter(response_model)
+
+    def fastapi_path():
+        return adapter.dump_json(adapter.validate_python(payload), by_alias=True)
+
+    def fast_path():
+        return FastJSONResponse(payload).body
+
+    result = {}
+    for name, func in (("response_model", fastapi_path), ("fast_json", fast_path)):
+        # 取多轮中的最小值，降低 GC 与其他进程的干扰
+        seconds = min(timeit.repeat(func, number=number, repeat=10))
+        result[f"{name}_us"] = round(seconds / number * 1_000_000, 1)
+    return result
+
+
+async def run(args) -> dict:
+    users = build_users(args.users)
+    menus = build_menus(args.menus)
+    # 当前用户即第一条用户记录
+    token = create_access_token(subject=users[0].user_id)
+    async with AsyncClient(
+        transport=ASGITransport(app=app),
+        base_url="http://bench",
+        headers={"Authorization": f"Bearer {token}"},
+    ) as client:
+        return {
+            "/system/user/list": await measure(
+                client,
+                f"/system/user/list?current=1&size={args.users}",
+                users,
+                args.requests,
+            ),
+            "/system/menu/tree": await measure(
+                client, "/system/menu/tree", menus, args.requests
+            ),
+            "serialization": {
+                "/system/user/list": compare_serialization(
+                    user_page(users),
+                    ResponseModel[PageResult[UserItemOut]],
+                    args.requests // 10,
+                ),
+                "/system/menu/tree": compare_serialization(
+                    menu_tree(menus),
+                    ResponseModel[list[MenuTreeOut]],
+                    args.requests // 10,
+                ),
+            },
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="响应序列化基准")
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--menus", type=int, default=200)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args)), indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+# ruff: noqa: T201
+"""
+冷启动基准：在全新进程中测量 `import app.main` 耗时与首个请求延迟
+
+用法: python -m bench.startup [--runs 5] [--output startup.json]
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+
+PROBE_PATHS = ["/", "/openapi.json"]
+
+_PROBE = """
+import asyncio, json, time
+
+t0 = time.perf_counter()
+import app.main
+import_seconds = time.perf_counter() - t0
+
+from httpx import ASGITransport, AsyncClient
+
+
+async def probe():
+    timings = {}
+    transport = ASGITransport(app=app.main.app)
+    async with AsyncClient(transport=transport, base_url="http://bench") as client:
+        for path in %r:
+            start = time.perf_counter()
+            await client.get(path)
+            timings[path] = time.perf_counter() - start
+    return timings
+
+
+print(json.dumps({"import": import_seconds, "first_request": asyncio.run(probe())}))
+"""
+
+
+def run_once() -> dict:
+    start = time.perf_counter()
+    output = subprocess.run(
+        [sys.executable, "-c", _PROBE % PROBE_PATHS],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    result["process"] = time.perf_counter() - start
+    return result
+
+
+def summarize(samples: list[float]) -> dict:
+    return {
+        "median_ms": round(statistics.median(samples) * 1000, 2),
+        "min_ms": round(min(samples) * 1000, 2),
+        "max_ms": round(max(samples) * 1000, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="冷启动耗时基准")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--output", help="结果 JSON 输出路径")
+    args = parser.parse_args()
+
+    runs = [run_once() for _ in range(args.runs)]
+    report = {
+        "runs": args.runs,
+        "process": summarize([r["process"] for r in runs]),
+        "import": summarize([r["import"] for r in runs]),
+        "first_request": {
+            path: summarize([r["first_request"][path] for r in runs])
+            for path in PROBE_PATHS
+        },
+    }
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
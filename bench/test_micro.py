@@ -0,0 +1,204 @@
+"""
+热点函数微基准 (pytest-benchmark)，输入为多种规模的合成数据，不连接数据库与 Redis
+
+不在默认测试路径内，需显式指定:
+    ENV=test pytest bench/test_micro.py --benchmark-only
+    # 保存结果并与上次对比，中位数变慢超过 10% 时失败
+    ENV=test pytest bench/test_micro.py --benchmark-only --benchmark-autosave \\
+        --benchmark-compare --benchmark-compare-fail=median:10%
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from pydantic import TypeAdapter
+
+from app.core.auth import require_permissions
+from app.core.base_response import FastJSONResponse
+from app.core.id_generator import SnowflakeIdGenerator
+from app.core.rbac import RBACSnapshot, rbac_cache
+from app.core.security import create_access_token, get_password_hash, verify_password
+from app.modules.auth.service import build_menu_tree, decode_access_token
+from app.modules.system.api.menu import (
+    assemble_menu_tree,
+    assemble_menu_tree_list,
+    assemble_menu_tree_options,
+)
+from app.modules.system.schemas.menu import MenuTreeOut
+from app.utils.mask_util import MaskUtil
+from bench.responses import build_menus, build_users, menu_tree, user_page
+
+SIZES = (10, 100, 1000)
+ROLE_COUNTS = (1, 5, 20)
+
+
+@pytest.fixture(scope="module", params=SIZES, ids=lambda n: f"n={n}")
+def menus(request):
+    return build_menus(request.param)
+
+
+@pytest.fixture(scope="module", params=SIZES, ids=lambda n: f"n={n}")
+def users(request):
+    return build_users(request.param)
+
+
+# ---- 菜单树 ----
+
+
+@pytest.mark.benchmark(group="menu_tree")
+def test_build_menu_tree(benchmark, menus):
+    # 递归实现，根节点的 parent_id 为 None
+    benchmark(build_menu_tree, menus, None)
+
+
+@pytest.mark.benchmark(group="menu_tree")
+def test_assemble_menu_tree(benchmark, menus):
+    benchmark(assemble_menu_tree, menus)
+
+
+@pytest.mark.benchmark(group="menu_tree")
+def test_assemble_menu_tree_list(benchmark, menus):
+    benchmark(assemble_menu_tree_list, menus)
+
+
+@pytest.mark.benchmark(group="menu_tree")
+def test_assemble_menu_tree_options(benchmark, menus):
+    benchmark(assemble_menu_tree_options, menus)
+
+
+# ---- 权限汇总 ----
+
+
+def build_snapshot(roles: int, perms_per_role: int = 200) -> RBACSnapshot:
+    return RBACSnapshot(
+        menus={},
+        role_menu_ids={r: frozenset() for r in range(roles)},
+        role_permissions={
+            # 相邻角色的权限有一半重叠，模拟真实的角色继承关系
+            r: frozenset(
+                f"sys:m{(r * perms_per_role // 2 + i)}:op"
+                for i in range(perms_per_role)
+            )
+            for r in range(roles)
+        },
+    )
+
+
+@pytest.mark.benchmark(group="permissions")
+@pytest.mark.parametrize("roles", ROLE_COUNTS, ids=lambda n: f"roles={n}")
+def test_snapshot_permissions(benchmark, roles):
+    snapshot = build_snapshot(roles)
+    benchmark(snapshot.permissions, range(roles))
+
+
+@pytest.mark.benchmark(group="permissions")
+@pytest.mark.parametrize("roles", ROLE_COUNTS, ids=lambda n: f"roles={n}")
+def test_require_permissions_dependency(benchmark, monkeypatch, roles):
+    """包含事件循环调度开销，对比同组的 snapshot.permissions 可看出依赖本身的成本"""
+    snapshot = build_snapshot(roles)
+
+    async def get_snapshot():
+        return snapshot
+
+    monkeypatch.setattr(rbac_cache, "get", get_snapshot)
+    user = SimpleNamespace(
+        is_admin=False,
+        roles=[SimpleNamespace(role_id=r, status="1") for r in range(roles)],
+    )
+    dependency = require_permissions("sys:m1:op")
+    loop = asyncio.new_event_loop()
+    try:
+        benchmark(lambda: loop.run_until_complete(dependency(current_user=user)))
+    finally:
+        loop.close()
+
+
+# ---- Token 与密码 ----
+
+
+@pytest.mark.benchmark(group="jwt")
+def test_create_access_token(benchmark):
+    benchmark(create_access_token, 1234567890123456789)
+
+
+@pytest.mark.benchmark(group="jwt")
+def test_decode_access_token(benchmark):
+    token = create_access_token(1234567890123456789)
+    assert benchmark(decode_access_token, token) == 1234567890123456789
+
+
+@pytest.mark.benchmark(group="password")
+def test_verify_password(benchmark):
+    # bcrypt 单次数百毫秒，固定少量轮次
+    hashed = get_password_hash("hohu123456")
+    result = benchmark.pedantic(
+        verify_password, args=("hohu123456", hashed), rounds=5, iterations=1
+    )
+    assert result is True
+
+
+# ---- 脱敏 ----
+
+
+@pytest.mark.benchmark(group="mask")
+@pytest.mark.parametrize(
+    ("method", "value"),
+    [
+        pytest.param(method, value, id=method)
+        for method, value in (
+            ("phone", "138-1234-5678"),
+            ("email", "someone.long@example.com"),
+            ("id_card", "110101 19900307 1234"),
+            ("bank_card", "6222 0812 3456 7890 123"),
+            ("name", "欧阳小明"),
+            ("address", "北京市朝阳区建国路123号"),
+            ("generic", "1234567890"),
+        )
+    ],
+)
+def test_mask_util(benchmark, method, value):
+    benchmark(getattr(MaskUtil, method), value)
+
+
+# ---- 序列化 ----
+
+
+@pytest.mark.benchmark(group="serialize_users")
+def test_user_page_build(benchmark, users):
+    # 与 /system/user/list 相同：逐条 model_validate 并替换角色为编码列表
+    benchmark(user_page, users)
+
+
+@pytest.mark.benchmark(group="serialize_users")
+def test_user_page_response(benchmark, users):
+    page = user_page(users)
+    benchmark(lambda: FastJSONResponse(page).body)
+
+
+@pytest.mark.benchmark(group="serialize_menus")
+def test_menu_tree_dump(benchmark, menus):
+    adapter = TypeAdapter(list[MenuTreeOut])
+    tree = assemble_menu_tree(menus)
+    benchmark(adapter.dump_json, tree, by_alias=True)
+
+
+@pytest.mark.benchmark(group="serialize_menus")
+def test_menu_tree_response(benchmark, menus):
+    payload = menu_tree(menus)
+    benchmark(lambda: FastJSONResponse(payload).body)
+
+
+# ---- ID 生成 ----
+
+
+@pytest.mark.benchmark(group="snowflake")
+def test_next_id(benchmark):
+    benchmark(SnowflakeIdGenerator(1).next_id)
+
+
+@pytest.mark.benchmark(group="snowflake")
+@pytest.mark.parametrize("n", SIZES, ids=lambda n: f"n={n}")
+def test_next_ids(benchmark, n):
+    ids = benchmark(SnowflakeIdGenerator(1).next_ids, n)
+    assert len(set(ids)) == n
@@ -0,0 +1,23 @@
+# ruff: noqa: T201
+"""
+构建阶段导出 OpenAPI 文档，配合 OPENAPI_MODE=static 使用
+
+用法: python -m scripts.export_openapi [输出路径]
+"""
+
+import json
+import sys
+
+from app.core.config import settings
+from app.core.openapi import build_openapi
+from app.main import app
+
+
+def export_openapi(path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(build_openapi(app), f, ensure_ascii=False)
+    print(f"✅ OpenAPI 文档已导出: {path}")
+
+
+if __name__ == "__main__":
+    export_openapi(sys.argv[1] if len(sys.argv) > 1 else settings.OPENAPI_STATIC_PATH)
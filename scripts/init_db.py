@@ -8,6 +8,7 @@ from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
 from app.core.id_generator import next_id
 from app.core.security import get_password_hash
+from app.modules.system.models.dict import DictData, DictType
 from app.modules.system.models.menu import Menu
 from app.modules.system.models.role import Role
 from app.modules.system.models.user import User
@@ -108,6 +109,37 @@ init_menus = [
     ),
 ]
 
+# 前端常用的枚举字典：字典类型编码 -> (字典名称, [(标签, 键值, 标签样式)])
+init_dicts = {
+    "sys_user_gender": (
+        "用户性别",
+        [("未知", "0", "default"), ("男", "1", "primary"), ("女", "2", "error")],
+    ),
+    "sys_status": ("启用状态", [("启用", "1", "success"), ("禁用", "2", "warning")]),
+    "sys_menu_type": (
+        "菜单类型",
+        [("目录", "M", "default"), ("菜单", "C", "primary"), ("按钮", "F", "info")],
+    ),
+}
+
+
+def build_init_dicts() -> tuple[list[DictType], list[DictData]]:
+    types, data = [], []
+    for dict_type, (dict_name, items) in init_dicts.items():
+        types.append(DictType(dict_name=dict_name, dict_type=dict_type, status="1"))
+        data.extend(
+            DictData(
+                dict_type=dict_type,
+                dict_label=label,
+                dict_value=value,
+                dict_sort=sort,
+                tag_type=tag_type,
+                status="1",
+            )
+            for sort, (label, value, tag_type) in enumerate(items)
+        )
+    return types, data
+
 
 async def init_db():
     engine = create_async_engine(settings.DATABASE_URL)
@@ -119,6 +151,12 @@ async def init_db():
         # 创建初始菜单
         db.add_all(init_menus)
 
+        # 创建初始字典 (字典数据通过外键引用类型编码，需先写入类型)
+        dict_types, dict_data = build_init_dicts()
+        db.add_all(dict_types)
+        await db.flush()
+        db.add_all(dict_data)
+
         # 创建超级管理员角色
         admin_role = Role(role_name="超级管理员", role_code="R_SUPER", status="1")
         db.add(admin_role)
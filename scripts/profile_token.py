@@ -0,0 +1,16 @@
+# ruff: noqa: T201
+"""
+生成性能分析令牌 (需与服务端使用相同的 SECRET_KEY，服务端需开启 PROFILING_ENABLED)
+
+用法: python -m scripts.profile_token [有效期秒数，默认 600]
+    curl -H "X-Profile-Token: <令牌>" -H "X-Profile-Format: speedscope" \\
+        http://127.0.0.1:8000/system/user/list ...
+    # 令牌只能通过请求头传递，查询参数会出现在访问日志与代理日志中
+"""
+
+import sys
+
+from app.core.profiling import create_profile_token
+
+if __name__ == "__main__":
+    print(create_profile_token(int(sys.argv[1]) if len(sys.argv) > 1 else 600))
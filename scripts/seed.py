@@ -0,0 +1,326 @@
+# ruff: noqa: T201
+"""
+大规模压测数据生成：按给定规模与分布生成菜单、角色、用户及其关联，
+通过 asyncpg copy_records_to_table (COPY) 批量写入
+
+- 同一 --seed 生成完全相同的数据 (包括主键)，便于不同版本之间对比压测结果
+- 主键为雪花结构的 ID，时间戳固定在 SEED_EPOCH 附近，不会与线上发号冲突
+- 所有用户共用一个预先计算的 bcrypt 哈希，账号为 seed_0000001 起，密码为 --password
+- 用户的角色按 Zipf 分布抽取 (--skew)，少数角色拥有大部分用户，接近真实系统
+- 需先执行 alembic upgrade head；账号与角色编码带 seed_ 前缀，可与 init_db 的数据共存，
+  重复执行前需加 --truncate 清空相关表 (会同时删除 init_db 创建的数据)
+
+用法:
+    python -m scripts.seed --users 5000000 --roles 300 --menus 3000 --truncate
+"""
+
+import argparse
+import asyncio
+import itertools
+import random
+import time
+from collections.abc import Iterable, Iterator
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.config import settings
+from app.core.data_scope import DataScope
+from app.core.id_generator import INSTANCE_SHIFT, MAX_SEQ, TIMESTAMP_SHIFT
+from app.core.security import get_password_hash
+
+# 生成数据使用的固定时间戳 (毫秒) 与实例号
+SEED_EPOCH = int(datetime(2024, 1, 1, tzinfo=UTC).timestamp() * 1000)
+SEED_INSTANCE = 1023
+# 创建时间均匀分布在 SEED_START 之后的一年内
+SEED_START = datetime(2024, 1, 1)
+# 每个目录下的页面数、每个页面下的按钮数
+PAGES_PER_DIR = 9
+BUTTONS_PER_PAGE = 4
+BUTTON_ACTIONS = ("list", "add", "edit", "delete")
+# 角色数据范围的抽取权重：多数为全部 / 本部门
+DATA_SCOPE_WEIGHTS = {
+    DataScope.ALL: 4,
+    DataScope.CUSTOM: 1,
+    DataScope.DEPT: 3,
+    DataScope.SELF: 2,
+}
+TABLES = (
+    "sys_user_role",
+    "sys_role_menu",
+    "sys_role_dept",
+    "sys_user",
+    "sys_role",
+    "sys_menu",
+)
+
+
+def seed_id(offset: int) -> int:
+    """第 offset 个生成数据的主键：每毫秒 4096 个序号，之后进位到下一毫秒"""
+    ts, seq = divmod(offset, MAX_SEQ + 1)
+    return (SEED_EPOCH + ts) << TIMESTAMP_SHIFT | SEED_INSTANCE << INSTANCE_SHIFT | seq
+
+
+def created_at(rng: random.Random) -> datetime:
+    return SEED_START + timedelta(seconds=rng.randrange(365 * 24 * 3600))
+
+
+def build_menus(count: int, rng: random.Random) -> list[dict]:
+    """
+    三层菜单：目录 (M) -> 页面 (C) -> 按钮 (F)，按钮带权限标识；
+    一个目录连同其页面与按钮共 1 + 9 * 5 = 46 条，count 向上取整到整组
+    """
+    menus: list[dict] = []
+
+    def add(parent_id, menu_name, menu_type, order, route_name=None, **extra) -> int:
+        menu_id = seed_id(len(menus))
+        menus.append(
+            {
+                "menu_id": menu_id,
+                "parent_id": parent_id,
+                "menu_name": menu_name,
+                "menu_type": menu_type,
+                "component": extra.get("component"),
+                "route_name": route_name,
+                "route_path": route_name and "/" + route_name.replace("_", "/"),
+                "i18n_key": route_name and f"route.{route_name}",
+                "permission": extra.get("permission"),
+                "order": order,
+                "status": "1",
+                "hide_in_menu": False,
+                "keep_alive": False,
+                "constant": False,
+                "multi_tab": False,
+                "create_time": created_at(rng),
+            }
+        )
+        return menu_id
+
+    group = 1 + PAGES_PER_DIR * (1 + BUTTONS_PER_PAGE)
+    for d in range(-(-count // group)):
+        dir_id = add(0, f"目录{d}", "M", d, f"seed_{d}", component="layout.base")
+        for p in range(PAGES_PER_DIR):
+            page_id = add(
+                dir_id, f"页面{d}-{p}", "C", p, f"seed_{d}_{p}", component="view.page"
+            )
+            for b, action in enumerate(BUTTON_ACTIONS[:BUTTONS_PER_PAGE]):
+                add(
+                    page_id,
+                    f"{action}{d}-{p}",
+                    "F",
+                    b,
+                    permission=f"seed:{d}:{p}:{action}",
+                )
+    return menus
+
+
+def build_roles(count: int, offset: int, rng: random.Random) -> list[dict]:
+    scopes, weights = list(DATA_SCOPE_WEIGHTS), list(DATA_SCOPE_WEIGHTS.values())
+    return [
+        {
+            "role_id": seed_id(offset + i),
+            "role_name": f"压测角色{i:04d}",
+            "role_code": f"seed_{i:04d}",
+            "status": "1",
+            "data_scope": rng.choices(scopes, weights)[0].value,
+            "create_time": created_at(rng),
+        }
+        for i in range(count)
+    ]
+
+
+def role_menu_records(
+    roles: list[dict], menus: list[dict], fraction: float, rng: random.Random
+) -> list[tuple[int, int]]:
+    """每个角色随机授权 fraction 比例的页面，连同页面的按钮与所属目录"""
+    children: dict[int, list[int]] = {}
+    for m in menus:
+        children.setdefault(m["parent_id"], []).append(m["menu_id"])
+    pages = [m for m in menus if m["menu_type"] == "C"]
+    k = max(1, round(len(pages) * fraction))
+
+    records = []
+    for role in roles:
+        granted = set()
+        for page in rng.sample(pages, k):
+            granted.add(page["parent_id"])
+            granted.add(page["menu_id"])
+            granted.update(children.get(page["menu_id"], ()))
+        records.extend((role["role_id"], menu_id) for menu_id in sorted(granted))
+    return records
+
+
+def role_dept_records(
+    roles: list[dict], dept_ids: list[int], rng: random.Random
+) -> list[tuple[int, int]]:
+    """自定义数据范围的角色各分配 1 ~ 10 个部门"""
+    return [
+        (role["role_id"], dept_id)
+        for role in roles
+        if role["data_scope"] == DataScope.CUSTOM
+        for dept_id in sorted(
+            rng.sample(dept_ids, min(len(dept_ids), rng.randint(1, 10)))
+        )
+    ]
+
+
+def user_records(
+    args, offset: int, dept_ids: list[int], hashed: str, rng: random.Random
+) -> Iterator[tuple]:
+    for i in range(args.users):
+        n = i + 1
+        yield (
+            seed_id(offset + i),
+            f"seed_{n:07d}",
+            f"用户{n}",
+            hashed,
+            # 约 2% 的用户为禁用状态
+            "2" if rng.random() < 0.02 else "1",
+            rng.choice(dept_ids),
+            f"seed_{n:07d}@example.com",
+            f"13{n:09d}",
+            rng.choice("012"),
+            created_at(rng),
+        )
+
+
+def user_role_records(
+    args, offset: int, role_ids: list[int], rng: random.Random
+) -> Iterator[tuple[int, int]]:
+    # Zipf 权重：第 r 个角色被抽中的概率正比于 1 / r^skew
+    cum_weights = list(
+        itertools.accumulate(1 / (r + 1) ** args.skew for r in range(len(role_ids)))
+    )
+    for i in range(args.users):
+        user_id = seed_id(offset + i)
+        count = rng.randint(args.min_roles, args.max_roles)
+        picked = rng.choices(role_ids, cum_weights=cum_weights, k=count)
+        for role_id in sorted(set(picked)):
+            yield user_id, role_id
+
+
+def with_progress(
+    records: Iterable[tuple], table: str, total: int, every: int
+) -> Iterator[tuple]:
+    """透传记录，每 every 条打印一次进度"""
+    start = time.perf_counter()
+    for n, record in enumerate(records, 1):
+        yield record
+        if n % every == 0:
+            rate = n / (time.perf_counter() - start)
+            print(f"  {table}: {n:,} / ~{total:,} ({rate:,.0f} 行/秒)")
+
+
+async def copy(pg, table: str, records: Iterable[tuple], columns: list[str]) -> None:
+    start = time.perf_counter()
+    result = await pg.copy_records_to_table(table, records=records, columns=columns)
+    print(f"✅ {table}: {result} ({time.perf_counter() - start:.1f}s)")
+
+
+async def seed(args) -> None:
+    rng = random.Random(args.seed)
+    # 所有用户共用一个哈希，避免为每个用户执行一次数百毫秒的 bcrypt
+    hashed = get_password_hash(args.password)
+
+    menus = build_menus(args.menus, rng)
+    roles = build_roles(args.roles, len(menus), rng)
+    user_offset = len(menus) + len(roles)
+    dept_ids = [seed_id(user_offset + args.users + i) for i in range(args.depts)]
+    role_menus = role_menu_records(roles, menus, args.menu_fraction, rng)
+    role_depts = role_dept_records(roles, dept_ids, rng)
+    role_ids = [r["role_id"] for r in roles]
+    print(
+        f"菜单 {len(menus):,}，角色 {len(roles):,}，角色-菜单 {len(role_menus):,}，"
+        f"用户 {args.users:,}，部门 {args.depts:,}"
+    )
+
+    engine = create_async_engine(settings.DATABASE_URL)
+    try:
+        async with engine.connect() as conn:
+            raw = await conn.get_raw_connection()
+            pg = raw.driver_connection
+            async with pg.transaction():
+                if args.truncate:
+                    await pg.execute(f"TRUNCATE {', '.join(TABLES)} CASCADE")
+
+                await copy(
+                    pg, "sys_menu", [tuple(m.values()) for m in menus], list(menus[0])
+                )
+                await copy(
+                    pg, "sys_role", [tuple(r.values()) for r in roles], list(roles[0])
+                )
+                await copy(pg, "sys_role_menu", role_menus, ["role_id", "menu_id"])
+                await copy(pg, "sys_role_dept", role_depts, ["role_id", "dept_id"])
+                await copy(
+                    pg,
+                    "sys_user",
+                    with_progress(
+                        user_records(args, user_offset, dept_ids, hashed, rng),
+                        "sys_user",
+                        args.users,
+                        args.progress,
+                    ),
+                    [
+                        "user_id",
+                        "user_name",
+                        "nickname",
+                        "hashed_password",
+                        "status",
+                        "dept_id",
+                        "user_email",
+                        "user_phone",
+                        "user_gender",
+                        "create_time",
+                    ],
+                )
+                await copy(
+                    pg,
+                    "sys_user_role",
+                    with_progress(
+                        user_role_records(args, user_offset, role_ids, rng),
+                        "sys_user_role",
+                        args.users * (args.min_roles + args.max_roles) // 2,
+                        args.progress,
+                    ),
+                    ["user_id", "role_id"],
+                )
+
+            # 更新统计信息，避免刚写入的大表使用错误的执行计划
+            await pg.execute(f"ANALYZE {', '.join(TABLES)}")
+    finally:
+        await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="生成大规模压测数据")
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--roles", type=int, default=200)
+    parser.add_argument("--menus", type=int, default=2_000, help="菜单总数 (近似)")
+    parser.add_argument("--depts", type=int, default=500)
+    parser.add_argument("--min-roles", type=int, default=1, help="每个用户最少角色数")
+    parser.add_argument("--max-roles", type=int, default=3, help="每个用户最多角色数")
+    parser.add_argument(
+        "--skew", type=float, default=1.0, help="用户角色分布的 Zipf 指数，0 为均匀"
+    )
+    parser.add_argument(
+        "--menu-fraction", type=float, default=0.2, help="每个角色授权的页面比例"
+    )
+    parser.add_argument("--seed", type=int, default=42, help="随机种子")
+    parser.add_argument("--password", default="hohu123456")
+    parser.add_argument(
+        "--progress", type=int, default=500_000, help="每写入多少行打印一次进度"
+    )
+    parser.add_argument(
+        "--truncate", action="store_true", help="写入前清空用户、角色、菜单及关联表"
+    )
+    args = parser.parse_args()
+    if not 1 <= args.min_roles <= args.max_roles <= args.roles:
+        parser.error("需满足 1 <= --min-roles <= --max-roles <= --roles")
+
+    start = time.perf_counter()
+    asyncio.run(seed(args))
+    print(f"完成，总耗时 {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+import time
+import uuid
+
+import pytest
+from redis.exceptions import RedisError
+from sqlalchemy.dialects.postgresql import asyncpg
+
+from app.core.activity import ActivityTracker, last_active_update_stmt
+from app.core.redis import get_redis_client
+
+
+def test_flush_is_a_single_update_from_values():
+    stmt = last_active_update_stmt([("1", 1700000000.0), ("2", 1700000060.0)])
+    sql = str(stmt.compile(dialect=asyncpg.dialect()))
+
+    assert sql.startswith(
+        "UPDATE sys_user SET update_time=sys_user.update_time, "
+        "last_active_time=greatest("
+    )
+    assert "FROM (VALUES ($1::BIGINT, $2::TIMESTAMP WITHOUT TIME ZONE), ($3" in sql
+
+
+@pytest.fixture
+async def tracker():
+    """每个用例使用独立的有序集合；本地没有 Redis 时跳过"""
+    client = get_redis_client()
+    try:
+        await client.ping()
+    except (RedisError, OSError):
+        pytest.skip("需要本地 Redis")
+
+    tracker = ActivityTracker(60, 3600, key=f"test:active:{uuid.uuid4().hex[:8]}")
+    yield tracker
+    await client.delete(tracker.key, tracker.lock_key, tracker.watermark_key)
+    await client.aclose()
+
+
+async def test_touch_coalesces_per_minute_and_pages_online(tracker):
+    now = time.time()
+    minute_start = now - now % 60
+    await tracker.touch(1, minute_start)
+    await tracker.touch(1, minute_start + 30)  # 同一分钟内不再写 Redis
+    await tracker.touch(2, minute_start + 1)
+    await tracker.touch(3, minute_start - 3600)  # 不在在线窗口内
+
+    client = get_redis_client()
+    assert await client.zscore(tracker.key, 1) == minute_start
+
+    total, page = await tracker.online(600, 0, 1)
+    assert total == 2
+    assert page == [(2, minute_start + 1)]
@@ -0,0 +1,137 @@
+import asyncio
+
+import pytest
+from fastapi import APIRouter, FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import create_engine, delete, insert
+
+from app.core import audit
+from app.core.audit import AuditContext, AuditMiddleware, AuditWriter
+from app.db.session import TrackedSession
+from app.modules.system.crud.base import in_ids
+from app.modules.system.models.role import Role
+from app.modules.system.models.user import User
+
+
+@pytest.fixture
+def audit_ctx():
+    ctx = AuditContext()
+    token = audit._audit_context.set(ctx)
+    yield ctx
+    audit._audit_context.reset(token)
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://")
+    Role.__table__.create(engine)
+    User.__table__.create(engine)
+    with TrackedSession(bind=engine, expire_on_commit=False) as s:
+        yield s
+
+
+def test_collects_committed_changes(audit_ctx, session):
+    role = Role(role_name="审计员", role_code="R_AUDIT", status="1")
+    session.add(role)
+    session.commit()
+
+    role.status = "2"
+    session.commit()
+
+    session.execute(delete(Role).where(Role.role_id.in_([role.role_id])))
+    session.commit()
+
+    create, update, remove = audit_ctx.committed
+    assert create["op"] == "create" and create["ids"] == [role.role_id]
+    assert create["changes"]["role_code"] == [None, "R_AUDIT"]
+    assert update["changes"] == {"status": ["1", "2"]}
+    assert remove == {
+        "table": "sys_role",
+        "op": "delete",
+        "ids": [role.role_id],
+        "changes": {},
+    }
+    assert audit_ctx.pending == []
+
+
+def test_rollback_discards_changes_and_masks_password(audit_ctx, session):
+    session.add(User(user_name="alice", hashed_password="secret", status="1"))
+    session.flush()
+    assert audit_ctx.pending[0]["changes"]["hashed_password"] == [None, "******"]
+
+    session.rollback()
+    assert audit_ctx.pending == []
+    assert audit_ctx.committed == []
+
+
+async def test_writer_drops_when_queue_full():
+    writer = AuditWriter(maxsize=1, batch_size=10, flush_interval=0)
+    writer.submit({"oper_url": "/a"})
+    writer.submit({"oper_url": "/b"})
+
+    assert writer.queue.qsize() == 1
+    assert writer._drain([]) == [{"oper_url": "/a"}]
+
+
+async def test_writer_stop_flushes_in_flight_batch(monkeypatch):
+    writer = AuditWriter(maxsize=10, batch_size=10, flush_interval=60)
+    written = []
+
+    async def fake_write(batch):
+        written.extend(batch)
+
+    monkeypatch.setattr(writer, "_write", fake_write)
+    writer.start()
+    writer.submit({"oper_url": "/a"})
+    # 让后台任务取出日志并进入攒批等待
+    await asyncio.sleep(0)
+    assert writer.queue.empty() and writer._batch == [{"oper_url": "/a"}]
+
+    writer.submit({"oper_url": "/b"})
+    await writer.stop()
+
+    assert written == [{"oper_url": "/a"}, {"oper_url": "/b"}]
+
+
+def test_collects_bulk_insert_ids(audit_ctx, session):
+    rows = [
+        {"role_id": 101, "role_name": "a", "role_code": "R_A", "status": "1"},
+        {"role_id": 102, "role_name": "b", "role_code": "R_B", "status": "1"},
+    ]
+    session.execute(insert(Role), rows)
+    session.commit()
+
+    assert audit_ctx.committed == [
+        {"table": "sys_role", "op": "create", "ids": [101, 102], "changes": {}}
+    ]
+
+
+def test_target_ids_from_array_parameter():
+    stmt = delete(Role).where(in_ids(Role.role_id, [3, 4]))
+
+    assert audit._statement_target_ids(stmt) == [3, 4]
+
+
+async def test_oper_url_includes_router_prefix(monkeypatch):
+    records = []
+    monkeypatch.setattr(audit.audit_writer, "submit", records.append)
+    router = APIRouter()
+
+    @router.put("/{role_id}", summary="编辑角色")
+    async def update_role(role_id: int):
+        audit._audit_context.get().committed.append(
+            {"table": "sys_role", "op": "update", "ids": [role_id], "changes": {}}
+        )
+
+    app = FastAPI()
+    # 与 main.py 相同在 include_router 时指定前缀
+    app.include_router(router, prefix="/system/role")
+    app.add_middleware(AuditMiddleware)
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        await client.put("/system/role/5")
+
+    assert records[0]["oper_url"] == "/system/role/{role_id}"
+    assert records[0]["title"] == "编辑角色"
+    assert records[0]["target_ids"] == [5]
@@ -0,0 +1,31 @@
+import json
+
+from app.core.base_response import FastJSONResponse, PageResult, ResponseModel
+from app.main import app
+from app.modules.system.schemas.role import RoleOut
+
+SNOWFLAKE = 7_300_000_000_000_000_123
+
+
+def test_fast_json_response_serializes_ids_as_strings():
+    role = RoleOut(
+        role_id=SNOWFLAKE,
+        role_name="管理员",
+        role_code="admin",
+        create_time="2025-01-01T08:30:00",
+    )
+    page = PageResult(records=[role], total=1, current=1, size=10)
+    response = FastJSONResponse(ResponseModel.success(data=page))
+
+    body = json.loads(response.body)
+    assert response.media_type == "application/json"
+    assert body["data"]["records"][0]["roleId"] == str(SNOWFLAKE)
+    assert body["data"]["records"][0]["roleName"] == "管理员"
+    assert body["data"]["total"] == 1
+
+
+def test_fast_json_routes_keep_response_model_docs():
+    schemas = app.openapi()["components"]["schemas"]
+    assert schemas["RoleOut"]["properties"]["roleId"]["type"] == "integer"
+    assert "UserItemOut" in schemas
+    assert "MenuTreeOut" in schemas
@@ -0,0 +1,108 @@
+import asyncio
+import uuid
+from datetime import datetime
+
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import MISSING, LocalCache, TwoLevelCache, cached
+
+
+def test_local_cache_evicts_least_recently_used_and_expires(monkeypatch):
+    now = 1000.0
+    monkeypatch.setattr("app.core.cache.time.monotonic", lambda: now)
+    cache = LocalCache(maxsize=2, ttl=10)
+
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    assert cache.set("c", 3) == 1  # b 最久未使用
+    assert "b" not in cache._data
+
+    now += 11
+    assert cache.get("a") is MISSING
+    assert cache.get("b") is MISSING
+    assert cache.stats() == {
+        "size": 1,
+        "hits": 1,
+        "misses": 2,
+        "evictions": 1,
+        "expirations": 1,
+    }
+
+
+def test_jittered_ttl_stays_within_bounds():
+    cache = TwoLevelCache(
+        "t", TypeAdapter(int), ttl=100, l1_ttl=1, maxsize=1, jitter=0.2
+    )
+
+    assert {80 <= cache.jittered_ttl() <= 100 for _ in range(200)} == {True}
+
+
+async def test_concurrent_misses_run_loader_once():
+    calls = 0
+
+    @cached(f"test:{uuid.uuid4().hex[:8]}", ttl=60)
+    async def load(
+        _db: AsyncSession, user_id: int, *, since: datetime
+    ) -> dict[str, datetime]:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {str(user_id): since}
+
+    since = datetime(2025, 1, 1, 8, 30)
+    results = await asyncio.gather(
+        *(load(object(), 7, since=since) for _ in range(200))
+    )
+
+    assert calls == 1
+    assert results == [{"7": since}] * 200
+    # 会话参数不参与缓存键，其余参数不同则分别回源
+    assert await load(None, 7, since=since) == {"7": since}
+    await load(None, 8, since=since)
+    assert calls == 2
+    assert load.cache.local.stats()["hits"] == 1
+
+    await load.invalidate(user_id=7, since=since)
+    await load.cache.clear()
+    assert len(load.cache.local) == 0
+
+
+async def test_loader_runs_on_its_own_session():
+    sessions = []
+
+    @cached(f"test:{uuid.uuid4().hex[:8]}", ttl=60)
+    async def load(db: AsyncSession, key: str) -> str:
+        sessions.append(db)
+        return key
+
+    caller_session = object()
+    assert await load(caller_session, "a") == "a"
+    assert isinstance(sessions[0], AsyncSession)
+    assert sessions[0] is not caller_session
+
+
+async def test_load_started_before_clear_is_not_cached():
+    release = asyncio.Event()
+    calls = 0
+
+    @cached(f"test:{uuid.uuid4().hex[:8]}", ttl=60)
+    async def load(_db: AsyncSession, _key: str) -> int:
+        nonlocal calls
+        calls += 1
+        result = calls
+        if result == 1:
+            await release.wait()
+        return result
+
+    stale = asyncio.ensure_future(load(None, "a"))
+    while calls == 0:
+        await asyncio.sleep(0.001)
+    # 回源过程中数据变更：之后的请求不再等待旧的回源
+    await load.cache.clear()
+    assert await load(None, "a") == 2
+
+    release.set()
+    assert await stale == 1
+    assert load.cache.local.get('["a"]') == 2
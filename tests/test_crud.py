@@ -0,0 +1,112 @@
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.dialects.postgresql import asyncpg
+
+from app.db import monitor
+from app.db.monitor import QueryStats, _after_cursor_execute, _before_cursor_execute
+from app.modules.system.crud.crud_role import crud_role
+from app.modules.system.models.role import Role
+from app.modules.system.schemas.role import RoleCreate, RoleUpdate
+
+
+class RecordingSession:
+    """记录执行的语句与参数，不连接数据库"""
+
+    def __init__(self):
+        self.calls = []
+        self.execution_options = []
+
+    async def scalars(self, stmt, params=None):
+        self.calls.append((stmt, params))
+        return SimpleNamespace(all=lambda: [])
+
+    async def execute(self, stmt, params=None, execution_options=None):
+        self.calls.append((stmt, params))
+        self.execution_options.append(execution_options or {})
+        return SimpleNamespace(rowcount=2)
+
+
+def sql(stmt) -> str:
+    return str(stmt.compile(dialect=asyncpg.dialect()))
+
+
+async def test_bulk_create_is_one_insert_returning_with_reserved_ids():
+    db = RecordingSession()
+    roles = [RoleCreate(role_name=f"角色{i}", role_code=f"R_{i}") for i in range(3)]
+
+    await crud_role.bulk_create(db, roles, create_by="admin")
+
+    ((stmt, rows),) = db.calls
+    assert sql(stmt).startswith("INSERT INTO sys_role")
+    assert "RETURNING sys_role.role_id" in sql(stmt)
+    assert len({row["role_id"] for row in rows}) == 3
+    assert {row["create_by"] for row in rows} == {"admin"}
+
+
+async def test_bulk_update_is_one_executemany():
+    db = RecordingSession()
+
+    await crud_role.bulk_update(db, [{"role_id": 1, "status": "2"}])
+
+    ((stmt, rows),) = db.calls
+    assert sql(stmt).startswith("UPDATE sys_role")
+    assert rows == [{"role_id": 1, "status": "2"}]
+
+
+async def test_bulk_delete_binds_one_array_per_chunk(monkeypatch):
+    monkeypatch.setattr(crud_role, "chunk_size", 2)
+    db = RecordingSession()
+
+    assert await crud_role.bulk_delete(db, [1, 2, 3, 2]) == [2, 2]
+    assert await crud_role.bulk_delete(db, []) == []
+
+    first, second = (stmt.compile(dialect=asyncpg.dialect()) for stmt, _ in db.calls)
+    assert str(first) == (
+        "DELETE FROM sys_role WHERE sys_role.role_id = ANY ($1::BIGINT[])"
+    )
+    assert list(first.params.values()) == [[1, 2]]
+    assert list(second.params.values()) == [[3]]
+
+
+async def test_bulk_delete_chunks_are_exempt_from_n_plus_one(monkeypatch):
+    monkeypatch.setattr(crud_role, "chunk_size", 1)
+    monkeypatch.setattr(monitor.settings, "SQL_N_PLUS_ONE_RAISE", True)
+    db = RecordingSession()
+    ids = list(range(monitor.settings.SQL_N_PLUS_ONE_THRESHOLD + 5))
+
+    assert len(await crud_role.bulk_delete(db, ids)) == len(ids)
+
+    # 按 bulk_delete 传入的执行选项模拟每个分块的执行事件
+    conn = SimpleNamespace(info={})
+    stats = QueryStats()
+    token = monitor._query_stats.set(stats)
+    try:
+        for (stmt, _), options in zip(db.calls, db.execution_options, strict=True):
+            context = SimpleNamespace(execution_options=options)
+            _before_cursor_execute(conn, None, sql(stmt), None, context, False)
+            _after_cursor_execute(conn, None, sql(stmt), None, context, False)
+    finally:
+        monitor._query_stats.reset(token)
+
+    assert stats.count == len(ids)
+    assert not stats.shapes
+
+    # 不带该选项的同一语句仍会被判定为 N+1
+    stats = QueryStats()
+    token = monitor._query_stats.set(stats)
+    try:
+        with pytest.raises(monitor.NPlusOneError):
+            for stmt, _ in db.calls:
+                _before_cursor_execute(conn, None, sql(stmt), None, None, False)
+                _after_cursor_execute(conn, None, sql(stmt), None, None, False)
+    finally:
+        monitor._query_stats.reset(token)
+
+
+def test_update_only_sets_provided_fields():
+    role = Role(role_name="旧名称", role_code="R_OLD", status="1")
+
+    crud_role.update(role, RoleUpdate(status="2"), update_by="admin")
+
+    assert (role.role_name, role.status, role.update_by) == ("旧名称", "2", "admin")
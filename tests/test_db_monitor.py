@@ -0,0 +1,45 @@
+from types import SimpleNamespace
+
+import pytest
+
+from app.db import monitor
+from app.db.monitor import (
+    NPlusOneError,
+    QueryStats,
+    _after_cursor_execute,
+    _before_cursor_execute,
+    statement_shape,
+)
+
+
+def test_statement_shape_collapses_in_lists():
+    a = statement_shape("SELECT * FROM sys_role WHERE role_id IN ($1, $2, $3)")
+    b = statement_shape("SELECT * FROM sys_role WHERE role_id IN ($1)")
+    assert a == b
+
+
+def test_n_plus_one_detection(monkeypatch):
+    monkeypatch.setattr(monitor.settings, "SQL_N_PLUS_ONE_THRESHOLD", 3)
+    monkeypatch.setattr(monitor.settings, "SQL_N_PLUS_ONE_RAISE", True)
+    conn = SimpleNamespace(info={})
+    stmt = "SELECT * FROM sys_menu WHERE parent_id = $1"
+
+    stats = QueryStats()
+    token = monitor._query_stats.set(stats)
+    try:
+        for _ in range(3):
+            _before_cursor_execute(conn, None, stmt, None, None, False)
+            _after_cursor_execute(conn, None, stmt, None, None, False)
+
+        _before_cursor_execute(conn, None, stmt, None, None, False)
+        with pytest.raises(NPlusOneError):
+            _after_cursor_execute(conn, None, stmt, None, None, False)
+    finally:
+        monitor._query_stats.reset(token)
+
+    assert stats.count == 4
+
+
+async def test_server_timing_header(client):
+    response = await client.get("/")
+    assert response.headers["Server-Timing"].startswith("db;dur=0.00")
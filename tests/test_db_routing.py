@@ -0,0 +1,52 @@
+import pytest
+from sqlalchemy import delete
+from sqlalchemy.exc import InvalidRequestError
+from starlette.requests import Request
+
+from app.core.security import create_access_token
+from app.db.routing import ReplicaRouter, request_subject
+from app.db.session import AsyncSessionLocal, get_engines
+from app.modules.system.models.role import Role
+
+
+def _request(headers: dict[str, str]) -> Request:
+    raw = [(k.lower().encode(), v.encode()) for k, v in headers.items()]
+    return Request({"type": "http", "headers": raw})
+
+
+def test_replica_router_round_robin():
+    router = ReplicaRouter(["r1", "r2", "r3"], eject_seconds=30)
+    firsts = [router.candidates()[0] for _ in range(6)]
+    assert firsts == ["r1", "r2", "r3", "r1", "r2", "r3"]
+
+
+def test_replica_router_eject():
+    router = ReplicaRouter(["r1", "r2"], eject_seconds=30)
+    router.eject("r1")
+    assert router.candidates() == ["r2"]
+    assert router.candidates() == ["r2"]
+
+    router.eject("r2")
+    assert router.candidates() == []
+
+
+def test_request_subject():
+    token = create_access_token(subject=123)
+    assert request_subject(_request({"Authorization": f"Bearer {token}"})) == "123"
+    assert request_subject(_request({})) is None
+    assert request_subject(_request({"Authorization": "Bearer broken"})) is None
+
+
+async def test_read_only_session_rejects_writes():
+    session = AsyncSessionLocal(bind=get_engines().read)
+    session.info["read_only"] = True
+    try:
+        session.add(Role(role_name="r", role_code="r", status="1"))
+        with pytest.raises(InvalidRequestError):
+            await session.flush()
+        session.expunge_all()
+
+        with pytest.raises(InvalidRequestError):
+            await session.execute(delete(Role).where(Role.role_id == 1))
+    finally:
+        await session.close()
@@ -0,0 +1,73 @@
+import json
+import time
+
+import pytest
+
+from app.core.dict_cache import DictSnapshot, dict_cache
+from app.core.security import create_access_token
+from app.modules.system.schemas.dict import DictOption
+
+SNAPSHOT = DictSnapshot(
+    options={
+        "sys_status": (
+            DictOption(label="启用", value="1", tag_type="success"),
+            DictOption(label="禁用", value="2", tag_type="warning"),
+        ),
+        "sys_user_gender": (DictOption(label="男", value="1"),),
+    }
+)
+
+
+def test_lookup_is_cached_per_type_combination():
+    body, etag = SNAPSHOT.lookup(["sys_user_gender", "sys_status", "missing"])
+
+    assert json.loads(body)["data"] == {
+        "missing": [],
+        "sys_status": [
+            {"label": "启用", "value": "1", "tagType": "success"},
+            {"label": "禁用", "value": "2", "tagType": "warning"},
+        ],
+        "sys_user_gender": [{"label": "男", "value": "1", "tagType": None}],
+    }
+    # 顺序与重复不影响缓存键与 ETag
+    assert (
+        SNAPSHOT.lookup(["missing", "sys_status", "sys_user_gender", "sys_status"])[0]
+        is body
+    )
+    assert SNAPSHOT.lookup(["sys_status"])[1] != etag
+
+
+@pytest.fixture
+def cached_dicts(monkeypatch):
+    """直接放入内存快照，模拟预热完成后的状态"""
+    monkeypatch.setattr(dict_cache, "_data", SNAPSHOT)
+    monkeypatch.setattr(dict_cache, "_checked_at", time.monotonic())
+
+
+@pytest.mark.usefixtures("cached_dicts")
+async def test_lookup_endpoint_skips_database_and_honours_etag(client):
+    headers = {"Authorization": f"Bearer {create_access_token(subject=1)}"}
+    url = "/system/dict/lookup?types=sys_status,sys_user_gender"
+
+    response = await client.get(url, headers=headers)
+    assert response.status_code == 200
+    assert response.headers["Server-Timing"].endswith('desc="0 queries"')
+    assert json.loads(response.content)["data"]["sys_status"][0]["value"] == "1"
+
+    etag = response.headers["ETag"]
+    response = await client.get(url, headers=headers | {"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+
+
+@pytest.mark.usefixtures("cached_dicts")
+async def test_lookup_requires_token(client):
+    response = await client.get("/system/dict/lookup?types=sys_status")
+    assert response.status_code == 401
+
+
+@pytest.mark.parametrize("url", ["/system/dict/type/1", "/system/dict/data/1"])
+async def test_delete_requires_login(client, url):
+    response = await client.delete(url)
+
+    assert response.status_code == 401
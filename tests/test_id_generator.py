@@ -0,0 +1,76 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.core.id_generator import (
+    MAX_CLOCK_BACKWARD_MS,
+    MAX_SEQ,
+    ClockMovedBackwardsError,
+    SnowflakeIdGenerator,
+)
+
+
+class FakeClockGenerator(SnowflakeIdGenerator):
+    """时钟由测试控制的生成器，sleep 时推进时钟"""
+
+    def __init__(self, ticks: list[int]):
+        super().__init__(instance=3)
+        self.ticks = ticks
+
+    def _now(self) -> int:
+        return self.ticks[0]
+
+    def _wait_until(self, target: int) -> int:
+        self.ticks[0] = target
+        return target
+
+
+def test_next_ids_contiguous_within_tick():
+    gen = FakeClockGenerator([1000])
+    ids = gen.next_ids(10)
+
+    assert ids == list(range(ids[0], ids[0] + 10))
+    assert ids[0] >> 22 == 1000
+    assert ids[0] >> 12 & 0x3FF == 3
+    assert gen.next_id() == ids[-1] + 1
+
+
+def test_sequence_exhaustion_waits_for_next_tick():
+    ticks = [1000]
+    gen = FakeClockGenerator(ticks)
+    ids = gen.next_ids(MAX_SEQ + 11)
+
+    assert len(set(ids)) == len(ids) == MAX_SEQ + 11
+    assert ids == sorted(ids)
+    assert ids[-1] >> 22 == 1001
+    assert ids[-1] & MAX_SEQ == 9
+
+
+def test_clock_moving_backwards_stays_monotonic():
+    ticks = [1000]
+    gen = FakeClockGenerator(ticks)
+    first = gen.next_id()
+    ticks[0] = 1000 - MAX_CLOCK_BACKWARD_MS
+
+    assert gen.next_id() > first
+
+
+def test_large_clock_rollback_raises_instead_of_blocking():
+    ticks = [1000]
+    gen = FakeClockGenerator(ticks)
+    gen.next_id()
+    ticks[0] = 1000 - MAX_CLOCK_BACKWARD_MS - 1
+
+    with pytest.raises(ClockMovedBackwardsError):
+        gen.next_id()
+    with pytest.raises(ClockMovedBackwardsError):
+        gen.next_ids(10)
+
+
+def test_thread_safe_unique_ids():
+    gen = SnowflakeIdGenerator(instance=1)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        batches = list(pool.map(gen.next_ids, [500] * 40))
+
+    ids = [i for batch in batches for i in batch]
+    assert len(set(ids)) == len(ids) == 20000
@@ -6,3 +6,10 @@ async def test_read_main(client):
     response = await client.get("/")
     assert response.status_code == 200
     assert response.json() == {"Hello": "PancakeAdmin"}
+
+
+@pytest.mark.asyncio
+async def test_readiness_before_warmup(client):
+    assert (await client.get("/health/live")).status_code == 200
+    # 测试客户端不触发 lifespan，预热未执行
+    assert (await client.get("/health/ready")).status_code == 503
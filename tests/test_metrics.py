@@ -0,0 +1,24 @@
+async def test_metrics_use_route_template(client):
+    await client.get("/")
+    await client.get("/not-found/123")
+
+    response = await client.get("/metrics")
+    assert response.status_code == 200
+    body = response.text
+    assert (
+        'http_request_duration_seconds_count{method="GET",route="/",status="200"}'
+        in body
+    )
+    assert 'route="<unmatched>",status="404"' in body
+    assert "/not-found/123" not in body
+
+
+async def test_metrics_route_includes_router_prefix(client):
+    # 未登录同样匹配到路由 (依赖中返回 401)
+    await client.get("/system/role/list")
+    await client.get("/system/role/123")
+
+    body = (await client.get("/metrics")).text
+    assert 'route="/system/role/list",status="401"' in body
+    assert 'route="/system/role/{role_id}"' in body
+    assert 'route="/list"' not in body
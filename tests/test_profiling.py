@@ -0,0 +1,77 @@
+import json
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from app.core.config import settings
+from app.core.profiling import (
+    ProfilingMiddleware,
+    create_profile_token,
+    verify_profile_token,
+)
+
+
+def test_token_expires_and_rejects_tampering():
+    token = create_profile_token(60)
+    expires, signature = token.split(".")
+
+    assert verify_profile_token(token)
+    assert not verify_profile_token(f"{int(expires) + 1}.{signature}")
+    assert not verify_profile_token(create_profile_token(-1))
+    assert not verify_profile_token("garbage")
+
+
+def busy_loop():
+    return sum(i * i for i in range(20_000))
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.add_middleware(ProfilingMiddleware)
+
+    @app.get("/slow")
+    def slow():
+        return {"total": busy_loop()}
+
+    return AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+
+
+async def test_requests_without_valid_token_are_untouched(client):
+    async with client:
+        plain = await client.get("/slow")
+        forged = await client.get("/slow", headers={"X-Profile-Token": "1.bad"})
+        # 查询参数中的令牌不被接受，避免出现在访问日志中
+        in_query = await client.get(f"/slow?__profile={create_profile_token(60)}")
+
+    for response in (plain, forged, in_query):
+        assert response.json() == {"total": busy_loop()}
+        assert "x-profile-status" not in response.headers
+
+
+async def test_inline_speedscope_report(client, monkeypatch):
+    monkeypatch.setattr(settings, "PROFILING_OUTPUT_DIR", None)
+    token = create_profile_token(60)
+    async with client:
+        response = await client.get(
+            "/slow",
+            headers={"X-Profile-Token": token, "X-Profile-Format": "speedscope"},
+        )
+
+    assert response.headers["x-profile-status"] == "200"
+    assert response.headers["content-type"] == "application/json"
+    assert "speedscope" in json.loads(response.content)["$schema"]
+
+
+async def test_report_written_to_directory(client, monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "PROFILING_OUTPUT_DIR", str(tmp_path))
+    async with client:
+        response = await client.get(
+            "/slow", headers={"X-Profile-Token": create_profile_token(60)}
+        )
+
+    assert response.json() == {"total": busy_loop()}
+    report = tmp_path / response.headers["x-profile-report"]
+    assert report.name.endswith("-GET-slow.html")
+    assert "<html" in report.read_text(encoding="utf-8").lower()
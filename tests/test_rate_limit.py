@@ -0,0 +1,70 @@
+import uuid
+
+import pytest
+from redis.exceptions import RedisError
+
+from app.core.rate_limit import RateLimit, TokenBucketLimiter, rate_limiter
+from app.core.redis import get_redis_client
+
+
+@pytest.fixture
+async def limiter():
+    """每个用例使用独立的键前缀；本地没有 Redis 时跳过"""
+    client = get_redis_client()
+    try:
+        await client.ping()
+    except (RedisError, OSError):
+        pytest.skip("需要本地 Redis")
+
+    limiter = TokenBucketLimiter(5, 60, key_prefix=f"test:rl:{uuid.uuid4().hex[:8]}:")
+    yield limiter
+    keys = await client.keys(limiter.key_prefix + "*")
+    if keys:
+        await client.delete(*keys)
+    await client.aclose()
+
+
+async def test_leases_tokens_in_batches_and_blocks_locally(limiter, monkeypatch):
+    calls = []
+    client = get_redis_client()
+    original_eval = client.eval
+
+    async def counting_eval(*args):
+        calls.append(args)
+        return await original_eval(*args)
+
+    monkeypatch.setattr(client, "eval", counting_eval)
+    limit = RateLimit(times=50, seconds=3600)
+
+    results = [await limiter.acquire("k", limit) for _ in range(51)]
+
+    assert results[:50] == [0] * 50
+    assert results[50] > 0
+    # 每次租 5 个：10 次租用 + 1 次被告知等待
+    assert len(calls) == 11
+    # 已知需要等待，不再访问 Redis
+    assert await limiter.acquire("k", limit) > 0
+    assert len(calls) == 11
+
+
+async def test_throttled_route_returns_429_with_retry_after(client, monkeypatch):
+    keys = []
+
+    async def throttled(key, limit):
+        keys.append((key, limit))
+        return 2.5
+
+    monkeypatch.setattr(rate_limiter, "acquire", throttled)
+
+    response = await client.post(
+        "/auth/login", json={"userName": "admin", "password": "x"}
+    )
+
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "3"
+    assert response.json()["code"] == 429
+    assert keys == [("POST:/auth/login:ip:127.0.0.1", RateLimit(10, 60, "ip"))]
+
+    # 未声明规则的路由不经过限流
+    assert (await client.get("/health/live")).status_code == 200
+    assert len(keys) == 1
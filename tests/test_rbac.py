@@ -0,0 +1,67 @@
+from types import SimpleNamespace
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import asyncpg
+
+from app.core.data_scope import USER_SCOPE, bind_scope
+from app.core.rbac import RBACSnapshot
+from app.modules.system.models.user import User
+
+
+def _menu(menu_id: int, permission: str | None = None):
+    return SimpleNamespace(menu_id=menu_id, permission=permission)
+
+
+def test_rbac_snapshot_aggregates_roles():
+    menus = {1: _menu(1), 2: _menu(2, "sys:user:add"), 3: _menu(3, "sys:role:add")}
+    snapshot = RBACSnapshot(
+        menus=menus,
+        role_menu_ids={10: frozenset({1, 2}), 20: frozenset({2, 3})},
+        role_permissions={
+            10: frozenset({"sys:user:add"}),
+            20: frozenset({"sys:user:add", "sys:role:add"}),
+        },
+    )
+
+    assert snapshot.permissions([10]) == {"sys:user:add"}
+    assert snapshot.permissions([10, 20, 99]) == {"sys:user:add", "sys:role:add"}
+    assert {m.menu_id for m in snapshot.role_menus([10, 20])} == {1, 2, 3}
+    assert snapshot.role_menus([]) == []
+
+
+def _scoped_snapshot(**kwargs):
+    return RBACSnapshot(menus={}, role_menu_ids={}, role_permissions={}, **kwargs)
+
+
+def _where(clause) -> tuple[str, list]:
+    compiled = select(User.user_id).where(clause).compile(dialect=asyncpg.dialect())
+    return str(compiled).split("WHERE ")[1], list(compiled.params.values())
+
+
+def test_scope_filter_unions_roles_and_is_cached_per_role_set():
+    snapshot = _scoped_snapshot(
+        role_data_scopes={1: "2", 2: "4", 3: "1"},
+        role_dept_ids={1: frozenset({30, 10})},
+    )
+
+    assert snapshot.scope_filter([3, 2], USER_SCOPE) is None
+
+    template = snapshot.scope_filter([1, 2], USER_SCOPE)
+    assert snapshot.scope_filter([2, 1, 2], USER_SCOPE) is template
+
+    sql, params = _where(bind_scope(template, user_id=7, dept_id=None))
+    assert sql == (
+        "sys_user.dept_id = ANY ($1::BIGINT[]) OR sys_user.user_id = $2::BIGINT"
+    )
+    assert params == [[10, 30], 7]
+
+
+def test_scope_filter_without_visible_scope_matches_nothing():
+    snapshot = _scoped_snapshot(role_data_scopes={1: "2", 2: "3"})
+
+    sql, params = _where(bind_scope(snapshot.scope_filter([1, 2], USER_SCOPE), 7, 5))
+    assert sql == "sys_user.dept_id = $1::BIGINT"
+    assert params == [5]
+
+    assert _where(snapshot.scope_filter([1], USER_SCOPE))[0] == "false"
+    assert _where(snapshot.scope_filter([], USER_SCOPE))[0] == "false"
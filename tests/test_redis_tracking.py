@@ -0,0 +1,105 @@
+import asyncio
+import uuid
+
+import pytest
+from redis._parsers import _AsyncRESP3Parser
+from redis.asyncio.connection import Connection
+from redis.exceptions import RedisError
+
+from app.core import redis_tracking
+from app.core.redis import get_redis_client
+from app.core.redis_tracking import (
+    MISSING,
+    ClientTrackingCache,
+    install_invalidation_handler,
+)
+
+
+class RacingRedis:
+    """GET 返回前模拟服务端推送了同一键的失效消息"""
+
+    def __init__(self, cache: ClientTrackingCache):
+        self.cache = cache
+        self.gets = 0
+
+    async def get(self, key):
+        self.gets += 1
+        if self.gets == 1:
+            await self.cache._on_invalidate([b"invalidate", [key.encode()]])
+        return f"v{self.gets}"
+
+
+async def test_value_invalidated_while_reading_is_not_cached(monkeypatch):
+    cache = ClientTrackingCache(("rbac:",), maxsize=10)
+    cache._active = True
+    redis = RacingRedis(cache)
+    monkeypatch.setattr(redis_tracking, "get_redis_client", lambda: redis)
+
+    assert await cache.get("rbac:version") == "v1"
+    assert cache.peek("rbac:version") is MISSING
+    assert await cache.get("rbac:version") == "v2"
+    assert await cache.get("rbac:version") == "v2"
+    assert redis.gets == 2
+
+    await cache._on_invalidate([b"invalidate", None])
+    assert cache.peek("rbac:version") is MISSING
+
+
+async def test_parser_dispatches_invalidation_push():
+    """不依赖 Redis 服务：确认所装 redis-py 的 RESP3 解析器仍把推送交给注册的回调"""
+    cache = ClientTrackingCache(("rbac:",), maxsize=10)
+    cache._active = True
+    cache.local.set("rbac:version", "1")
+
+    # 与 connect() 之后的状态一致：RESP3 连接使用 RESP3 解析器
+    conn = Connection(protocol=3, parser_class=_AsyncRESP3Parser)
+    conn._reader = asyncio.StreamReader()
+    conn._parser.on_connect(conn)
+    install_invalidation_handler(conn, cache._on_invalidate)
+    conn._reader.feed_data(b">2\r\n$10\r\ninvalidate\r\n*1\r\n$12\r\nrbac:version\r\n")
+    await conn._parser.read_response(push_request=True)
+
+    assert cache.peek("rbac:version") is MISSING
+
+
+def test_missing_push_handler_api_fails_loudly():
+    with pytest.raises(RuntimeError):
+        install_invalidation_handler(object(), lambda _message: None)
+
+
+@pytest.fixture
+async def tracking():
+    """真实 Redis 上开启客户端缓存；本地没有 Redis 时跳过"""
+    client = get_redis_client()
+    try:
+        await client.ping()
+    except (RedisError, OSError):
+        pytest.skip("需要本地 Redis")
+
+    prefix = f"test:tracking:{uuid.uuid4().hex[:8]}:"
+    cache = ClientTrackingCache((prefix,), maxsize=10)
+    await cache.start()
+    yield cache, prefix
+    await cache.stop()
+    keys = await client.keys(prefix + "*")
+    if keys:
+        await client.delete(*keys)
+    await client.aclose()
+
+
+async def test_server_push_invalidates_local_copy(tracking):
+    cache, prefix = tracking
+    key = prefix + "version"
+    await get_redis_client().set(key, "1")
+
+    assert await cache.get(key) == "1"
+    assert cache.peek(key) == "1"
+    assert cache.stats()["hits"] >= 1
+
+    await get_redis_client().incr(key)
+    for _ in range(100):
+        if cache.peek(key) is MISSING:
+            break
+        await asyncio.sleep(0.01)
+    assert cache.peek(key) is MISSING
+    assert await cache.get(key) == "2"
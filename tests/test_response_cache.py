@@ -0,0 +1,81 @@
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from redis.exceptions import RedisError
+
+from app.core.base_response import FastJSONResponse, ResponseModel
+from app.core.redis import get_redis_client
+from app.core.response_cache import (
+    cache_response,
+    invalidate_tags,
+    permission_fingerprint,
+    response_cache_key,
+)
+from app.modules.auth.service import get_current_user
+
+
+def test_key_normalizes_query_and_permissions():
+    a = response_cache_key("/x", b"b=2&a=1&empty=", permission_fingerprint([2, 1]))
+    b = response_cache_key("/x", b"a=1&b=2", permission_fingerprint([1, 2, 2]))
+
+    assert a == b
+    assert a != response_cache_key("/x", b"a=1&b=2", permission_fingerprint([1]))
+
+
+@pytest.fixture
+def cached_app():
+    """带一个缓存接口的最小应用，标签使用随机前缀避免与其他用例冲突"""
+    tag = f"test:{uuid.uuid4().hex[:8]}"
+    app = FastAPI()
+    app.state.calls = 0
+
+    @app.get("/items/{item_id}")
+    @cache_response(tag + ":{item_id}")
+    async def get_item(item_id: int, q: str | None = None):
+        app.state.calls += 1
+        return FastJSONResponse(ResponseModel.success(data={"id": item_id, "q": q}))
+
+    role = SimpleNamespace(role_id=uuid.uuid4().int % 10**9, status="1")
+    app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(roles=[role])
+    app.state.tag = tag
+    return app
+
+
+async def test_endpoint_still_works_through_the_decorator(cached_app):
+    async with AsyncClient(
+        transport=ASGITransport(app=cached_app), base_url="http://test"
+    ) as client:
+        response = await client.get("/items/7?q=a")
+
+    assert response.status_code == 200
+    assert response.json()["data"] == {"id": 7, "q": "a"}
+
+
+async def test_hit_until_tag_invalidated(cached_app):
+    redis = get_redis_client()
+    try:
+        await redis.ping()
+    except (RedisError, OSError):
+        pytest.skip("需要本地 Redis")
+
+    async with AsyncClient(
+        transport=ASGITransport(app=cached_app), base_url="http://test"
+    ) as client:
+        first = await client.get("/items/7?q=a")
+        second = await client.get("/items/7?q=a")
+        assert (first.headers["X-Cache"], second.headers["X-Cache"]) == ("MISS", "HIT")
+        assert second.content == first.content
+        assert cached_app.state.calls == 1
+
+        await invalidate_tags(f"{cached_app.state.tag}:8")
+        assert (await client.get("/items/7?q=a")).headers["X-Cache"] == "HIT"
+
+        await invalidate_tags(f"{cached_app.state.tag}:7")
+        assert (await client.get("/items/7?q=a")).headers["X-Cache"] == "MISS"
+        assert cached_app.state.calls == 2
+
+    await invalidate_tags(f"{cached_app.state.tag}:7")
+    await redis.aclose()
@@ -0,0 +1,64 @@
+import pytest
+
+from app.core import redis
+from app.core.config import settings
+from app.core.worker_id import worker_lease
+from app.db import session
+from app.serve import (
+    available_cpus,
+    pool_limits,
+    reinit_after_fork,
+    reset_multiproc_dir,
+    run_uvicorn,
+)
+
+
+def test_pool_limits_keep_total_under_max_connections():
+    # 已满足上限时保持配置不变
+    assert pool_limits(4, 200, 10, 20) == (10, 20)
+    # 超出时按原比例缩小
+    size, overflow = pool_limits(16, 200, 10, 20)
+    assert 16 * (size + overflow) <= 200
+    assert (size, overflow) == (4, 8)
+    assert pool_limits(64, 100, 10, 20) == (1, 0)
+    with pytest.raises(ValueError):
+        pool_limits(8, 4, 10, 20)
+
+
+def test_available_cpus_is_positive():
+    assert available_cpus() >= 1
+
+
+def test_reinit_after_fork_drops_inherited_clients():
+    engines = session.get_engines()
+    client = redis.get_redis_client()
+    worker_lease.worker_id, worker_lease.holder = 7, "parent"
+
+    reinit_after_fork()
+
+    assert session.get_engines() is not engines
+    assert redis.get_redis_client() is not client
+    assert (worker_lease.worker_id, worker_lease.holder) == (None, None)
+
+
+def test_uvicorn_trusts_only_configured_proxies(monkeypatch):
+    import uvicorn
+
+    captured = {}
+    monkeypatch.setattr(uvicorn, "run", lambda app, **kwargs: captured.update(kwargs))
+    monkeypatch.setattr(settings, "FORWARDED_ALLOW_IPS", "10.0.0.0/8")
+
+    run_uvicorn("127.0.0.1", 8000, 1)
+
+    assert captured["proxy_headers"] is True
+    assert captured["forwarded_allow_ips"] == "10.0.0.0/8"
+
+
+def test_reset_multiproc_dir_removes_previous_run(monkeypatch, tmp_path):
+    (tmp_path / "counter_123.db").write_bytes(b"stale")
+    (tmp_path / "keep.txt").write_text("x")
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+
+    reset_multiproc_dir()
+
+    assert [p.name for p in tmp_path.iterdir()] == ["keep.txt"]
@@ -0,0 +1,84 @@
+import pytest
+from redis.exceptions import RedisError
+
+from app.core import redis_tracking
+from app.core import snapshot as snapshot_module
+from app.core.redis_tracking import hot_keys
+from app.core.snapshot import VersionedSnapshot
+
+
+class FlakyRedis:
+    def __init__(self):
+        self.down = True
+        self.version = 0
+
+    async def incr(self, _key):
+        if self.down:
+            raise RedisError("connection refused")
+        self.version += 1
+        return self.version
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    fake = FlakyRedis()
+    monkeypatch.setattr(snapshot_module, "get_redis_client", lambda: fake)
+
+    async def get_version(_key):
+        if fake.down:
+            raise RedisError("connection refused")
+        return str(fake.version)
+
+    monkeypatch.setattr(hot_keys, "get", get_version)
+    return fake
+
+
+async def test_invalidate_survives_redis_outage(redis):
+    loads = []
+
+    async def loader(_db):
+        loads.append(redis.version)
+        return {"loaded": len(loads)}
+
+    cache = VersionedSnapshot("test:snapshot:version", loader, check_interval=0)
+    await cache.get()
+
+    # Redis 不可用时不抛出异常，本进程快照照常丢弃
+    await cache.invalidate()
+    assert await cache.get() == {"loaded": 2}
+
+    # Redis 恢复后补递增版本号，其他 worker 据此刷新
+    redis.down = False
+    await cache.get()
+    assert redis.version == 1
+    assert cache.version == "1"
+
+
+async def test_push_invalidation_bypasses_check_interval(monkeypatch):
+    versions = iter(["1", "2"])
+
+    class VersionRedis:
+        async def get(self, _key):
+            return next(versions)
+
+    key = "test:tracked:version"
+    monkeypatch.setattr(redis_tracking, "get_redis_client", VersionRedis)
+    monkeypatch.setattr(hot_keys, "prefixes", ("test:tracked:",))
+    monkeypatch.setattr(hot_keys, "_active", True)
+    loads = []
+
+    async def loader(_db):
+        loads.append(len(loads))
+        return len(loads)
+
+    cache = VersionedSnapshot(key, loader, check_interval=60)
+    try:
+        assert await cache.get() == 1
+        assert await cache.get() == 1
+
+        # 服务端推送失效：未到 check_interval 也要重新核对版本号
+        await hot_keys._on_invalidate([b"invalidate", [key.encode()]])
+        assert await cache.get() == 2
+        assert cache.version == "2"
+    finally:
+        hot_keys.local.clear()
@@ -0,0 +1,47 @@
+import uuid
+
+import pytest
+from redis.exceptions import RedisError
+
+from app.core import id_generator
+from app.core.redis import get_redis_client
+from app.core.worker_id import WorkerIdExhaustedError, WorkerIdLease
+
+
+@pytest.fixture
+async def key_prefix():
+    """每个用例使用独立的键前缀；本地没有 Redis 时跳过"""
+    client = get_redis_client()
+    try:
+        await client.ping()
+    except (RedisError, OSError):
+        pytest.skip("需要本地 Redis")
+
+    prefix = f"test:worker:{uuid.uuid4().hex[:8]}:"
+    yield prefix
+    keys = await client.keys(prefix + "*")
+    if keys:
+        await client.delete(*keys)
+    await client.aclose()
+
+
+async def test_leases_are_unique_and_fail_fast_when_full(key_prefix):
+    leases = [WorkerIdLease(30, slots=4, key_prefix=key_prefix) for _ in range(4)]
+    ids = [await lease.acquire() for lease in leases]
+
+    assert sorted(ids) == [0, 1, 2, 3]
+    assert id_generator.get_generator().instance == ids[-1]
+    with pytest.raises(WorkerIdExhaustedError):
+        await WorkerIdLease(30, slots=4, key_prefix=key_prefix).acquire()
+
+    await leases[0].release()
+    assert await WorkerIdLease(30, slots=4, key_prefix=key_prefix).acquire() == ids[0]
+
+
+async def test_renew_detects_lost_lease(key_prefix):
+    lease = WorkerIdLease(30, slots=4, key_prefix=key_prefix)
+    await lease.acquire()
+    assert await lease.renew()
+
+    await get_redis_client().set(lease.key, "someone-else")
+    assert not await lease.renew()